@@ -3,43 +3,57 @@
 Robot Framework library for Windows automation using robocorp-windows.
 """
 
-# Import the library class directly
-from .library import RobocorpWindows
-
-# Robot Framework looks for this variable to identify the library class
-ROBOT_LIBRARY_CLASS = RobocorpWindows
-
-# These are the keywords that will be available to Robot Framework
-# Robot Framework will look for these attributes in the module
-# and use them as keywords.
-
-# Import keyword modules
-from .keywords.window_management import WindowManagementKeywords
-from .keywords.control_operations import ControlOperationsKeywords
-from .keywords.keyboard_mouse import KeyboardMouseKeywords
-from .keywords.async_control_operations import AsyncControlOperationsKeywords
-
-# Create an instance of the library to get access to the keywords
-_lib = RobocorpWindows()
-
-# List all the keywords we want to expose
-keywords = [
-    'launch_application', 'connect_to_application', 'set_current_window',
-    'close_application', 'minimize_window', 'maximize_window', 'restore_window',
-    'window_should_be_open', 'window_should_be_closed', 'get_window_title',
-    'find_control', 'click_control', 'double_click_control', 'right_click_control',
-    'type_into_control', 'get_control_text', 'control_should_exist',
-    'control_should_not_exist', 'set_control_value', 'get_control_value',
-    'select_from_combobox', 'check_checkbox', 'uncheck_checkbox',
-    'checkbox_should_be_checked', 'checkbox_should_be_unchecked',
-    'async_type_into_control', 'async_find_all_controls', 'async_click_control',
-    'wait_for_async_task', 'shutdown_async_executor'
-]
-
-# Expose the keywords as module attributes
-for keyword in keywords:
-    if hasattr(_lib, keyword):
-        globals()[keyword] = getattr(_lib, keyword)
+try:
+    # Import the library class directly
+    from .library import RobocorpWindows
+except ImportError as error:
+    # robocorp-windows and comtypes are only available on Windows. Offline tools such as
+    # ``python -m robotframework_robocorp_windows.snapshot`` still need to import the package.
+    _library_import_error = error
+    keywords = []
+
+    def __getattr__(name):
+        if name in ('RobocorpWindows', 'ROBOT_LIBRARY_CLASS'):
+            raise ImportError(f"RobocorpWindows is not available: {_library_import_error}") from _library_import_error
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+else:
+    # Robot Framework looks for this variable to identify the library class
+    ROBOT_LIBRARY_CLASS = RobocorpWindows
+
+    # These are the keywords that will be available to Robot Framework
+    # Robot Framework will look for these attributes in the module
+    # and use them as keywords.
+
+    # Import keyword modules
+    from .keywords.window_management import WindowManagementKeywords
+    from .keywords.control_operations import ControlOperationsKeywords
+    from .keywords.keyboard_mouse import KeyboardMouseKeywords
+    from .keywords.async_control_operations import AsyncControlOperationsKeywords
+
+    # Create an instance of the library to get access to the keywords
+    _lib = RobocorpWindows()
+
+    # List all the keywords we want to expose
+    keywords = [
+        'launch_application', 'launch_applications', 'connect_to_application', 'set_current_window',
+        'close_application', 'minimize_window', 'maximize_window', 'restore_window',
+        'window_should_be_open', 'window_should_be_closed', 'get_window_title',
+        'find_control', 'find_controls', 'click_control', 'double_click_control', 'right_click_control',
+        'type_into_control', 'get_control_text', 'control_should_exist',
+        'control_should_not_exist', 'wait_for_any_control', 'wait_for_all_controls',
+        'execute_control_actions', 'set_control_value', 'get_control_value', 'fill_form',
+        'read_form', 'extract_table', 'select_from_combobox', 'check_checkbox', 'uncheck_checkbox',
+        'checkbox_should_be_checked', 'checkbox_should_be_unchecked',
+        'capture_ui_snapshot', 'save_ui_snapshot', 'snapshot_should_contain_control',
+        'get_ui_changes_since_snapshot',
+        'async_type_into_control', 'async_find_all_controls', 'async_click_control',
+        'wait_for_async_task', 'cancel_async_task', 'get_async_task_status', 'shutdown_async_executor'
+    ]
+
+    # Expose the keywords as module attributes
+    for keyword in keywords:
+        if hasattr(_lib, keyword):
+            globals()[keyword] = getattr(_lib, keyword)
 
 __version__ = '1.0.0'
 __all__ = ['RobocorpWindows'] + keywords
@@ -4,8 +4,29 @@
 驱动层模块，封装对底层库的调用
 """
 
-from .robocorp_driver import RobocorpWindowsDriver
+from .tree_walker import TreeWalker
+from .ui_snapshot import UISnapshot
+from .snapshot_file import SnapshotWriter, MappedUISnapshot, open_snapshot
+from .snapshot_diff import SnapshotDiff, diff_snapshots
+
+try:
+    from .robocorp_driver import RobocorpWindowsDriver
+except ImportError as error:
+    # robocorp-windows只能在Windows上安装，离线快照工具不依赖它
+    _driver_import_error = error
+
+    def __getattr__(name):
+        if name == 'RobocorpWindowsDriver':
+            raise ImportError(f"RobocorpWindowsDriver is not available: {_driver_import_error}") from _driver_import_error
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
-    'RobocorpWindowsDriver'
-]
\ No newline at end of file
+    'RobocorpWindowsDriver',
+    'TreeWalker',
+    'UISnapshot',
+    'SnapshotWriter',
+    'MappedUISnapshot',
+    'open_snapshot',
+    'SnapshotDiff',
+    'diff_snapshots'
+]
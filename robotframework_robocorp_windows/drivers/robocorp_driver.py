@@ -6,9 +6,13 @@ robocorp-windows底层库的封装，提供统一的接口用于访问底层功
 
 from robocorp.windows import desktop, find_window, find_windows, ElementNotFound, WindowElement
 import subprocess
-import time
+from ..utils.polling import Poller, Deadline
+from ..utils.locator_utils import locator_utils
+from ..extensions.base import get_extension_manager
+from .tree_walker import TreeWalker
+from .ui_snapshot import UISnapshot
+from .snapshot_file import SnapshotWriter
 from ..utils.exceptions import (
-    WindowNotFoundError,
     ControlNotFoundError,
     ApplicationLaunchError,
     ApplicationConnectionError
@@ -18,9 +22,22 @@ from ..utils.exceptions import (
 class RobocorpWindowsDriver:
     """robocorp-windows底层驱动，封装对底层库的调用"""
     
-    def __init__(self):
-        """初始化驱动"""
+    # 控件未找到时，未使用这些策略前缀的定位符会在异常消息中附带格式提示
+    HINTED_STRATEGIES = ('name', 'id', 'class', 'text')
+    
+    def __init__(self, retry_interval=0.5, poller=None, tree_walker=None, extension_manager=None):
+        """初始化驱动
+        
+        Args:
+            retry_interval: 查找循环的最大重试间隔（秒）
+            poller: Poller实例，如果为None则按retry_interval创建
+            tree_walker: TreeWalker实例，如果为None则使用默认遍历深度创建
+            extension_manager: ExtensionManager实例，提供自定义定位策略，如果为None则使用全局扩展管理器
+        """
         self.logger = None
+        self.poller = poller or Poller(max_interval=retry_interval)
+        self.tree_walker = tree_walker or TreeWalker()
+        self.extension_manager = extension_manager if extension_manager is not None else get_extension_manager()
     
     def set_logger(self, logger):
         """设置日志记录器
@@ -30,90 +47,92 @@ class RobocorpWindowsDriver:
         """
         self.logger = logger
     
+    # WaitForInputIdle在进程仍在处理启动输入时的返回值
+    WAIT_TIMEOUT = 0x102
+    
+    # 每次探测时传给robocorp-windows查找的超时时间，只查找一次不在内部等待，重试间隔由Poller控制
+    PROBE_TIMEOUT = 0
+    
+    # OpenProcess访问权限：WaitForInputIdle需要SYNCHRONIZE和查询权限
+    SYNCHRONIZE = 0x00100000
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    
     def launch_application(self, app_path):
-        """启动Windows应用程序
+        """启动Windows应用程序，不等待应用程序就绪
         
         Args:
             app_path: 应用程序可执行文件路径
             
         Returns:
-            str: 可执行文件名
+            subprocess.Popen: 应用程序进程，用于跟踪进程ID和检测进程提前退出
             
         Raises:
             ApplicationLaunchError: 应用程序启动失败时
         """
         try:
-            subprocess.Popen(app_path)
-            time.sleep(1)  # 给应用程序一些启动时间
-            executable_name = app_path.split('\\')[-1] if '\\' in app_path else app_path
-            return executable_name
+            return subprocess.Popen(app_path)
         except Exception as e:
             raise ApplicationLaunchError(f"Failed to launch application {app_path}: {str(e)}")
     
-    def find_window_by_executable(self, executable_name, timeout=10):
-        """根据可执行文件名查找窗口
+    def terminate_application(self, process):
+        """终止launch_application启动的进程，进程已退出时不做任何操作
         
         Args:
-            executable_name: 可执行文件名
-            timeout: 超时时间（秒）
-            
-        Returns:
-            WindowElement: 找到的窗口元素
-            
-        Raises:
-            WindowNotFoundError: 窗口未找到时
+            process: launch_application返回的进程
         """
-        def _find_window():
-            try:
-                windows = find_windows(f"executable:{executable_name}")
-                return windows[0] if windows else None
-            except Exception:
-                return None
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            window = _find_window()
-            if window:
-                return window
-            time.sleep(0.5)
-        
-        raise WindowNotFoundError(f"Window not found for executable {executable_name}")
+        if process.poll() is not None:
+            return
+        try:
+            process.terminate()
+        except OSError:
+            # 检查之后进程已自行退出
+            pass
     
-    def find_window_by_locator(self, locator, timeout=10):
-        """根据定位符查找窗口
+    @staticmethod
+    def get_executable_name(app_path):
+        """获取应用程序路径中的可执行文件名
         
         Args:
-            locator: 窗口定位符
-            timeout: 超时时间（秒）
+            app_path: 应用程序可执行文件路径
             
         Returns:
-            WindowElement: 找到的窗口元素
-            
-        Raises:
-            WindowNotFoundError: 窗口未找到时
+            str: 可执行文件名
         """
-        def _find_window():
-            try:
-                return find_window(locator, raise_error=False)
-            except Exception:
-                return None
+        return app_path.split('\\')[-1] if '\\' in app_path else app_path
+    
+    def is_input_idle(self, process):
+        """检查进程是否已处理完启动输入、开始等待用户输入（WaitForInputIdle，不等待）
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            window = _find_window()
-            if window:
-                return window
-            time.sleep(0.5)
+        按进程ID打开一个只用于等待的进程句柄，检查后立即关闭。
+        无法判断时（非Windows平台、控制台程序、进程已退出或无权打开）视为已空闲。
         
-        raise WindowNotFoundError(f"Window not found with locator: {locator}")
+        Args:
+            process: subprocess.Popen实例
+            
+        Returns:
+            bool: 进程是否空闲
+        """
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            user32 = ctypes.windll.user32
+        except (ImportError, AttributeError):
+            return True
+        handle = kernel32.OpenProcess(self.SYNCHRONIZE | self.PROCESS_QUERY_LIMITED_INFORMATION, False, process.pid)
+        if not handle:
+            return True
+        try:
+            return user32.WaitForInputIdle(handle, 0) != self.WAIT_TIMEOUT
+        finally:
+            kernel32.CloseHandle(handle)
     
     def find_control(self, window, control_identifier, timeout=10):
         """在窗口中查找控件
 
         Args:
             window: 窗口元素
-            control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            timeout: 超时时间（秒）或上层传入的Deadline；每次探测只查找一次，由Poller按自适应退避重试到截止时间
 
         Returns:
             ControlElement: 找到的控件元素
@@ -121,19 +140,31 @@ class RobocorpWindowsDriver:
         Raises:
             ControlNotFoundError: 控件未找到时
         """
-        # 验证定位符格式
-        valid_formats = ["name:", "id:", "class:", "text:"]
-        has_valid_prefix = any(control_identifier.startswith(format) for format in valid_formats)
+        # 使用解析后的定位器，避免重复拆分定位符字符串
+        locator = locator_utils.compile(control_identifier)
+        custom_strategy = self.get_custom_strategy(locator)
+        if custom_strategy is not None:
+            return self._find_with_strategy(custom_strategy, window, locator, timeout)
+        has_valid_prefix = locator.has_explicit_strategy and locator.strategy in self.HINTED_STRATEGIES
+        deadline = Deadline.coerce(timeout)
+        # xpath定位器由内置的XPath引擎在元素树上求值
+        use_xpath_engine = locator.strategy == 'xpath' and locator.is_valid and hasattr(window, 'iter_children')
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        def _find_control():
+            if use_xpath_engine:
+                matches = self.tree_walker.select_xpath(window, locator)
+                return matches[0] if matches else None
             try:
                 if isinstance(window, WindowElement):
-                    return window.find(control_identifier)
+                    return window.find(locator.raw, timeout=self.PROBE_TIMEOUT)
                 else:
-                    return find_window(f"{window} {control_identifier}")
+                    return find_window(f"{window} {locator.raw}", timeout=self.PROBE_TIMEOUT)
             except ElementNotFound:
-                time.sleep(0.5)
+                return None
+        
+        control = self.poller.poll(_find_control, deadline)
+        if control:
+            return control
         
         # 优化异常消息，提供有效定位符格式
         if not has_valid_prefix:
@@ -141,6 +172,287 @@ class RobocorpWindowsDriver:
         else:
             raise ControlNotFoundError(f"Control not found with identifier: {control_identifier}")
     
+    def get_custom_strategy(self, control_identifier):
+        """按定位器前缀获取注册的自定义定位策略
+        
+        只有带显式前缀的单步单条件定位器会分派给插件，链式定位器和组合条件始终由内置实现求值。
+        
+        Args:
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            
+        Returns:
+            LocatorStrategy or None: 注册的定位策略，没有注册时返回None
+        """
+        locator = locator_utils.compile(control_identifier)
+        if not locator.has_explicit_strategy or locator.is_chained or locator.parts[0].extra:
+            return None
+        return self.extension_manager.locator_strategies.get(locator.strategy)
+    
+    def _find_with_strategy(self, strategy, window, locator, timeout):
+        """使用自定义定位策略查找控件
+        
+        插件自行等待，剩余的时间预算一次性交给插件。
+        
+        Args:
+            strategy: LocatorStrategy实例
+            window: 窗口元素
+            locator: CompiledLocator
+            timeout: 超时时间（秒）或上层传入的Deadline
+            
+        Returns:
+            ControlElement: 插件返回的控件元素
+            
+        Raises:
+            ControlNotFoundError: 插件未找到控件时
+        """
+        deadline = Deadline.coerce(timeout)
+        try:
+            control = strategy.find_control(window, locator.value, deadline.remaining())
+        except ElementNotFound:
+            control = None
+        if control is None:
+            raise ControlNotFoundError(f"Control not found with identifier: {locator} (locator strategy '{locator.strategy}')")
+        if self.logger:
+            self.logger.debug(f"Control '{locator}' found by locator strategy '{locator.strategy}'")
+        return control
+    
+    def find_controls(self, window, control_identifiers, timeout=10, on_found=None):
+        """在一次窗口子树遍历中查找多个控件
+        
+        可以在遍历中求值的定位器共享同一次遍历，未全部找到时按退避策略重新遍历剩余的定位器；
+        其他定位器（如xpath）回退到逐个调用find_control。所有查找共用同一个截止时间。
+        
+        Args:
+            window: 窗口元素
+            control_identifiers: 控件标识符列表（定位器字符串或CompiledLocator）
+            timeout: 超时时间（秒）或上层传入的Deadline
+            on_found: 可选回调on_found(locator, control)，每找到一个控件立即调用
+            
+        Returns:
+            dict: 定位器字符串 -> 控件元素，只包含找到的控件
+        """
+        deadline = Deadline.coerce(timeout)
+        locators = [locator_utils.compile(identifier) for identifier in control_identifiers]
+        can_walk = hasattr(window, 'iter_children')
+        walkable = [locator for locator in locators if can_walk and self.tree_walker.is_walkable(locator)]
+        others = [locator for locator in locators if locator not in walkable]
+        found = {}
+        
+        def _record(locator, control):
+            found[locator.raw] = control
+            if on_found:
+                on_found(locator, control)
+        
+        def _walk_pending():
+            pending = [locator for locator in walkable if locator.raw not in found]
+            for locator, control in self.tree_walker.find_many(window, pending):
+                _record(locator, control)
+            return all(locator.raw in found for locator in walkable)
+        
+        if walkable:
+            self.poller.poll(_walk_pending, deadline)
+        
+        for locator in others:
+            if locator.raw in found:
+                continue
+            try:
+                _record(locator, self.find_control(window, locator, deadline))
+            except ControlNotFoundError:
+                pass
+        
+        return found
+    
+    def iter_controls(self, window, control_identifier, timeout=10, max_results=None):
+        """查找窗口中所有匹配的控件，以生成器方式逐个返回
+        
+        等待直到出现第一个匹配的控件或超时，之后在同一次子树遍历中继续产生其余匹配的控件，
+        调用方可以随时停止迭代，未遍历的部分不会被访问。
+        xpath定位器由XPath引擎一次求值；自定义定位策略最多返回一个控件；其他无法在遍历中求值的定位器回退到robocorp-windows的find_many。
+        
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            timeout: 等待第一个匹配控件的超时时间（秒）或上层传入的Deadline
+            max_results: 最多返回的控件数量，为None时不限制
+            
+        Yields:
+            ControlElement: 匹配的控件元素，按遍历顺序产生；超时仍无匹配时不产生任何元素
+        """
+        locator = locator_utils.compile(control_identifier)
+        deadline = Deadline.coerce(timeout)
+        if max_results is not None and max_results <= 0:
+            return
+        
+        # 自定义定位策略只提供单个控件的查找
+        custom_strategy = self.get_custom_strategy(locator)
+        if custom_strategy is not None:
+            try:
+                yield self._find_with_strategy(custom_strategy, window, locator, deadline)
+            except ControlNotFoundError:
+                pass
+            return
+        
+        if locator.strategy == 'xpath' and locator.is_valid and hasattr(window, 'iter_children'):
+            matches = self.poller.poll(lambda: self.tree_walker.select_xpath(window, locator), deadline) or []
+            yield from matches[:max_results]
+            return
+        
+        if hasattr(window, 'iter_children') and self.tree_walker.is_walkable(locator):
+            def _first_match():
+                matches = self.tree_walker.find_all(window, locator, max_results)
+                for control in matches:
+                    return control, matches
+                return None
+            
+            result = self.poller.poll(_first_match, deadline)
+            if result:
+                control, matches = result
+                yield control
+                yield from matches
+            return
+        
+        def _find_many():
+            try:
+                if isinstance(window, WindowElement):
+                    return window.find_many(locator.raw, timeout=self.PROBE_TIMEOUT, wait_for_element=False)
+                return find_windows(f"{window} {locator.raw}", timeout=self.PROBE_TIMEOUT, wait_for_element=False)
+            except ElementNotFound:
+                return None
+        
+        controls = self.poller.poll(_find_many, deadline) or []
+        yield from controls[:max_results] if max_results is not None else controls
+    
+    def capture_snapshot(self, window, max_depth=None):
+        """采集窗口子树快照
+        
+        Args:
+            window: 窗口元素
+            max_depth: 最大采集深度，为None时使用遍历器的最大深度
+            
+        Returns:
+            UISnapshot: 窗口子树快照
+        """
+        max_depth = self.tree_walker.max_depth if max_depth is None else max_depth
+        return UISnapshot.capture(window, max_depth, self.tree_walker.children_of)
+    
+    def save_snapshot(self, window, path, max_depth=None):
+        """采集窗口子树并边遍历边写入快照文件
+        
+        Args:
+            window: 窗口元素
+            path: 快照文件路径
+            max_depth: 最大采集深度，为None时使用遍历器的最大深度
+            
+        Returns:
+            int: 写入的元素数量
+        """
+        max_depth = self.tree_walker.max_depth if max_depth is None else max_depth
+        return SnapshotWriter.capture(window, path, max_depth, self.tree_walker.children_of)
+    
+    def get_control_fingerprint(self, control):
+        """获取控件指纹，用于校验缓存的控件是否仍是界面上的同一个元素
+        
+        优先使用UIA运行时ID，取不到时退回到边界矩形。控件已被销毁时这些属性访问会失败。
+        
+        Args:
+            control: 控件元素
+            
+        Returns:
+            tuple or None: 控件指纹，无法获取时返回None
+        """
+        item = getattr(control, 'item', None)
+        try:
+            if item is not None and hasattr(item, 'GetRuntimeId'):
+                return ('runtime_id',) + tuple(item.GetRuntimeId())
+        except Exception:
+            return None
+        try:
+            return ('rect', control.left, control.top, control.right, control.bottom)
+        except Exception:
+            return None
+    
+    # 表格中表示表头和数据行的控件类型
+    TABLE_HEADER_TYPES = ('HeaderControl',)
+    TABLE_ROW_TYPES = ('DataItemControl', 'ListItemControl', 'TreeItemControl')
+    # 表格中既不是表头也不是数据行的控件类型，没有已知类型的数据行时用于排除
+    TABLE_CHROME_TYPES = ('HeaderControl', 'ScrollBarControl', 'ThumbControl')
+    
+    # UIA ScrollPattern的滚动量和“不滚动”的百分比
+    SCROLL_NO_AMOUNT = 2
+    SCROLL_LARGE_INCREMENT = 3
+    SCROLL_NO_SCROLL = -1
+    
+    def get_table_header(self, grid):
+        """获取表格的列标题
+        
+        Args:
+            grid: 表格控件（DataGrid、ListView等）
+            
+        Returns:
+            list: 列标题文本，表格没有表头时为空列表
+        """
+        for child in self.tree_walker.children_of(grid):
+            if getattr(child, 'control_type', None) in self.TABLE_HEADER_TYPES:
+                return [getattr(item, 'name', None) or '' for item in self.tree_walker.children_of(child)]
+        return []
+    
+    def get_table_rows(self, grid):
+        """获取表格当前已实现的数据行
+        
+        虚拟化的表格只为可见区域附近的行创建UI元素，其余的行需要滚动后才能取到。
+        
+        Args:
+            grid: 表格控件
+            
+        Returns:
+            list: 数据行元素，按界面顺序排列
+        """
+        children = self.tree_walker.children_of(grid)
+        rows = [child for child in children if getattr(child, 'control_type', None) in self.TABLE_ROW_TYPES]
+        if rows:
+            return rows
+        return [child for child in children if getattr(child, 'control_type', None) not in self.TABLE_CHROME_TYPES]
+    
+    def get_table_row_cells(self, row):
+        """获取数据行各单元格的文本
+        
+        Args:
+            row: 数据行元素
+            
+        Returns:
+            list: 单元格文本；数据行没有单元格子元素时（如列表视图的简单列表项）为行本身的文本
+        """
+        cells = self.tree_walker.children_of(row)
+        if not cells:
+            return [getattr(row, 'name', None) or '']
+        return [getattr(cell, 'name', None) or '' for cell in cells]
+    
+    def scroll_table(self, grid, to_top=False):
+        """垂直滚动表格
+        
+        Args:
+            grid: 表格控件
+            to_top: 为True时滚动到顶部，否则向下滚动一页
+            
+        Returns:
+            bool: 滚动位置是否发生变化；表格不支持ScrollPattern或已在底部时返回False
+        """
+        item = getattr(grid, 'item', None)
+        try:
+            pattern = item.GetScrollPattern() if item is not None else None
+            if pattern is None or not pattern.VerticallyScrollable:
+                return False
+            before = pattern.VerticalScrollPercent
+            if to_top:
+                pattern.SetScrollPercent(self.SCROLL_NO_SCROLL, 0)
+            else:
+                pattern.Scroll(self.SCROLL_NO_AMOUNT, self.SCROLL_LARGE_INCREMENT)
+            return pattern.VerticalScrollPercent != before
+        except Exception as e:
+            if self.logger:
+                self.logger.debug(f"Cannot scroll table: {str(e)}")
+            return False
+    
     def get_window_title(self, window):
         """获取窗口标题
         
@@ -195,17 +507,33 @@ class RobocorpWindowsDriver:
         """
         return hasattr(window, 'exists') and window.exists()
     
-    def get_window_by_locator(self, locator, timeout=1):
-        """根据定位符获取窗口（立即返回，不等待）
+    def list_windows(self):
+        """枚举桌面上的所有顶级窗口（一次枚举，不等待）
+        
+        Returns:
+            list: 顶级窗口元素列表，按桌面枚举顺序排列
+        """
+        try:
+            return find_windows("regex:.*", search_depth=1, timeout=0, wait_for_element=False)
+        except ElementNotFound:
+            return []
+    
+    def get_window_info(self, window):
+        """读取窗口的句柄、进程ID、可执行文件、标题和类名
+        
+        窗口已关闭时属性访问会失败，失败的属性记为None。
         
         Args:
-            locator: 窗口定位符
-            timeout: 超时时间（秒）
+            window: 窗口元素
             
         Returns:
-            WindowElement or None: 窗口元素或None
+            dict: handle、pid、executable、title、class_name
         """
-        try:
-            return find_window(locator, raise_error=False, timeout=timeout)
-        except Exception:
-            return None
+        info = {}
+        for key, attribute in (('handle', 'handle'), ('pid', 'pid'), ('executable', 'executable'),
+                               ('title', 'name'), ('class_name', 'class_name')):
+            try:
+                info[key] = getattr(window, attribute, None)
+            except Exception:
+                info[key] = None
+        return info
@@ -0,0 +1,172 @@
+# robotframework_robocorp_windows/drivers/snapshot_diff.py
+
+"""
+UI快照比较，找出两次采集之间新增、删除和变化的元素
+"""
+
+from collections import deque
+
+
+class SnapshotDiff:
+    """两个快照之间的差异
+
+    Attributes:
+        old: 旧快照
+        new: 新快照
+        added: 新增子树的根节点（新快照中的SnapshotNode）
+        removed: 删除子树的根节点（旧快照中的SnapshotNode）
+        changed: 内容变化的节点，每项为 (旧节点, 新节点, {属性名: (旧值, 新值)})
+    """
+
+    def __init__(self, old, new):
+        """初始化空差异
+
+        Args:
+            old: 旧快照
+            new: 新快照
+        """
+        self.old = old
+        self.new = new
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"SnapshotDiff(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)})"
+
+    def to_dict(self):
+        """转换为只包含基本类型的字典，便于在Robot Framework中使用
+
+        Returns:
+            dict: 包含added、removed、changed三个列表，每个元素用属性字典描述，
+                changed中的元素额外包含changes: {属性名: [旧值, 新值]}
+        """
+        changed = []
+        for _, new_node, changes in self.changed:
+            entry = _describe(new_node)
+            entry['changes'] = {attribute: [old_value, new_value] for attribute, (old_value, new_value) in changes.items()}
+            changed.append(entry)
+        return {
+            'added': [_describe(node) for node in self.added],
+            'removed': [_describe(node) for node in self.removed],
+            'changed': changed
+        }
+
+
+def diff_snapshots(old, new):
+    """比较两个快照
+
+    从根节点开始自顶向下比较，子树哈希相同的子树直接跳过，只深入内容或结构有变化的子树。
+    兄弟节点先按子树哈希配对（未变化），剩余节点按 (控件类型, 类名, AutomationId) 依次配对，
+    配对成功的节点继续比较，无法配对的节点作为整棵子树新增或删除。
+
+    Args:
+        old: 旧快照（UISnapshot或MappedUISnapshot）
+        new: 新快照
+
+    Returns:
+        SnapshotDiff: 差异
+    """
+    diff = SnapshotDiff(old, new)
+    stack = [(0, 0)]
+    while stack:
+        old_index, new_index = stack.pop()
+        if old.subtree_hash(old_index) == new.subtree_hash(new_index):
+            continue
+        old_content = old.content(old_index)
+        new_content = new.content(new_index)
+        if old_content != new_content:
+            changes = {
+                attribute: (old_value, new_value)
+                for attribute, old_value, new_value in zip(old.CONTENT_ATTRIBUTES, old_content, new_content)
+                if old_value != new_value
+            }
+            diff.changed.append((old.node(old_index), new.node(new_index), changes))
+        stack.extend(_match_children(diff, old_index, new_index))
+
+    diff.added.sort(key=lambda node: node.index)
+    diff.removed.sort(key=lambda node: node.index)
+    diff.changed.sort(key=lambda change: change[1].index)
+    return diff
+
+
+def _match_children(diff, old_index, new_index):
+    """配对两个节点的子节点，记录无法配对的新增和删除子树
+
+    Args:
+        diff: SnapshotDiff
+        old_index: 旧快照中的父节点序号
+        new_index: 新快照中的父节点序号
+
+    Returns:
+        list: 需要继续比较的 (旧节点序号, 新节点序号) 列表
+    """
+    old, new = diff.old, diff.new
+
+    # 子树完全相同的子节点直接配对
+    unchanged = {}
+    for child in old.children(old_index):
+        unchanged.setdefault(old.subtree_hash(child), deque()).append(child)
+    pending_new = []
+    for child in new.children(new_index):
+        candidates = unchanged.get(new.subtree_hash(child))
+        if candidates:
+            candidates.popleft()
+        else:
+            pending_new.append(child)
+    if not pending_new and not any(unchanged.values()):
+        return []
+
+    # 剩余子节点按身份配对
+    by_identity = {}
+    for child in sorted(child for candidates in unchanged.values() for child in candidates):
+        by_identity.setdefault(_identity(old, child), deque()).append(child)
+    pairs = []
+    for child in pending_new:
+        candidates = by_identity.get(_identity(new, child))
+        if candidates:
+            pairs.append((candidates.popleft(), child))
+        else:
+            diff.added.append(new.node(child))
+    for candidates in by_identity.values():
+        diff.removed.extend(old.node(child) for child in candidates)
+    return pairs
+
+
+def _identity(snapshot, index):
+    """获取用于配对兄弟节点的身份键
+
+    Args:
+        snapshot: 快照
+        index: 节点序号
+
+    Returns:
+        tuple: (控件类型, 类名, AutomationId)
+    """
+    return (
+        snapshot.get(index, 'control_type'),
+        snapshot.get(index, 'class_name'),
+        snapshot.get(index, 'automation_id')
+    )
+
+
+def _describe(node):
+    """将快照节点转换为属性字典
+
+    Args:
+        node: SnapshotNode
+
+    Returns:
+        dict: 节点属性
+    """
+    return {
+        'index': node.index,
+        'control_type': node.control_type,
+        'name': node.name,
+        'class_name': node.class_name,
+        'automation_id': node.automation_id,
+        'rect': list(node.rect)
+    }
@@ -0,0 +1,366 @@
+# robotframework_robocorp_windows/drivers/snapshot_file.py
+
+"""
+UI快照文件格式，支持边采集边写入，以及通过内存映射直接查询保存的快照
+"""
+
+import mmap
+import struct
+from array import array
+from .ui_snapshot import UISnapshot, capture_tree
+from ..utils.exceptions import SnapshotFormatError
+
+
+# 文件格式（小端序）：
+#   文件头    magic(8s) version(H) reserved(H) node_count(I) string_count(I) strings_offset(Q) index_offset(Q)，补齐到40字节
+#   节点区    每个节点10个int32：parent, depth, control_type, name, class_name, automation_id, left, top, right, bottom
+#   字符串区  (string_count+1)个uint32偏移 + UTF-8字节串，补齐到4字节；之后是按UTF-8字节排序的string_count个字符串序号
+#             序号1（UISnapshot.NO_VALUE_ID）表示没有值，保存为不是合法UTF-8的NO_VALUE_BYTES，查找字符串时不会命中
+#   索引区    依次为name、class_name、automation_id：(string_count+1)个uint32偏移 + node_count个节点序号（CSR格式）
+MAGIC = b'RFWSNAP\x00'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sHHIIQQ')
+HEADER_SIZE = 40
+RECORD_FIELDS = 10
+RECORD = struct.Struct(f'<{RECORD_FIELDS}i')
+NO_VALUE_BYTES = b'\xff'
+
+# 节点记录中各列的位置
+PARENT, DEPTH, CONTROL_TYPE, NAME, CLASS_NAME, AUTOMATION_ID, RECT = range(7)
+
+# 建立索引的属性 -> 节点记录中的列位置，顺序即索引区中的顺序
+INDEXED_FIELDS = (('name', NAME), ('class_name', CLASS_NAME), ('automation_id', AUTOMATION_ID))
+
+
+class SnapshotWriter:
+    """快照文件写入器
+
+    节点记录在add_node时直接写入文件，内存中只保留字符串表和节点序号索引，
+    采集大型窗口时不需要先在内存中构建完整快照。close时写入字符串区和索引区并回填文件头。
+    """
+
+    def __init__(self, path):
+        """创建快照文件
+
+        Args:
+            path: 文件路径，已存在时覆盖
+        """
+        self.path = path
+        self.strings = ['', None]
+        self._string_ids = {'': 0}
+        self._postings = {attribute: [] for attribute, _ in INDEXED_FIELDS}
+        self.node_count = 0
+        self._file = open(path, 'wb')
+        self._file.write(b'\x00' * HEADER_SIZE)
+
+    @classmethod
+    def capture(cls, root, path, max_depth=8, children_of=None):
+        """采集元素子树并直接写入快照文件
+
+        Args:
+            root: 根元素（通常为窗口）
+            path: 文件路径
+            max_depth: 最大采集深度
+            children_of: 返回元素子元素列表的函数，默认调用元素的iter_children()
+
+        Returns:
+            int: 写入的节点数量
+        """
+        with cls(path) as writer:
+            capture_tree(writer, root, max_depth, children_of)
+        return writer.node_count
+
+    @classmethod
+    def save(cls, snapshot, path):
+        """将内存中的快照写入文件
+
+        Args:
+            snapshot: UISnapshot
+            path: 文件路径
+
+        Returns:
+            int: 写入的节点数量
+        """
+        with cls(path) as writer:
+            for index in range(len(snapshot)):
+                writer.add_node(
+                    snapshot.parents[index],
+                    snapshot.depths[index],
+                    control_type=snapshot.get(index, 'control_type'),
+                    name=snapshot.get(index, 'name'),
+                    class_name=snapshot.get(index, 'class_name'),
+                    automation_id=snapshot.get(index, 'automation_id'),
+                    rect=snapshot.rect(index)
+                )
+        return writer.node_count
+
+    def intern(self, value):
+        """获取字符串序号，不存在时加入字符串表
+
+        Args:
+            value: 字符串，为None时返回UISnapshot.NO_VALUE_ID
+
+        Returns:
+            int: 字符串序号
+        """
+        if value is None:
+            return UISnapshot.NO_VALUE_ID
+        value = str(value)
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def add_node(self, parent, depth, control_type=None, name=None, class_name=None, automation_id=None, rect=(0, 0, 0, 0)):
+        """写入一个节点，节点必须按深度优先先序写入
+
+        参数与UISnapshot.add_node一致。
+
+        Returns:
+            int: 新节点的序号
+        """
+        index = self.node_count
+        string_ids = {
+            'name': self.intern(name),
+            'class_name': self.intern(class_name),
+            'automation_id': self.intern(automation_id)
+        }
+        for attribute, _ in INDEXED_FIELDS:
+            self._postings[attribute].append(string_ids[attribute])
+        self._file.write(RECORD.pack(
+            parent, depth, self.intern(control_type),
+            string_ids['name'], string_ids['class_name'], string_ids['automation_id'],
+            *rect
+        ))
+        self.node_count += 1
+        return index
+
+    def close(self):
+        """写入字符串区和索引区，回填文件头并关闭文件"""
+        if self._file.closed:
+            return
+        try:
+            strings_offset = self._file.tell()
+            encoded = [NO_VALUE_BYTES if value is None else value.encode('utf-8') for value in self.strings]
+            offsets = array('I', [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            self._file.write(offsets.tobytes())
+            self._file.write(b''.join(encoded))
+            self._pad()
+            sorted_ids = array('i', sorted(range(len(encoded)), key=encoded.__getitem__))
+            self._file.write(sorted_ids.tobytes())
+
+            index_offset = self._file.tell()
+            for attribute, _ in INDEXED_FIELDS:
+                self._write_postings(self._postings[attribute])
+
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.node_count, len(self.strings),
+                                         strings_offset, index_offset))
+        finally:
+            self._file.close()
+
+    def _write_postings(self, string_ids):
+        """以CSR格式写入一个属性的索引
+
+        Args:
+            string_ids: 按节点顺序排列的属性值字符串序号
+        """
+        counts = [0] * len(self.strings)
+        for string_id in string_ids:
+            counts[string_id] += 1
+        offsets = array('I', [0])
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+        positions = list(offsets[:-1])
+        postings = array('i', [0]) * len(string_ids)
+        for index, string_id in enumerate(string_ids):
+            postings[positions[string_id]] = index
+            positions[string_id] += 1
+        self._file.write(offsets.tobytes())
+        self._file.write(postings.tobytes())
+
+    def _pad(self):
+        """补齐到4字节边界"""
+        remainder = self._file.tell() % 4
+        if remainder:
+            self._file.write(b'\x00' * (4 - remainder))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MappedUISnapshot(UISnapshot):
+    """通过内存映射读取的快照文件
+
+    打开文件时只校验文件头，节点列、字符串和索引都直接引用映射的内存，
+    查询时按需解码用到的字符串，不需要解析整个文件。查询接口与UISnapshot一致。
+    """
+
+    def __init__(self, path):
+        """打开快照文件
+
+        Args:
+            path: 文件路径
+
+        Raises:
+            SnapshotFormatError: 文件不是快照文件或版本不受支持时
+        """
+        self.path = path
+        self._views = []
+        with open(path, 'rb') as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotFormatError(f"Not a UI snapshot file: {path}")
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        """校验文件头并建立各区域的视图"""
+        if len(self._mmap) < HEADER_SIZE:
+            raise SnapshotFormatError(f"Not a UI snapshot file: {self.path}")
+        magic, version, _, node_count, string_count, strings_offset, index_offset = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise SnapshotFormatError(f"Not a UI snapshot file: {self.path}")
+        if version != FORMAT_VERSION:
+            raise SnapshotFormatError(
+                f"Unsupported UI snapshot version {version} in {self.path}, expected {FORMAT_VERSION}")
+        if index_offset + 3 * 4 * (string_count + 1 + node_count) > len(self._mmap):
+            raise SnapshotFormatError(f"Truncated UI snapshot file: {self.path}")
+
+        self._node_count = node_count
+        self._records = self._view(HEADER_SIZE, node_count * RECORD.size, 'i')
+        self.parents = self._records[PARENT::RECORD_FIELDS]
+        self.depths = self._records[DEPTH::RECORD_FIELDS]
+        self.control_types = self._records[CONTROL_TYPE::RECORD_FIELDS]
+        self.names = self._records[NAME::RECORD_FIELDS]
+        self.class_names = self._records[CLASS_NAME::RECORD_FIELDS]
+        self.automation_ids = self._records[AUTOMATION_ID::RECORD_FIELDS]
+        self._views.extend([self.parents, self.depths, self.control_types,
+                            self.names, self.class_names, self.automation_ids])
+
+        string_offsets = self._view(strings_offset, 4 * (string_count + 1), 'I')
+        blob_offset = strings_offset + 4 * (string_count + 1)
+        sorted_offset = blob_offset + string_offsets[-1]
+        sorted_offset += -sorted_offset % 4
+        self.strings = _MappedStrings(self._mmap, string_offsets, blob_offset)
+        self._sorted_ids = self._view(sorted_offset, 4 * string_count, 'i')
+
+        self._index_views = {}
+        offset = index_offset
+        for attribute, _ in INDEXED_FIELDS:
+            offsets = self._view(offset, 4 * (string_count + 1), 'I')
+            postings = self._view(offset + 4 * (string_count + 1), 4 * node_count, 'i')
+            self._index_views[attribute] = (offsets, postings)
+            offset += 4 * (string_count + 1 + node_count)
+
+    def _view(self, offset, size, format):
+        """建立映射内存中一段区域的类型化视图
+
+        Args:
+            offset: 起始偏移
+            size: 字节数
+            format: 元素格式（'i'或'I'）
+
+        Returns:
+            memoryview: 视图
+        """
+        raw = memoryview(self._mmap)[offset:offset + size]
+        view = raw.cast(format)
+        self._views.extend([raw, view])
+        return view
+
+    def __len__(self):
+        return self._node_count
+
+    def add_node(self, *args, **kwargs):
+        raise TypeError("Mapped UI snapshots are read-only")
+
+    def intern(self, value):
+        raise TypeError("Mapped UI snapshots are read-only")
+
+    def rect(self, index):
+        start = index * RECORD_FIELDS + RECT
+        return tuple(self._records[start:start + 4])
+
+    def _string_id(self, value):
+        """在按字节排序的字符串序号上二分查找"""
+        target = value.encode('utf-8')
+        low, high = 0, len(self._sorted_ids)
+        while low < high:
+            middle = (low + high) // 2
+            string_id = self._sorted_ids[middle]
+            current = self.strings.raw(string_id)
+            if current == target:
+                return string_id
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _postings(self, attribute, string_id):
+        offsets, postings = self._index_views[attribute]
+        return postings[offsets[string_id]:offsets[string_id + 1]]
+
+    def close(self):
+        """释放视图并关闭内存映射"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _MappedStrings:
+    """映射内存中的字符串表，按需解码并缓存"""
+
+    def __init__(self, buffer, offsets, blob_offset):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._blob_offset = blob_offset
+        self._decoded = {}
+
+    def raw(self, string_id):
+        start = self._blob_offset + self._offsets[string_id]
+        end = self._blob_offset + self._offsets[string_id + 1]
+        return self._buffer[start:end]
+
+    def __getitem__(self, string_id):
+        if string_id == UISnapshot.NO_VALUE_ID:
+            return None
+        value = self._decoded.get(string_id)
+        if value is None:
+            value = self._decoded[string_id] = self.raw(string_id).decode('utf-8')
+        return value
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+def open_snapshot(path):
+    """打开保存的快照文件
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        MappedUISnapshot: 内存映射的快照，使用完后应调用close()或用作上下文管理器
+    """
+    return MappedUISnapshot(path)
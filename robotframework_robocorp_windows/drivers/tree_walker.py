@@ -0,0 +1,341 @@
+# robotframework_robocorp_windows/drivers/tree_walker.py
+
+"""
+UI元素树遍历，在一次遍历中对已解析的定位器求值
+"""
+
+from ..utils.locator_utils import locator_utils
+
+
+class TreeWalker:
+    """UI元素树遍历器
+
+    以深度优先先序遍历窗口子树（不含根元素），在内存中对定位器求值：
+    - name/text 匹配元素名称，id 匹配AutomationId，class 匹配类名，regex 匹配名称
+    - 链式定位器 ``A > B`` 要求B的祖先中依次存在匹配A的元素
+    - index 条件（从1开始）只能出现在链的最后一步，表示第N个匹配的元素
+    - 其他策略（如xpath、executable）无法在遍历中求值，由调用方回退到逐个查找
+    - 包含未知条件前缀（如 ``type:Button``）或 ``and``/``or`` 的定位器同样由调用方交给robocorp-windows
+
+    每个元素的属性在一次遍历中只读取一次，多个定位器共享读取结果。
+    遍历器只依赖元素的属性和子元素枚举函数，可以直接用内存中的假元素树测试。
+    """
+
+    # 可在遍历中求值的定位策略 -> 元素属性名
+    ATTRIBUTE_STRATEGIES = {
+        'name': 'name',
+        'text': 'name',
+        'id': 'automation_id',
+        'class': 'class_name',
+        'regex': 'name'
+    }
+
+    def __init__(self, max_depth=8, children_of=None):
+        """初始化遍历器
+
+        Args:
+            max_depth: 最大遍历深度（根元素的子元素深度为1）
+            children_of: 返回元素子元素列表的函数，默认调用元素的iter_children()
+        """
+        self.max_depth = max_depth
+        self.children_of = children_of or self.default_children_of
+
+    @staticmethod
+    def default_children_of(element):
+        """枚举元素的直接子元素
+
+        Args:
+            element: UI元素
+
+        Returns:
+            list: 子元素列表，元素不支持枚举或已失效时返回空列表
+        """
+        iter_children = getattr(element, 'iter_children', None)
+        if iter_children is None:
+            return []
+        try:
+            return list(iter_children())
+        except Exception:
+            return []
+
+    @classmethod
+    def is_walkable(cls, locator):
+        """检查定位器能否在遍历中求值
+
+        Args:
+            locator: 定位器字符串或CompiledLocator
+
+        Returns:
+            bool: 是否可以在遍历中求值
+        """
+        locator = locator_utils.compile(locator)
+        if not locator.is_valid or not locator.parts or not locator.walkable:
+            return False
+        last_index = len(locator.parts) - 1
+        for position, part in enumerate(locator.parts):
+            for criterion in part.criteria:
+                if criterion.strategy == 'index':
+                    if position != last_index or not criterion.match_value.isdigit():
+                        return False
+                elif criterion.strategy not in cls.ATTRIBUTE_STRATEGIES:
+                    return False
+        return True
+
+    def walk(self, root):
+        """深度优先先序遍历子树
+
+        Args:
+            root: 根元素（不包含在结果中）
+
+        Yields:
+            ElementNode: 子树中的每个元素节点
+        """
+        stack = [(child, None, 1) for child in reversed(self.children_of(root))]
+        while stack:
+            element, parent, depth = stack.pop()
+            node = ElementNode(element, parent)
+            yield node
+            if depth < self.max_depth:
+                children = self.children_of(element)
+                stack.extend((child, node, depth + 1) for child in reversed(children))
+
+    def find_many(self, root, locators):
+        """在一次遍历中解析多个定位器，每个定位器取第一个匹配的元素
+
+        Args:
+            root: 根元素
+            locators: 可遍历求值的定位器列表
+
+        Yields:
+            tuple: (locator, element)，按元素被找到的顺序产生，全部找到后停止遍历
+        """
+        pending = {}
+        for locator in locators:
+            locator = locator_utils.compile(locator)
+            pending.setdefault(locator.raw, [locator, self._target_index(locator)])
+        if not pending:
+            return
+        for node in self.walk(root):
+            for raw in list(pending):
+                entry = pending[raw]
+                if self.matches(node, entry[0]):
+                    entry[1] -= 1
+                    if entry[1] <= 0:
+                        del pending[raw]
+                        yield entry[0], node.element
+            if not pending:
+                return
+
+    def find_all(self, root, locator, max_results=None):
+        """查找所有匹配定位器的元素
+
+        Args:
+            root: 根元素
+            locator: 可遍历求值的定位器
+            max_results: 最多返回的元素数量，为None时不限制
+
+        Yields:
+            元素，按遍历顺序产生
+        """
+        locator = locator_utils.compile(locator)
+        if max_results is not None and max_results <= 0:
+            return
+        count = 0
+        for node in self.walk(root):
+            if self.matches(node, locator):
+                yield node.element
+                count += 1
+                if max_results is not None and count >= max_results:
+                    return
+
+    def select_xpath(self, root, locator):
+        """在实时元素树上对xpath定位器求值
+
+        元素的子元素列表和属性在一次求值中只读取一次，遍历深度受max_depth限制。
+
+        Args:
+            root: 根元素（上下文节点，不包含在结果中）
+            locator: xpath定位器字符串或CompiledLocator
+
+        Returns:
+            list: 匹配的元素，按文档顺序排列
+        """
+        expression = locator_utils.compile(locator).xpath
+        return [node.element for node in expression.select(LiveXPathTree(root, self))]
+
+    def matches(self, node, locator):
+        """检查元素节点是否匹配定位器（不考虑index条件）
+
+        Args:
+            node: ElementNode
+            locator: CompiledLocator
+
+        Returns:
+            bool: 是否匹配
+        """
+        parts = locator.parts
+        if not self._matches_part(node, parts[-1]):
+            return False
+        # 链中前面的步骤依次匹配祖先元素（从近到远贪心匹配）
+        ancestor = node.parent
+        for part in reversed(parts[:-1]):
+            while ancestor is not None and not self._matches_part(ancestor, part):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+        return True
+
+    def _matches_part(self, node, part):
+        """检查元素节点是否满足步骤中的全部条件
+
+        Args:
+            node: ElementNode
+            part: LocatorPart
+
+        Returns:
+            bool: 是否匹配
+        """
+        for criterion in part.criteria:
+            if criterion.strategy == 'index':
+                continue
+            value = node.get(self.ATTRIBUTE_STRATEGIES[criterion.strategy])
+            if value is None:
+                return False
+            if criterion.regex is not None:
+                if not criterion.regex.match(str(value)):
+                    return False
+            elif str(value) != criterion.match_value:
+                return False
+        return True
+
+    @staticmethod
+    def _target_index(locator):
+        """获取定位器最后一步的index条件
+
+        Args:
+            locator: CompiledLocator
+
+        Returns:
+            int: 需要的匹配序号（从1开始），没有index条件时为1
+        """
+        for criterion in locator.parts[-1].criteria:
+            if criterion.strategy == 'index':
+                return max(int(criterion.match_value), 1)
+        return 1
+
+
+class ElementNode:
+    """遍历中的元素节点，缓存一次遍历内已读取的元素属性"""
+
+    __slots__ = ('element', 'parent', '_attributes')
+
+    def __init__(self, element, parent=None):
+        """初始化元素节点
+
+        Args:
+            element: UI元素
+            parent: 父节点（根元素的子元素为None）
+        """
+        self.element = element
+        self.parent = parent
+        self._attributes = {}
+
+    def get(self, attribute):
+        """读取元素属性，同一节点上的重复读取直接返回缓存值
+
+        Args:
+            attribute: 属性名
+
+        Returns:
+            属性值，读取失败时返回None
+        """
+        if attribute not in self._attributes:
+            try:
+                self._attributes[attribute] = getattr(self.element, attribute, None)
+            except Exception:
+                self._attributes[attribute] = None
+        return self._attributes[attribute]
+
+
+class LiveXPathTree:
+    """XPath引擎使用的实时元素树适配器
+
+    节点为XPathNode，按需枚举子元素并缓存，文档顺序由从根开始的子元素位置路径确定。
+    实时元素树没有现成的索引，lookup第一次按某个属性查找时遍历一次子树（受max_depth限制），
+    只读取该属性并建立「属性值 -> 节点列表」的索引，之后同一次求值中按该属性的查找直接使用索引；
+    控件类型和其他谓词只在命中的节点上读取。
+    """
+
+    # 由边界矩形计算的XPath属性
+    DERIVED_ATTRIBUTES = {
+        'width': ('right', 'left'),
+        'height': ('bottom', 'top')
+    }
+
+    def __init__(self, root, walker):
+        """初始化适配器
+
+        Args:
+            root: 根元素
+            walker: 提供children_of和max_depth的TreeWalker
+        """
+        self.walker = walker
+        self.root = XPathNode(root, None, ())
+        self._indexes = {}  # 属性名 -> {属性值: 节点列表（文档顺序）}
+
+    def children(self, node):
+        if node.children is None:
+            if len(node.path) >= self.walker.max_depth:
+                node.children = []
+            else:
+                node.children = [XPathNode(child, node, node.path + (position,))
+                                 for position, child in enumerate(self.walker.children_of(node.element))]
+        return node.children
+
+    def parent(self, node):
+        return node.parent
+
+    def get(self, node, attribute):
+        derived = self.DERIVED_ATTRIBUTES.get(attribute)
+        if derived is not None:
+            high, low = (node.get(side) for side in derived)
+            try:
+                return int(high) - int(low)
+            except (TypeError, ValueError):
+                return None
+        return node.get(attribute)
+
+    def order(self, node):
+        return node.path
+
+    def lookup(self, attribute, value):
+        index = self._indexes.get(attribute)
+        if index is None:
+            index = self._indexes[attribute] = {}
+            stack = list(reversed(self.children(self.root)))
+            while stack:
+                node = stack.pop()
+                # 与XPath比较一致，没有值的属性按空字符串处理
+                key = node.get(attribute)
+                index.setdefault('' if key is None else str(key), []).append(node)
+                stack.extend(reversed(self.children(node)))
+        return index.get(value, [])
+
+
+class XPathNode(ElementNode):
+    """XPath求值中的实时元素节点，缓存子节点列表和文档顺序路径"""
+
+    __slots__ = ('path', 'children')
+
+    def __init__(self, element, parent, path):
+        """初始化节点
+
+        Args:
+            element: UI元素
+            parent: 父节点（根节点为None）
+            path: 从根节点开始的子元素位置路径
+        """
+        super().__init__(element, parent)
+        self.path = path
+        self.children = None
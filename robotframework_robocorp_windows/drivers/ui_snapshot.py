@@ -0,0 +1,564 @@
+# robotframework_robocorp_windows/drivers/ui_snapshot.py
+
+"""
+UI元素树快照，一次采集窗口子树，之后在内存中反复查询
+"""
+
+from array import array
+from .tree_walker import TreeWalker
+from ..utils.locator_utils import locator_utils
+
+
+class UISnapshot:
+    """UI元素树快照
+
+    存储结构（列式）：
+    - 每个元素对应一个从0开始的节点序号，节点按深度优先先序排列，0为根元素
+    - parents/depths/control_types/names/class_names/automation_ids 为并行数组，
+      字符串列只保存字符串表中的序号，相同字符串只存一份；读取失败或为None的属性保存为NO_VALUE_ID，
+      与实时遍历一致，不会被任何条件（包括 ``regex:.*`` 和空字符串）匹配
+    - rects 按 left, top, right, bottom 顺序每个节点占4个元素
+    - 名称、类名、AutomationId 各有一个「字符串序号 -> 节点序号数组」的索引，
+      按这些条件查找时无需扫描全部节点
+
+    定位器语义与TreeWalker一致（不匹配根元素本身），只支持可在遍历中求值的定位器。
+    快照采集后不再访问实时界面，查询不产生跨进程调用。
+    """
+
+    # 定位策略 -> 节点属性名
+    ATTRIBUTE_STRATEGIES = TreeWalker.ATTRIBUTE_STRATEGIES
+
+    # 建立索引的节点属性 -> 存储该属性的列名
+    INDEXED_COLUMNS = {
+        'name': 'names',
+        'class_name': 'class_names',
+        'automation_id': 'automation_ids'
+    }
+
+    # 参与内容比较的节点属性
+    CONTENT_ATTRIBUTES = ('control_type', 'name', 'class_name', 'automation_id', 'rect')
+
+    # 表示属性没有值（None）的字符串序号，与空字符串区分
+    NO_VALUE_ID = 1
+
+    # 子节点列表和子树哈希，首次使用时构建
+    _structure = None
+
+    def __init__(self):
+        """初始化空快照"""
+        self.strings = ['', None]  # 字符串表，序号0固定为空字符串，序号1固定表示没有值
+        self._string_ids = {'': 0}
+        self.parents = array('i')
+        self.depths = array('i')
+        self.control_types = array('i')
+        self.names = array('i')
+        self.class_names = array('i')
+        self.automation_ids = array('i')
+        self.rects = array('i')
+        self._indexes = {attribute: {} for attribute in self.INDEXED_COLUMNS}
+
+    @classmethod
+    def capture(cls, root, max_depth=8, children_of=None):
+        """采集元素子树，生成快照
+
+        Args:
+            root: 根元素（通常为窗口），作为0号节点保存
+            max_depth: 最大采集深度（根元素的子元素深度为1）
+            children_of: 返回元素子元素列表的函数，默认调用元素的iter_children()
+
+        Returns:
+            UISnapshot: 采集到的快照
+        """
+        snapshot = cls()
+        capture_tree(snapshot, root, max_depth, children_of)
+        return snapshot
+
+    def intern(self, value):
+        """获取字符串在字符串表中的序号，不存在时加入字符串表
+
+        Args:
+            value: 字符串，为None时返回NO_VALUE_ID
+
+        Returns:
+            int: 字符串序号
+        """
+        if value is None:
+            return self.NO_VALUE_ID
+        value = str(value)
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def add_node(self, parent, depth, control_type=None, name=None, class_name=None, automation_id=None, rect=(0, 0, 0, 0)):
+        """追加一个节点，节点必须按深度优先先序追加
+
+        Args:
+            parent: 父节点序号，根节点为-1
+            depth: 节点深度，根节点为0
+            control_type: 控件类型
+            name: 元素名称
+            class_name: 类名
+            automation_id: AutomationId
+            rect: 边界矩形 (left, top, right, bottom)
+
+        Returns:
+            int: 新节点的序号
+        """
+        index = len(self.parents)
+        self.parents.append(parent)
+        self.depths.append(depth)
+        self.control_types.append(self.intern(control_type))
+        for attribute, value in (('name', name), ('class_name', class_name), ('automation_id', automation_id)):
+            string_id = self.intern(value)
+            getattr(self, self.INDEXED_COLUMNS[attribute]).append(string_id)
+            postings = self._indexes[attribute].get(string_id)
+            if postings is None:
+                postings = self._indexes[attribute][string_id] = array('i')
+            postings.append(index)
+        self.rects.extend(rect)
+        self._structure = None
+        return index
+
+    def __len__(self):
+        """获取节点数量
+
+        Returns:
+            int: 节点数量（包含根节点）
+        """
+        return len(self.parents)
+
+    def get(self, index, attribute):
+        """读取节点属性
+
+        Args:
+            index: 节点序号
+            attribute: 属性名（name、class_name、automation_id、control_type）
+
+        Returns:
+            str: 属性值，没有值时为None
+        """
+        if attribute == 'control_type':
+            return self.strings[self.control_types[index]]
+        return self.strings[getattr(self, self.INDEXED_COLUMNS[attribute])[index]]
+
+    def rect(self, index):
+        """读取节点的边界矩形
+
+        Args:
+            index: 节点序号
+
+        Returns:
+            tuple: (left, top, right, bottom)
+        """
+        start = index * 4
+        return tuple(self.rects[start:start + 4])
+
+    def node(self, index):
+        """获取节点视图
+
+        Args:
+            index: 节点序号
+
+        Returns:
+            SnapshotNode: 节点视图，属性名与实时元素一致
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Snapshot node index out of range: {index}")
+        return SnapshotNode(self, index)
+
+    def content(self, index):
+        """获取节点参与比较的内容
+
+        Args:
+            index: 节点序号
+
+        Returns:
+            tuple: 按CONTENT_ATTRIBUTES顺序排列的属性值
+        """
+        return (
+            self.get(index, 'control_type'),
+            self.get(index, 'name'),
+            self.get(index, 'class_name'),
+            self.get(index, 'automation_id'),
+            self.rect(index)
+        )
+
+    def children(self, index):
+        """获取节点的子节点序号
+
+        Args:
+            index: 节点序号
+
+        Returns:
+            list: 子节点序号（升序）
+        """
+        return self._get_structure()[0][index]
+
+    def subtree_hash(self, index):
+        """获取子树内容哈希，子树中任一节点的内容或结构变化都会改变哈希
+
+        哈希只在同一进程内可比较，用于快照比较时跳过未变化的子树。
+
+        Args:
+            index: 节点序号
+
+        Returns:
+            int: 子树哈希
+        """
+        return self._get_structure()[1][index]
+
+    def _get_structure(self):
+        """构建子节点列表和子树哈希
+
+        节点按先序排列，子节点序号总是大于父节点，逆序遍历一次即可自底向上计算哈希。
+
+        Returns:
+            tuple: (子节点列表, 子树哈希列表)
+        """
+        if self._structure is None:
+            count = len(self)
+            children = [[] for _ in range(count)]
+            parents = self.parents
+            for index in range(1, count):
+                children[parents[index]].append(index)
+            hashes = [0] * count
+            for index in range(count - 1, -1, -1):
+                hashes[index] = hash((self.content(index), tuple(hashes[child] for child in children[index])))
+            self._structure = (children, hashes)
+        return self._structure
+
+    def supports(self, locator):
+        """检查定位器能否在快照上求值
+
+        Args:
+            locator: 定位器字符串或CompiledLocator
+
+        Returns:
+            bool: 是否可以求值
+        """
+        locator = locator_utils.compile(locator)
+        if locator.alternatives:
+            return all(self.supports(alternative) for alternative in locator.alternatives)
+        if locator.is_valid and locator.strategy == 'xpath':
+            return True
+        return TreeWalker.is_walkable(locator)
+
+    def find_all(self, locator, max_results=None):
+        """查找所有匹配定位器的节点
+
+        xpath定位器由XPath引擎求值，``//`` 步骤上的属性相等条件同样使用索引。
+        其他定位器最后一步中可索引的精确条件（name/text/id/class）通过索引取候选节点，
+        选择候选最少的索引，其余条件和链中祖先步骤在候选节点上校验。
+        定位器带index条件时只返回第N个匹配的节点。
+        备选定位器按书写顺序求值，返回第一个有匹配的备选项的结果。
+
+        Args:
+            locator: 定位器字符串或CompiledLocator
+            max_results: 最多返回的节点数量，为None时不限制
+
+        Yields:
+            SnapshotNode: 匹配的节点，按先序顺序产生
+
+        Raises:
+            ValueError: 定位器无法在快照上求值时
+        """
+        locator = locator_utils.compile(locator)
+        if not self.supports(locator):
+            raise ValueError(f"Locator cannot be evaluated against a snapshot: {locator}")
+        if max_results is not None and max_results <= 0:
+            return
+        if locator.alternatives:
+            for alternative in locator.alternatives:
+                nodes = self.find_all(alternative, max_results)
+                first = next(nodes, None)
+                if first is not None:
+                    yield first
+                    yield from nodes
+                    return
+            return
+        if locator.strategy == 'xpath':
+            for index in locator.xpath.select(SnapshotXPathTree(self))[:max_results]:
+                yield self.node(index)
+            return
+        last_part = locator.parts[-1]
+        has_index = any(criterion.strategy == 'index' for criterion in last_part.criteria)
+        target = TreeWalker._target_index(locator)
+        matched = 0
+        for index in self._candidates(last_part):
+            if index == 0 or not self._matches_part(index, last_part):
+                continue
+            if not self._matches_ancestors(index, locator.parts[:-1]):
+                continue
+            matched += 1
+            if has_index:
+                if matched == target:
+                    yield self.node(index)
+                    return
+                continue
+            yield self.node(index)
+            if max_results is not None and matched >= max_results:
+                return
+
+    def find(self, locator):
+        """查找第一个匹配定位器的节点
+
+        Args:
+            locator: 定位器字符串或CompiledLocator
+
+        Returns:
+            SnapshotNode: 匹配的节点，未找到时返回None
+        """
+        for node in self.find_all(locator, max_results=1):
+            return node
+        return None
+
+    def count(self, locator):
+        """统计匹配定位器的节点数量
+
+        Args:
+            locator: 定位器字符串或CompiledLocator
+
+        Returns:
+            int: 匹配的节点数量
+        """
+        return sum(1 for _ in self.find_all(locator))
+
+    def _candidates(self, part):
+        """通过索引获取步骤的候选节点
+
+        Args:
+            part: LocatorPart
+
+        Returns:
+            可迭代的候选节点序号（升序）
+        """
+        best = None
+        for criterion in part.criteria:
+            if criterion.strategy == 'index' or criterion.regex is not None:
+                continue
+            string_id = self._string_id(criterion.match_value)
+            if string_id is None:
+                return ()
+            postings = self._postings(self.ATTRIBUTE_STRATEGIES[criterion.strategy], string_id)
+            if best is None or len(postings) < len(best):
+                best = postings
+        return range(len(self)) if best is None else best
+
+    def _string_id(self, value):
+        """查找字符串在字符串表中的序号
+
+        Args:
+            value: 字符串
+
+        Returns:
+            int: 字符串序号，不在字符串表中时返回None
+        """
+        return self._string_ids.get(value)
+
+    def _postings(self, attribute, string_id):
+        """获取属性值为指定字符串的节点序号（升序）
+
+        Args:
+            attribute: 建立索引的属性名
+            string_id: 字符串序号
+
+        Returns:
+            节点序号序列
+        """
+        return self._indexes[attribute].get(string_id, ())
+
+    def _matches_part(self, index, part):
+        """检查节点是否满足步骤中的全部条件（不考虑index条件）
+
+        Args:
+            index: 节点序号
+            part: LocatorPart
+
+        Returns:
+            bool: 是否匹配
+        """
+        for criterion in part.criteria:
+            if criterion.strategy == 'index':
+                continue
+            value = self.get(index, self.ATTRIBUTE_STRATEGIES[criterion.strategy])
+            if value is None:
+                return False
+            if criterion.regex is not None:
+                if not criterion.regex.match(value):
+                    return False
+            elif value != criterion.match_value:
+                return False
+        return True
+
+    def _matches_ancestors(self, index, parts):
+        """检查链中前面的步骤能否依次匹配节点的祖先（从近到远贪心匹配，不含根节点）
+
+        Args:
+            index: 节点序号
+            parts: 链中最后一步之前的LocatorPart列表
+
+        Returns:
+            bool: 是否匹配
+        """
+        ancestor = self.parents[index]
+        for part in reversed(parts):
+            while ancestor > 0 and not self._matches_part(ancestor, part):
+                ancestor = self.parents[ancestor]
+            if ancestor <= 0:
+                return False
+            ancestor = self.parents[ancestor]
+        return True
+
+
+class SnapshotNode:
+    """快照中单个节点的只读视图，属性名与实时元素一致"""
+
+    __slots__ = ('snapshot', 'index')
+
+    def __init__(self, snapshot, index):
+        """初始化节点视图
+
+        Args:
+            snapshot: UISnapshot
+            index: 节点序号
+        """
+        self.snapshot = snapshot
+        self.index = index
+
+    @property
+    def name(self):
+        return self.snapshot.get(self.index, 'name')
+
+    @property
+    def class_name(self):
+        return self.snapshot.get(self.index, 'class_name')
+
+    @property
+    def automation_id(self):
+        return self.snapshot.get(self.index, 'automation_id')
+
+    @property
+    def control_type(self):
+        return self.snapshot.get(self.index, 'control_type')
+
+    @property
+    def rect(self):
+        return self.snapshot.rect(self.index)
+
+    @property
+    def parent(self):
+        parent = self.snapshot.parents[self.index]
+        return None if parent < 0 else SnapshotNode(self.snapshot, parent)
+
+    @property
+    def depth(self):
+        return self.snapshot.depths[self.index]
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotNode) and other.snapshot is self.snapshot and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.snapshot), self.index))
+
+    def __repr__(self):
+        return f"SnapshotNode(index={self.index}, name={self.name!r}, class_name={self.class_name!r})"
+
+
+class SnapshotXPathTree:
+    """XPath引擎使用的快照树适配器，节点为节点序号，按属性值查找时使用快照索引"""
+
+    # 由边界矩形计算的XPath属性
+    RECT_ATTRIBUTES = {
+        'left': lambda rect: rect[0],
+        'top': lambda rect: rect[1],
+        'right': lambda rect: rect[2],
+        'bottom': lambda rect: rect[3],
+        'width': lambda rect: rect[2] - rect[0],
+        'height': lambda rect: rect[3] - rect[1]
+    }
+
+    def __init__(self, snapshot):
+        """初始化适配器
+
+        Args:
+            snapshot: UISnapshot或MappedUISnapshot
+        """
+        self.snapshot = snapshot
+        self.root = 0
+
+    def children(self, index):
+        return self.snapshot.children(index)
+
+    def parent(self, index):
+        parent = self.snapshot.parents[index]
+        return None if parent < 0 else parent
+
+    def get(self, index, attribute):
+        rect_attribute = self.RECT_ATTRIBUTES.get(attribute)
+        if rect_attribute is not None:
+            return rect_attribute(self.snapshot.rect(index))
+        return self.snapshot.get(index, attribute)
+
+    def order(self, index):
+        return index
+
+    def lookup(self, attribute, value):
+        string_id = self.snapshot._string_id(value)
+        if string_id is None:
+            return []
+        postings = self.snapshot._postings(attribute, string_id)
+        if value == '':
+            # XPath把没有值的属性当作空字符串比较
+            postings = sorted([*postings, *self.snapshot._postings(attribute, self.snapshot.NO_VALUE_ID)])
+        return postings
+
+
+def capture_tree(target, root, max_depth=8, children_of=None):
+    """按深度优先先序采集元素子树，逐个节点写入目标
+
+    Args:
+        target: 提供add_node方法的对象，如UISnapshot或SnapshotWriter
+        root: 根元素，作为0号节点写入
+        max_depth: 最大采集深度（根元素的子元素深度为1）
+        children_of: 返回元素子元素列表的函数，默认调用元素的iter_children()
+
+    Returns:
+        int: 写入的节点数量
+    """
+    children_of = children_of or TreeWalker.default_children_of
+    count = 0
+    stack = [(root, -1, 0)]
+    while stack:
+        element, parent, depth = stack.pop()
+        index = target.add_node(
+            parent,
+            depth,
+            control_type=_read(element, 'control_type'),
+            name=_read(element, 'name'),
+            class_name=_read(element, 'class_name'),
+            automation_id=_read(element, 'automation_id'),
+            rect=tuple(_read_int(element, side) for side in ('left', 'top', 'right', 'bottom'))
+        )
+        count += 1
+        if depth < max_depth:
+            stack.extend((child, index, depth + 1) for child in reversed(children_of(element)))
+    return count
+
+
+def _read(element, attribute):
+    """读取实时元素属性，读取失败时返回None"""
+    try:
+        return getattr(element, attribute, None)
+    except Exception:
+        return None
+
+
+def _read_int(element, attribute):
+    """读取实时元素的整数属性，读取失败或不是数字时返回0"""
+    try:
+        return int(_read(element, attribute) or 0)
+    except (TypeError, ValueError):
+        return 0
@@ -6,6 +6,7 @@
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any
+from ..utils.locator_utils import locator_utils
 
 
 class LocatorStrategy(ABC):
@@ -89,11 +90,25 @@ class ExtensionManager:
     def register_locator_strategy(self, strategy: LocatorStrategy):
         """注册定位策略
         
+        注册后该前缀的定位器（如 ``hwnd:0x1A2B``）通过定位器校验，
+        查找时由驱动按前缀直接分派给该策略。
+        
         Args:
             strategy: 定位策略实例
         """
         if strategy.is_available():
-            self.locator_strategies[strategy.get_name()] = strategy
+            name = strategy.get_name()
+            self.locator_strategies[name] = strategy
+            locator_utils.register_custom_strategy(name)
+    
+    def unregister_locator_strategy(self, name: str):
+        """注销定位策略
+        
+        Args:
+            name: 定位策略名称
+        """
+        if self.locator_strategies.pop(name, None) is not None:
+            locator_utils.unregister_custom_strategy(name)
     
     def register_keyword_extension(self, extension: KeywordExtension):
         """注册关键字扩展
@@ -4,11 +4,12 @@
 异步控件操作关键字，使用concurrent.futures实现线程池，避免单线程阻塞
 """
 
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from robot.api.deco import keyword
-from concurrent.futures import ThreadPoolExecutor
-import time
-from comtypes import CoInitialize, CoUninitialize
 from ..services.control_service import ControlService
+from ..utils.com_apartment import ComThreadPoolExecutor
+from ..utils.config import get_config
+from ..utils.task_registry import AsyncTaskRegistry
 from ..utils.exceptions import (
     WindowNotFoundError,
     ControlNotFoundError,
@@ -20,19 +21,31 @@ from ..utils.exceptions import (
 class AsyncControlOperationsKeywords:
     """异步控件操作关键字，提供异步版本的控件操作方法"""
     
-    def __init__(self, library):
+    # 配置中没有async_max_workers时线程池的最大工作线程数
+    MAX_WORKERS = 5
+    
+    def __init__(self, library, control_service=None, apartment=None, config=None):
         """初始化异步控件操作关键字
         
         Args:
             library: 主库实例
+            control_service: 共享的ControlService实例，如果为None则创建新实例
+            apartment: ComApartment实例，工作线程进入和退出COM套间时使用，如果为None则调用comtypes
+            config: Configuration实例，读取async_max_workers、async_max_pending和async_result_ttl，
+                如果为None则使用全局配置
         """
         self.library = library
         self.logger = library.logger
         self.builtin = library.builtin
-        self.control_service = ControlService()
+        self.control_service = control_service or ControlService()
         self.control_service.set_logger(self.logger)
-        self.executor = ThreadPoolExecutor(max_workers=5)  # 创建线程池，最大5个线程
-        self.task_map = {}  # 存储任务ID和future对象的映射
+        self.apartment = apartment
+        self.config = config or get_config()
+        self.executor = self._create_executor()
+        self.tasks = AsyncTaskRegistry(
+            max_pending=int(self.config.get('async_max_pending', 100)),
+            result_ttl=self.config.get('async_result_ttl', 300)
+        )
     
     @keyword("Async Type Into Control")
     def async_type_into_control(self, control_identifier, text, timeout=None):
@@ -44,7 +57,7 @@ class AsyncControlOperationsKeywords:
             timeout: 超时时间（秒）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Type Into Control | name=LargeTextArea | ${long_text} |
@@ -55,68 +68,43 @@ class AsyncControlOperationsKeywords:
         
         def type_task():
             """实际的文本输入任务"""
-            CoInitialize()
-            try:
-                window = self.library._get_current_window()
-                control = self.control_service.find_control(window, control_identifier, timeout)
-                self.control_service.type_into_control(control, text)
-                return f"Successfully typed into control {control_identifier}"
-            finally:
-                CoUninitialize()
-        
-        # 提交任务到线程池
-        future = self.executor.submit(type_task)
-        # 将future对象存储到映射中，用于后续查询
-        task_id = id(future)
-        self.task_map[task_id] = future
-        return task_id
+            window = self.library._get_current_window()
+            control = self.control_service.find_control(window, control_identifier, timeout)
+            self.control_service.type_into_control(control, text)
+            self.control_service.clear_negative_cache(window)
+            return f"Successfully typed into control {control_identifier}"
+        
+        return self._submit(type_task, f"Type into control {control_identifier}", timeout)
     
     @keyword("Async Find All Controls")
-    def async_find_all_controls(self, control_identifier, timeout=None):
+    def async_find_all_controls(self, control_identifier, timeout=None, max_results=None):
         """异步查找所有匹配的控件
         
+        在一次子树遍历中收集匹配的控件，出现第一个匹配的控件后不再等待超时。
+        
         Args:
             control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            timeout: 等待第一个匹配控件的超时时间（秒）
+            max_results: 最多返回的控件数量，达到后停止遍历（默认：不限制）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Find All Controls | name=ListBoxItem |
         | ${controls} | Wait For Async Task | ${task_id} |
         | Log | Found ${len(controls)} controls |
+        | ${task_id} | Async Find All Controls | class:ListItem | max_results=100 |
         """
         timeout = timeout or self.library.timeout
+        max_results = int(max_results) if max_results is not None else None
         
         def find_all_task():
             """实际的查找所有控件任务"""
-            CoInitialize()
-            try:
-                window = self.library._get_current_window()
-                # 这里假设robocorp-windows支持find_all方法，返回所有匹配的控件
-                # 如果不支持，我们可以模拟实现
-                controls = []
-                # 简单实现：多次尝试查找，直到超时
-                start_time = time.time()
-                while time.time() - start_time < timeout:
-                    try:
-                        control = self.control_service.find_control(window, control_identifier, timeout=0.5)
-                        if control and control not in controls:
-                            controls.append(control)
-                        # 短暂等待，避免CPU占用过高
-                        time.sleep(0.1)
-                    except ControlNotFoundError:
-                        pass
-                return controls
-            finally:
-                CoUninitialize()
-        
-        # 提交任务到线程池
-        future = self.executor.submit(find_all_task)
-        task_id = id(future)
-        self.task_map[task_id] = future
-        return task_id
+            window = self.library._get_current_window()
+            return list(self.control_service.iter_controls(window, control_identifier, timeout, max_results))
+        
+        return self._submit(find_all_task, f"Find all controls {control_identifier}", timeout)
     
     @keyword("Wait For Async Task")
     def wait_for_async_task(self, task_id, timeout=None):
@@ -136,23 +124,59 @@ class AsyncControlOperationsKeywords:
         """
         timeout = timeout or self.library.timeout
         
-        # 查找对应的future对象
-        if task_id not in self.task_map:
-            raise ValueError(f"Task with ID {task_id} not found")
-        
-        future = self.task_map[task_id]
+        # 任务ID不存在时抛出ValueError
+        task = self.tasks.get(task_id)
         
         try:
-            # 等待任务完成并返回结果
-            result = future.result(timeout=timeout)
-            # 从映射中移除已完成的任务
-            del self.task_map[task_id]
-            return result
+            # 等待任务完成并返回结果，完成的任务（包括失败的任务）从注册表中移除
+            return self.tasks.result(task.task_id, timeout=timeout)
+        except FutureTimeoutError:
+            # 未完成的任务保留在注册表中，可以继续等待或取消
+            raise AsyncOperationException(
+                f"Async task {task.task_id} did not finish within {timeout} seconds")
         except Exception as e:
-            # 从映射中移除失败的任务
-            del self.task_map[task_id]
             raise AsyncOperationException(f"Async task failed: {str(e)}")
     
+    @keyword("Cancel Async Task")
+    def cancel_async_task(self, task_id):
+        """取消尚未开始执行的异步任务
+        
+        已开始执行的任务无法中断，会继续执行到完成，可以用Wait For Async Task取走结果。
+        
+        Args:
+            task_id: 异步任务的ID
+            
+        Returns:
+            bool: 是否已取消
+            
+        Examples:
+        | ${task_id} | Async Click Control | name=LongRunningButton |
+        | ${cancelled} | Cancel Async Task | ${task_id} |
+        """
+        cancelled = self.tasks.cancel(task_id)
+        if cancelled:
+            self.logger.info(f"Cancelled async task {task_id}")
+        else:
+            self.logger.info(f"Async task {task_id} has already started and cannot be cancelled")
+        return cancelled
+    
+    @keyword("Get Async Task Status")
+    def get_async_task_status(self, task_id):
+        """获取异步任务的状态，不等待任务完成
+        
+        Args:
+            task_id: 异步任务的ID
+            
+        Returns:
+            dict: 包含task_id、state（pending、running、done、failed或cancelled）、
+                description和elapsed（秒），失败的任务还包含error
+            
+        Examples:
+        | ${status} | Get Async Task Status | ${task_id} |
+        | Should Be Equal | ${status}[state] | done |
+        """
+        return self.tasks.status(task_id)
+    
     @keyword("Async Click Control")
     def async_click_control(self, control_identifier, timeout=None):
         """异步点击控件
@@ -162,7 +186,7 @@ class AsyncControlOperationsKeywords:
             timeout: 超时时间（秒）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Click Control | name=LongRunningButton |
@@ -172,20 +196,13 @@ class AsyncControlOperationsKeywords:
         
         def click_task():
             """实际的点击任务"""
-            CoInitialize()
-            try:
-                window = self.library._get_current_window()
-                control = self.control_service.find_control(window, control_identifier, timeout)
-                self.control_service.click_control(control)
-                return f"Successfully clicked control {control_identifier}"
-            finally:
-                CoUninitialize()
-        
-        # 提交任务到线程池
-        future = self.executor.submit(click_task)
-        task_id = id(future)
-        self.task_map[task_id] = future
-        return task_id
+            window = self.library._get_current_window()
+            control = self.control_service.find_control(window, control_identifier, timeout)
+            self.control_service.click_control(control)
+            self.control_service.clear_negative_cache(window)
+            return f"Successfully clicked control {control_identifier}"
+        
+        return self._submit(click_task, f"Click control {control_identifier}", timeout)
     
     @keyword("Shutdown Async Executor")
     def shutdown_async_executor(self, wait=True):
@@ -199,8 +216,32 @@ class AsyncControlOperationsKeywords:
         | Shutdown Async Executor | wait=False |
         """
         self.executor.shutdown(wait=wait)
-        # 清空任务映射
-        self.task_map.clear()
+        # 清空任务注册表
+        self.tasks.clear()
         # 重新创建一个新的执行器，以便后续使用
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executor = self._create_executor()
         return "Async executor shutdown completed"
+    
+    def _submit(self, fn, description, timeout):
+        """提交任务到线程池并在注册表中登记
+        
+        Args:
+            fn: 无参可调用对象
+            description: 任务描述
+            timeout: 未完成任务已达上限时等待空位的超时时间（秒）
+            
+        Returns:
+            int: 任务ID
+        """
+        task_id = self.tasks.submit(self.executor, fn, description=description, timeout=timeout)
+        self.logger.debug(f"Submitted async task {task_id}: {description}")
+        return task_id
+    
+    def _create_executor(self):
+        """创建线程池，每个工作线程启动时进入一次COM套间，关闭时在同一线程上退出
+        
+        Returns:
+            ComThreadPoolExecutor: 线程池
+        """
+        max_workers = int(self.config.get('async_max_workers', self.MAX_WORKERS))
+        return ComThreadPoolExecutor(max_workers=max_workers, apartment=self.apartment)
@@ -1,5 +1,6 @@
 from robot.api.deco import keyword
 from ..services.control_service import ControlService
+from ..utils.polling import Deadline
 from ..utils.exceptions import (
     WindowNotFoundError,
     ControlNotFoundError,
@@ -9,14 +10,24 @@ from ..utils.exceptions import (
 class ControlOperationsKeywords:
     """Keywords for control operations."""
     
-    def __init__(self, library):
-        """Initialize ControlOperationsKeywords with the main library instance."""
+    def __init__(self, library, control_service=None):
+        """Initialize ControlOperationsKeywords with the main library instance.
+        
+        Args:
+            library: Main library instance
+            control_service: Shared ControlService instance (default: create a new one)
+        """
         self.library = library
         self.logger = library.logger
         self.builtin = library.builtin
-        self.control_service = ControlService()
+        self.control_service = control_service or ControlService()
         self.control_service.set_logger(self.logger)
+        self.last_snapshot = None  # 最近一次采集的UI快照
         
+    def _action_performed(self):
+        """Forget cached negative lookups for the current window, since an action may have changed the UI."""
+        self.control_service.clear_negative_cache(self.library._get_current_window())
+    
     @keyword("Find Control")
     def find_control(self, control_identifier, timeout=None, use_cache=True):
         """Find a control in the current window.
@@ -44,6 +55,36 @@ class ControlOperationsKeywords:
         except ControlNotFoundError as e:
             raise AssertionError(str(e))
     
+    @keyword("Find Controls")
+    def find_controls(self, *control_identifiers, timeout=None, use_cache=True):
+        """Find several controls in the current window with a single UI tree walk.
+        
+        All locators share one timeout. Controls already in the cache are returned
+        without searching, the rest are resolved together and cached as they are found.
+        
+        Args:
+            *control_identifiers: Control identifiers (name, id, class name, or other criteria)
+            timeout: Timeout shared by all locators (default: library timeout)
+            use_cache: Whether to use cache (default: True)
+            
+        Returns:
+            dict: Mapping of control identifier to the found control, in the given order
+            
+        Examples:
+        | ${controls} | Find Controls | name:OK | name:Cancel | id:FileName |
+        | Click Control | ${controls}[name:OK] |
+        | ${controls} | Find Controls | name:OK | class:Edit | timeout=5 |
+        """
+        timeout = timeout or self.library.timeout
+        window = self.library._get_current_window()
+        
+        try:
+            controls = self.control_service.find_controls(window, control_identifiers, timeout, use_cache)
+            self.library._log(f"Found {len(controls)} controls: {', '.join(controls)}")
+            return controls
+        except ControlNotFoundError as e:
+            raise AssertionError(str(e))
+    
     @keyword("Find Control Without Cache")
     def find_control_without_cache(self, control_identifier, timeout=None):
         """Find a control in the current window without using cache.
@@ -76,6 +117,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Clicking control: {control_identifier}")
         self.control_service.click_control(control)
+        self._action_performed()
     
     @keyword("Double Click Control")
     def double_click_control(self, control_identifier, timeout=None):
@@ -92,6 +134,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Double clicking control: {control_identifier}")
         self.control_service.double_click_control(control)
+        self._action_performed()
     
     @keyword("Right Click Control")
     def right_click_control(self, control_identifier, timeout=None):
@@ -108,6 +151,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Right clicking control: {control_identifier}")
         self.control_service.right_click_control(control)
+        self._action_performed()
     
     @keyword("Type Into Control")
     def type_into_control(self, control_identifier, text, timeout=None):
@@ -125,6 +169,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Typing into control: {control_identifier}, text: {text}")
         self.control_service.type_into_control(control, text)
+        self._action_performed()
     
     @keyword("Get Control Text")
     def get_control_text(self, control_identifier, timeout=None):
@@ -158,10 +203,10 @@ class ControlOperationsKeywords:
         | Control Should Exist | OKButton |
         | Control Should Exist | name=SubmitButton | timeout=5 |
         """
-        timeout = timeout or self.library.timeout
+        deadline = Deadline(timeout or self.library.timeout)
         window = self.library._get_current_window()
         
-        self.control_service.control_should_exist(window, control_identifier, timeout)
+        self.control_service.control_should_exist(window, control_identifier, deadline)
         self.library._log(f"Control exists: {control_identifier}")
     
     @keyword("Control Should Not Exist")
@@ -176,12 +221,102 @@ class ControlOperationsKeywords:
         | Control Should Not Exist | ErrorDialog |
         | Control Should Not Exist | name=LoadingSpinner | timeout=5 |
         """
-        timeout = timeout or self.library.timeout
+        deadline = Deadline(timeout or self.library.timeout)
         window = self.library._get_current_window()
         
-        self.control_service.control_should_not_exist(window, control_identifier, timeout)
+        self.control_service.control_should_not_exist(window, control_identifier, deadline)
         self.library._log(f"Control does not exist: {control_identifier}")
     
+    @keyword("Wait For Any Control")
+    def wait_for_any_control(self, *conditions, timeout=None):
+        """Wait until at least one of several conditions is met and return the one that matched.
+        
+        A condition is a locator, met when the control exists, or a locator prefixed with
+        ``NOT `` (uppercase), met when the control does not exist. All conditions are evaluated
+        on every polling tick against one shared timeout, so the worst-case wait is a single
+        timeout rather than the sum of one timeout per condition.
+        
+        Args:
+            *conditions: Locators, optionally prefixed with ``NOT ``
+            timeout: Timeout shared by all conditions (default: library timeout)
+            
+        Returns:
+            str: The first condition, in the given order, that was met
+            
+        Examples:
+        | ${matched} | Wait For Any Control | name:Saved | name:Error | timeout=30 |
+        | Run Keyword If | '${matched}' == 'name:Error' | Fail | Saving failed |
+        | ${matched} | Wait For Any Control | name:Done | NOT name:Progress |
+        """
+        deadline = Deadline(timeout or self.library.timeout)
+        window = self.library._get_current_window()
+        
+        condition, _ = self.control_service.wait_for_any_control(window, conditions, deadline)
+        self.library._log(f"Condition met: {condition}")
+        return condition
+    
+    @keyword("Wait For All Controls")
+    def wait_for_all_controls(self, *conditions, timeout=None):
+        """Wait until all of several conditions are met at the same time.
+        
+        Conditions use the same format as `Wait For Any Control` and share one timeout.
+        
+        Args:
+            *conditions: Locators, optionally prefixed with ``NOT ``
+            timeout: Timeout shared by all conditions (default: library timeout)
+            
+        Returns:
+            dict: Mapping of condition to the found control, in the given order
+            (``None`` for ``NOT `` conditions)
+            
+        Examples:
+        | Wait For All Controls | name:OK | name:Cancel | NOT name:Loading |
+        | ${controls} | Wait For All Controls | id:FileName | id:FileType | timeout=5 |
+        """
+        deadline = Deadline(timeout or self.library.timeout)
+        window = self.library._get_current_window()
+        
+        controls = self.control_service.wait_for_all_controls(window, conditions, deadline)
+        self.library._log(f"All conditions met: {', '.join(controls)}")
+        return controls
+    
+    @keyword("Execute Control Actions")
+    def execute_control_actions(self, steps, timeout=None):
+        """Execute a list of control actions in the current window in one keyword call.
+        
+        All steps are validated and their locators compiled before anything runs. Controls that
+        already exist are resolved together in one UI tree walk; controls that appear later (for
+        example in a dialog opened by an earlier step) are waited for in their own step. Execution
+        stops at the first failing step.
+        
+        Supported actions: ``click``, ``double click``, ``right click``, ``type``, ``set value``,
+        ``select``, ``check``, ``uncheck``, ``get text`` and ``get value``.
+        
+        Args:
+            steps: List of ``(action, locator, *args)`` sequences, or dictionaries with
+                ``action``, ``locator`` and optional ``args``
+            timeout: Timeout for finding the control of each step (default: library timeout)
+            
+        Returns:
+            list: One dictionary per step with ``step``, ``action``, ``locator``, ``elapsed``
+            (seconds) and ``result`` (the text or value for ``get text`` and ``get value``)
+            
+        Examples:
+        | ${steps} | Evaluate | [('type', 'id:UserName', 'admin'), ('type', 'id:Password', 'secret'), ('click', 'name:Login')] |
+        | ${timings} | Execute Control Actions | ${steps} |
+        | ${timings} | Execute Control Actions | ${steps} | timeout=5 |
+        """
+        timeout = timeout or self.library.timeout
+        window = self.library._get_current_window()
+        
+        try:
+            results = self.control_service.execute_actions(window, steps, timeout)
+        except ControlNotFoundError as e:
+            raise AssertionError(str(e))
+        total = sum(result['elapsed'] for result in results)
+        self.library._log(f"Executed {len(results)} control actions in {total:.3f} seconds")
+        return results
+    
     @keyword("Set Control Value")
     def set_control_value(self, control_identifier, value, timeout=None):
         """Set the value of a control.
@@ -198,6 +333,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Setting control value: {control_identifier} = {value}")
         self.control_service.set_control_value(control, value)
+        self._action_performed()
     
     @keyword("Get Control Value")
     def get_control_value(self, control_identifier, timeout=None):
@@ -219,6 +355,103 @@ class ControlOperationsKeywords:
         self.library._log(f"Got control value: {control_identifier} = {value}")
         return value
     
+    @keyword("Fill Form")
+    def fill_form(self, fields, timeout=None):
+        """Set the values of several controls in the current window.
+        
+        All controls are resolved together in one UI tree walk before any value is set, so a
+        missing control fails the keyword without changing the form. Values are then set in the
+        order of the dictionary; failures do not stop the remaining fields and are reported
+        together at the end.
+        
+        Args:
+            fields: Dictionary of control identifier to value
+            timeout: Timeout shared by all controls (default: library timeout)
+            
+        Examples:
+        | &{form} | Create Dictionary | id:FirstName=John | id:LastName=Smith | id:City=Helsinki |
+        | Fill Form | ${form} |
+        | Fill Form | ${form} | timeout=5 |
+        """
+        timeout = timeout or self.library.timeout
+        window = self.library._get_current_window()
+        
+        try:
+            self.control_service.fill_form(window, fields, timeout)
+        except ControlNotFoundError as e:
+            raise AssertionError(str(e))
+        self.library._log(f"Filled {len(fields)} fields: {', '.join(map(str, fields))}")
+    
+    @keyword("Read Form")
+    def read_form(self, *control_identifiers, timeout=None):
+        """Get the values of several controls in the current window.
+        
+        All controls are resolved together in one UI tree walk. Controls that are not found or
+        cannot be read are reported together in one error after all other values were read.
+        
+        Args:
+            *control_identifiers: Control identifiers (name, id, class name, or other criteria)
+            timeout: Timeout shared by all controls (default: library timeout)
+            
+        Returns:
+            dict: Mapping of control identifier to value, in the given order
+            
+        Examples:
+        | ${values} | Read Form | id:FirstName | id:LastName | id:City |
+        | Should Be Equal | ${values}[id:City] | Helsinki |
+        | ${values} | Read Form | @{field_locators} | timeout=5 |
+        """
+        timeout = timeout or self.library.timeout
+        window = self.library._get_current_window()
+        
+        values = self.control_service.read_form(window, control_identifiers, timeout)
+        self.library._log(f"Read {len(values)} fields: {values}")
+        return values
+    
+    @keyword("Extract Table")
+    def extract_table(self, control_identifier, path=None, offset=0, limit=None, include_header=True, timeout=None):
+        """Extract the rows of a table, grid or list view control.
+        
+        The table control is found once and its rows are read page by page, scrolling down
+        through virtualized tables, so memory use does not grow with the number of rows.
+        With ``path`` the rows are written to a CSV file as they are read; without it one
+        bounded page of rows is returned.
+        
+        Args:
+            control_identifier: Identifier of the table control
+            path: CSV file to write (default: return the rows instead)
+            offset: Number of data rows to skip (default: 0)
+            limit: Maximum number of data rows (default: all rows when writing a file,
+                100 rows otherwise)
+            include_header: Whether to put the column titles first (default: True)
+            timeout: Timeout for waiting until the table control is available (default: library timeout)
+            
+        Returns:
+            int or list: Number of data rows written when ``path`` is given, otherwise a list
+            of rows, each a list of cell texts, with the column titles first
+            
+        Examples:
+        | ${count} | Extract Table | id:OrdersGrid | path=${OUTPUT_DIR}/orders.csv |
+        | ${rows} | Extract Table | id:OrdersGrid | limit=20 |
+        | ${rows} | Extract Table | class:SysListView32 | offset=100 | limit=100 | include_header=False |
+        """
+        timeout = timeout or self.library.timeout
+        window = self.library._get_current_window()
+        offset = int(offset)
+        if limit is not None:
+            limit = int(limit)
+        
+        try:
+            result = self.control_service.extract_table(
+                window, control_identifier, path, timeout, offset, limit, include_header)
+        except ControlNotFoundError as e:
+            raise AssertionError(str(e))
+        if path is None:
+            self.library._log(f"Extracted {len(result)} rows from table {control_identifier}")
+        else:
+            self.library._log(f"Wrote {result} rows from table {control_identifier} to {path}")
+        return result
+    
     @keyword("Select From Combobox")
     def select_from_combobox(self, control_identifier, item, timeout=None):
         """Select an item from a combobox control.
@@ -235,6 +468,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Selecting from combobox {control_identifier}: {item}")
         self.control_service.select_from_combobox(control, item)
+        self._action_performed()
     
     @keyword("Check Checkbox")
     def check_checkbox(self, control_identifier, timeout=None):
@@ -251,6 +485,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Checking checkbox: {control_identifier}")
         self.control_service.check_checkbox(control)
+        self._action_performed()
     
     @keyword("Uncheck Checkbox")
     def uncheck_checkbox(self, control_identifier, timeout=None):
@@ -267,6 +502,7 @@ class ControlOperationsKeywords:
         control = self.find_control(control_identifier, timeout)
         self.library._log(f"Unchecking checkbox: {control_identifier}")
         self.control_service.uncheck_checkbox(control)
+        self._action_performed()
     
     @keyword("Checkbox Should Be Checked")
     def checkbox_should_be_checked(self, control_identifier, timeout=None):
@@ -323,4 +559,114 @@ class ControlOperationsKeywords:
         from ..utils.locator_utils import locator_utils
         is_valid, message = locator_utils.validate_locator(locator)
         self.library._log(f"Locator validation: {message}")
-        return message
\ No newline at end of file
+        return message
+    
+    @keyword("Capture UI Snapshot")
+    def capture_ui_snapshot(self, max_depth=None):
+        """Capture the element tree of the current window into an in-memory snapshot.
+        
+        Later read-only checks can query the snapshot without any calls to the live UI.
+        The snapshot is also remembered as the library's latest snapshot.
+        
+        Args:
+            max_depth: Maximum depth of the captured tree (default: driver search depth)
+            
+        Returns:
+            UISnapshot: The captured snapshot
+            
+        Examples:
+        | ${snapshot} | Capture UI Snapshot |
+        | ${snapshot} | Capture UI Snapshot | max_depth=4 |
+        """
+        max_depth = int(max_depth) if max_depth is not None else None
+        window = self.library._get_current_window()
+        self.last_snapshot = self.control_service.capture_snapshot(window, max_depth)
+        self.library._log(f"Captured UI snapshot with {len(self.last_snapshot)} elements")
+        return self.last_snapshot
+    
+    @keyword("Get UI Changes Since Snapshot")
+    def get_ui_changes_since_snapshot(self, snapshot=None, max_depth=None):
+        """Capture the current window again and report what changed since a snapshot.
+        
+        Unchanged subtrees are skipped by comparing content hashes, so the cost
+        depends on how much changed rather than on the size of the window.
+        The new capture becomes the latest snapshot, so consecutive calls report
+        the changes of each step.
+        
+        Args:
+            snapshot: Snapshot to compare with (default: the latest captured snapshot)
+            max_depth: Maximum depth of the new capture (default: driver search depth)
+            
+        Returns:
+            dict: ``added``, ``removed`` and ``changed`` lists. Each element is a dict with
+            ``index``, ``control_type``, ``name``, ``class_name``, ``automation_id`` and ``rect``;
+            changed elements also have ``changes`` mapping attribute names to ``[old, new]``.
+            
+        Examples:
+        | Capture UI Snapshot |
+        | Click Control | name:Calculate |
+        | ${changes} | Get UI Changes Since Snapshot |
+        | Length Should Be | ${changes}[added] | 0 |
+        | Should Be Equal | ${changes}[changed][0][name] | 42 |
+        """
+        if snapshot is None:
+            snapshot = self.last_snapshot
+        if snapshot is None:
+            raise AssertionError("No UI snapshot captured. Use Capture UI Snapshot first")
+        max_depth = int(max_depth) if max_depth is not None else None
+        window = self.library._get_current_window()
+        diff = self.control_service.get_ui_changes(window, snapshot, max_depth)
+        self.last_snapshot = diff.new
+        self.library._log(f"UI changes: {len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed")
+        return diff.to_dict()
+    
+    @keyword("Save UI Snapshot")
+    def save_ui_snapshot(self, path, max_depth=None):
+        """Save the element tree of the current window to a snapshot file.
+        
+        Elements are written while the tree is walked, so large windows are not held in memory.
+        Locators can then be checked offline, without a desktop, with
+        ``python -m robotframework_robocorp_windows.snapshot query <path> <locator>``.
+        
+        Args:
+            path: Path of the snapshot file to write
+            max_depth: Maximum depth of the captured tree (default: driver search depth)
+            
+        Returns:
+            int: Number of saved elements
+            
+        Examples:
+        | Save UI Snapshot | ${OUTPUT_DIR}${/}erp_main.bin |
+        | ${count} | Save UI Snapshot | dialog.bin | max_depth=4 |
+        """
+        max_depth = int(max_depth) if max_depth is not None else None
+        window = self.library._get_current_window()
+        count = self.control_service.save_snapshot(window, path, max_depth)
+        self.library._log(f"Saved UI snapshot with {count} elements to {path}")
+        return count
+    
+    @keyword("Snapshot Should Contain Control")
+    def snapshot_should_contain_control(self, control_identifier, snapshot=None):
+        """Verify that a control exists in a UI snapshot.
+        
+        Args:
+            control_identifier: Control identifier (name, id, class, text or regex criteria)
+            snapshot: Snapshot to query (default: the latest captured snapshot)
+            
+        Returns:
+            SnapshotNode: The matching snapshot node
+            
+        Examples:
+        | Capture UI Snapshot |
+        | Snapshot Should Contain Control | name:OK |
+        | Snapshot Should Contain Control | name:Panel > class:Edit | ${snapshot} |
+        """
+        if snapshot is None:
+            snapshot = self.last_snapshot
+        if snapshot is None:
+            raise AssertionError("No UI snapshot captured. Use Capture UI Snapshot first")
+        node = snapshot.find(control_identifier)
+        if node is None:
+            raise AssertionError(f"Control not found in snapshot: {control_identifier}")
+        self.library._log(f"Control found in snapshot: {control_identifier}")
+        return node
@@ -10,21 +10,30 @@ from ..utils.exceptions import (
 class WindowManagementKeywords:
     """Keywords for window management operations."""
     
-    def __init__(self, library):
-        """Initialize WindowManagementKeywords with the main library instance."""
+    def __init__(self, library, window_service=None):
+        """Initialize WindowManagementKeywords with the main library instance.
+        
+        Args:
+            library: Main library instance
+            window_service: Shared WindowService instance (default: create a new one)
+        """
         self.library = library
         self.logger = library.logger
         self.builtin = library.builtin
-        self.window_service = WindowService()
+        self.window_service = window_service or WindowService()
         self.window_service.set_logger(self.logger)
         
     @keyword("Launch Application")
-    def launch_application(self, app_path, timeout=None):
+    def launch_application(self, app_path, timeout=None, wait_for_idle=False):
         """Launch a Windows application and connect to it.
         
+        Returns as soon as a top-level window of the launched process appears. Fails
+        immediately if the process exits with a non-zero code before that.
+        
         Args:
             app_path: Path to the application executable.
             timeout: Timeout for waiting until the application is ready (default: library timeout)
+            wait_for_idle: Also wait until the process has finished processing its startup input
             
         Returns:
             str: Application identifier that can be used with other keywords
@@ -32,12 +41,13 @@ class WindowManagementKeywords:
         Examples:
         | Launch Application | notepad.exe |
         | ${app_id} | Launch Application | C:/Program Files/MyApp/myapp.exe | timeout=5 |
+        | ${app_id} | Launch Application | C:/Program Files/MyApp/myapp.exe | wait_for_idle=True |
         """
         timeout = timeout or self.library.timeout
         self.library._log(f"Launching application: {app_path}")
         
         # Use WindowService to launch application and find main window
-        executable_name, window = self.window_service.launch_application(app_path, timeout)
+        executable_name, window = self.window_service.launch_application(app_path, timeout, wait_for_idle=wait_for_idle)
         
         if window:
             self.library.current_window = window
@@ -51,6 +61,45 @@ class WindowManagementKeywords:
         app_id = self.library.cache.register({"executable": executable_name, "window": window})
         return app_id
     
+    @keyword("Launch Applications")
+    def launch_applications(self, *app_paths, timeout=None, wait_for_idle=False):
+        """Launch several Windows applications at once and wait for all of them concurrently.
+        
+        All processes are started first, then their readiness conditions are checked in one
+        polling loop sharing one timeout, so the total wait is about that of the slowest
+        application. Each application is registered like with `Launch Application`; the
+        current window becomes the window of the last application, in argument order, whose
+        window was found. If any application fails to start or exits with an error before it
+        is ready, the processes already started are terminated and the error is raised.
+        
+        Args:
+            *app_paths: Paths to the application executables.
+            timeout: Timeout for waiting until all applications are ready (default: library timeout)
+            wait_for_idle: Also wait until each process has finished processing its startup input
+            
+        Returns:
+            list: Application identifiers in the same order as the paths
+            
+        Examples:
+        | @{app_ids} | Launch Applications | notepad.exe | calc.exe | mspaint.exe |
+        | @{app_ids} | Launch Applications | @{COMPANION_APPS} | timeout=20 |
+        """
+        timeout = timeout or self.library.timeout
+        self.library._log(f"Launching {len(app_paths)} applications: {', '.join(app_paths)}")
+        
+        # Start all processes first, then wait for all of them in one polling loop
+        launches = self.window_service.launch_applications(app_paths, timeout, wait_for_idle=wait_for_idle)
+        
+        app_ids = []
+        for executable_name, window in launches:
+            if window:
+                self.library.current_window = window
+                self.library._log(f"Found main window for {executable_name}: {self.window_service.get_window_title(window)}")
+            else:
+                self.library._log(f"Could not automatically find main window for {executable_name}", level="WARN")
+            app_ids.append(self.library.cache.register({"executable": executable_name, "window": window}))
+        return app_ids
+    
     @keyword("Connect To Application")
     def connect_to_application(self, title=None, class_name=None, process=None, timeout=None):
         """Connect to an already running application.
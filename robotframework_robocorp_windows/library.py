@@ -2,11 +2,18 @@ from robot.api.deco import keyword, library
 from robot.libraries.BuiltIn import BuiltIn
 from robot.utils import ConnectionCache, timestr_to_secs
 import logging
-import time
 
 # Import custom exceptions
 from .utils.exceptions import ApplicationNotConnectedError, NoActiveWindowError
 
+# Import driver, services and cache shared by all keyword modules
+from .drivers.robocorp_driver import RobocorpWindowsDriver
+from .services.window_service import WindowService
+from .services.control_service import ControlService
+from .services.async_control_service import AsyncControlService
+from .utils.cache import ControlCache
+from .utils.polling import Poller
+
 # Import keyword modules
 from .keywords.window_management import WindowManagementKeywords
 from .keywords.control_operations import ControlOperationsKeywords
@@ -18,6 +25,7 @@ class RobocorpWindows:
     ROBOT_LIBRARY_VERSION = '1.0.0'
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LIBRARY_DOC_FORMAT = 'reST'
+    ROBOT_LISTENER_API_VERSION = 3
     """Robocorp Windows Library is a Robot Framework library for Windows automation using robocorp-windows.
     
     This library provides keywords to interact with Windows applications, including window management,
@@ -25,18 +33,22 @@ class RobocorpWindows:
     
     Examples:
     | Library | RobocorpWindows | timeout=10 | retry_interval=0.5 |
+    | Library | RobocorpWindows | negative_cache_ttl=2s |
     | Launch Application | notepad.exe |
     | Type Into Control | Edit | Hello World |
     | Close Application |
     """
     
-    def __init__(self, timeout=10, retry_interval=0.5, log_level='INFO'):
+    def __init__(self, timeout=10, retry_interval=0.5, log_level='INFO', negative_cache_ttl=None):
         """Initialize RobocorpWindows library with specified configuration.
         
         Args:
             timeout: Default timeout for waiting operations in seconds (default: 10)
             retry_interval: Interval between retries in seconds (default: 0.5)
             log_level: Log level ('TRACE', 'DEBUG', 'INFO', 'WARN', 'ERROR') (default: INFO)
+            negative_cache_ttl: How long a failed control lookup is remembered, so repeated
+                checks for a known-absent control fail immediately. Cleared whenever an action
+                keyword runs against the same window. Disabled by default.
         """
         self.timeout = timestr_to_secs(timeout)
         self.retry_interval = timestr_to_secs(retry_interval)
@@ -52,22 +64,51 @@ class RobocorpWindows:
         self.builtin = BuiltIn()
         self.builtin.log(f"RobocorpWindows Library initialized with log level: {self.log_level}", level='DEBUG')
         
+        # One driver, one control cache and one service layer shared by every keyword module,
+        # so a control found by any keyword (sync or async) is a cache hit for all the others
+        self.poller = Poller(max_interval=self.retry_interval)
+        self.driver = RobocorpWindowsDriver(poller=self.poller)
+        self.negative_cache_ttl = timestr_to_secs(negative_cache_ttl) if negative_cache_ttl else None
+        self.control_cache = ControlCache(negative_expire_time=self.negative_cache_ttl)
+        self.window_service = WindowService(self.driver, self.poller)
+        self.window_service.set_logger(self.logger)
+        self.control_service = ControlService(self.driver, self.control_cache, self.poller)
+        self.control_service.set_logger(self.logger)
+        # asyncio API for Python callers (custom libraries, listeners), with its own COM worker pool
+        self.async_control_service = AsyncControlService(self.control_service)
+        
         # Initialize keyword modules
-        self.window_management = WindowManagementKeywords(self)
-        self.control_operations = ControlOperationsKeywords(self)
+        self.window_management = WindowManagementKeywords(self, self.window_service)
+        self.control_operations = ControlOperationsKeywords(self, self.control_service)
         self.keyboard_mouse = KeyboardMouseKeywords(self)
-        self.async_control_operations = AsyncControlOperationsKeywords(self)
+        self.async_control_operations = AsyncControlOperationsKeywords(self, self.control_service)
+        
+        # Library listener, so the async worker threads leave their COM apartments when execution ends
+        self.ROBOT_LIBRARY_LISTENER = self
+    
+    def close(self):
+        """Library listener hook called when the library goes out of scope.
+        
+        Shuts down the async executors so every worker thread leaves its COM apartment
+        on the thread that entered it.
+        """
+        self.async_control_operations.executor.shutdown(wait=True)
+        self.async_control_service.shutdown(wait=True)
     
     # 直接重新暴露关键字方法，确保Robot Framework能检测到它们
     
     # 窗口管理关键字
     @keyword
-    def launch_application(self, app_path, timeout=None):
+    def launch_application(self, app_path, timeout=None, wait_for_idle=False):
         """Launch a Windows application and connect to it.
         
+        Returns as soon as a top-level window of the launched process appears. Fails
+        immediately if the process exits with a non-zero code before that.
+        
         Args:
             app_path: Path to the application executable.
             timeout: Timeout for waiting until the application is ready (default: library timeout)
+            wait_for_idle: Also wait until the process has finished processing its startup input
             
         Returns:
             str: Application identifier that can be used with other keywords
@@ -75,8 +116,34 @@ class RobocorpWindows:
         Examples:
         | Launch Application | notepad.exe |
         | ${app_id} | Launch Application | C:/Program Files/MyApp/myapp.exe | timeout=5 |
+        | ${app_id} | Launch Application | C:/Program Files/MyApp/myapp.exe | wait_for_idle=True |
+        """
+        return self.window_management.launch_application(app_path, timeout, wait_for_idle)
+    
+    @keyword
+    def launch_applications(self, *app_paths, timeout=None, wait_for_idle=False):
+        """Launch several Windows applications at once and wait for all of them concurrently.
+        
+        All processes are started first, then their readiness conditions are checked in one
+        polling loop sharing one timeout, so the total wait is about that of the slowest
+        application. Each application is registered like with `Launch Application`; the
+        current window becomes the window of the last application, in argument order, whose
+        window was found. If any application fails to start or exits with an error before it
+        is ready, the processes already started are terminated and the error is raised.
+        
+        Args:
+            *app_paths: Paths to the application executables.
+            timeout: Timeout for waiting until all applications are ready (default: library timeout)
+            wait_for_idle: Also wait until each process has finished processing its startup input
+            
+        Returns:
+            list: Application identifiers in the same order as the paths
+            
+        Examples:
+        | @{app_ids} | Launch Applications | notepad.exe | calc.exe | mspaint.exe |
+        | @{app_ids} | Launch Applications | @{COMPANION_APPS} | timeout=20 |
         """
-        return self.window_management.launch_application(app_path, timeout)
+        return self.window_management.launch_applications(*app_paths, timeout=timeout, wait_for_idle=wait_for_idle)
     
     @keyword
     def connect_to_application(self, title=None, class_name=None, process=None, timeout=None):
@@ -209,6 +276,94 @@ class RobocorpWindows:
         """
         return self.control_operations.find_control(control_identifier, timeout)
     
+    @keyword
+    def find_controls(self, *control_identifiers, timeout=None, use_cache=True):
+        """Find several controls in the current window with a single UI tree walk.
+        
+        Args:
+            *control_identifiers: Control identifiers (name, id, class name, or other criteria)
+            timeout: Timeout shared by all locators (default: library timeout)
+            use_cache: Whether to use cache (default: True)
+            
+        Returns:
+            dict: Mapping of control identifier to the found control, in the given order
+            
+        Examples:
+        | ${controls} | Find Controls | name:OK | name:Cancel | id:FileName |
+        | ${controls} | Find Controls | name:OK | class:Edit | timeout=5 |
+        """
+        return self.control_operations.find_controls(*control_identifiers, timeout=timeout, use_cache=use_cache)
+    
+    @keyword
+    def capture_ui_snapshot(self, max_depth=None):
+        """Capture the element tree of the current window into an in-memory snapshot.
+        
+        Args:
+            max_depth: Maximum depth of the captured tree (default: driver search depth)
+            
+        Returns:
+            UISnapshot: The captured snapshot
+            
+        Examples:
+        | ${snapshot} | Capture UI Snapshot |
+        | ${snapshot} | Capture UI Snapshot | max_depth=4 |
+        """
+        return self.control_operations.capture_ui_snapshot(max_depth)
+    
+    @keyword
+    def get_ui_changes_since_snapshot(self, snapshot=None, max_depth=None):
+        """Capture the current window again and report what changed since a snapshot.
+        
+        Args:
+            snapshot: Snapshot to compare with (default: the latest captured snapshot)
+            max_depth: Maximum depth of the new capture (default: driver search depth)
+            
+        Returns:
+            dict: ``added``, ``removed`` and ``changed`` lists of element descriptions
+            
+        Examples:
+        | Capture UI Snapshot |
+        | Click Control | name:Calculate |
+        | ${changes} | Get UI Changes Since Snapshot |
+        """
+        return self.control_operations.get_ui_changes_since_snapshot(snapshot, max_depth)
+    
+    @keyword
+    def save_ui_snapshot(self, path, max_depth=None):
+        """Save the element tree of the current window to a snapshot file.
+        
+        The file can be queried offline with
+        ``python -m robotframework_robocorp_windows.snapshot query <path> <locator>``.
+        
+        Args:
+            path: Path of the snapshot file to write
+            max_depth: Maximum depth of the captured tree (default: driver search depth)
+            
+        Returns:
+            int: Number of saved elements
+            
+        Examples:
+        | Save UI Snapshot | ${OUTPUT_DIR}${/}erp_main.bin |
+        """
+        return self.control_operations.save_ui_snapshot(path, max_depth)
+    
+    @keyword
+    def snapshot_should_contain_control(self, control_identifier, snapshot=None):
+        """Verify that a control exists in a UI snapshot.
+        
+        Args:
+            control_identifier: Control identifier (name, id, class, text or regex criteria)
+            snapshot: Snapshot to query (default: the latest captured snapshot)
+            
+        Returns:
+            SnapshotNode: The matching snapshot node
+            
+        Examples:
+        | Capture UI Snapshot |
+        | Snapshot Should Contain Control | name:OK |
+        """
+        return self.control_operations.snapshot_should_contain_control(control_identifier, snapshot)
+    
     @keyword
     def click_control(self, control_identifier, timeout=None):
         """Click on a control.
@@ -311,6 +466,71 @@ class RobocorpWindows:
         """
         return self.control_operations.control_should_not_exist(control_identifier, timeout)
     
+    @keyword
+    def wait_for_any_control(self, *conditions, timeout=None):
+        """Wait until at least one of several conditions is met and return the one that matched.
+        
+        A condition is a locator, met when the control exists, or a locator prefixed with
+        ``NOT `` (uppercase), met when the control does not exist. All conditions are evaluated
+        on every polling tick against one shared timeout.
+        
+        Args:
+            *conditions: Locators, optionally prefixed with ``NOT ``
+            timeout: Timeout shared by all conditions (default: library timeout)
+            
+        Returns:
+            str: The first condition, in the given order, that was met
+            
+        Examples:
+        | ${matched} | Wait For Any Control | name:Saved | name:Error | timeout=30 |
+        | ${matched} | Wait For Any Control | name:Done | NOT name:Progress |
+        """
+        return self.control_operations.wait_for_any_control(*conditions, timeout=timeout)
+    
+    @keyword
+    def wait_for_all_controls(self, *conditions, timeout=None):
+        """Wait until all of several conditions are met at the same time.
+        
+        Conditions use the same format as `Wait For Any Control` and share one timeout.
+        
+        Args:
+            *conditions: Locators, optionally prefixed with ``NOT ``
+            timeout: Timeout shared by all conditions (default: library timeout)
+            
+        Returns:
+            dict: Mapping of condition to the found control (``None`` for ``NOT `` conditions)
+            
+        Examples:
+        | Wait For All Controls | name:OK | name:Cancel | NOT name:Loading |
+        """
+        return self.control_operations.wait_for_all_controls(*conditions, timeout=timeout)
+    
+    @keyword
+    def execute_control_actions(self, steps, timeout=None):
+        """Execute a list of control actions in the current window in one keyword call.
+        
+        All steps are validated and their locators compiled before anything runs, and controls
+        that already exist are resolved together in one UI tree walk. Execution stops at the
+        first failing step.
+        
+        Supported actions: ``click``, ``double click``, ``right click``, ``type``, ``set value``,
+        ``select``, ``check``, ``uncheck``, ``get text`` and ``get value``.
+        
+        Args:
+            steps: List of ``(action, locator, *args)`` sequences, or dictionaries with
+                ``action``, ``locator`` and optional ``args``
+            timeout: Timeout for finding the control of each step (default: library timeout)
+            
+        Returns:
+            list: One dictionary per step with ``step``, ``action``, ``locator``, ``elapsed``
+            (seconds) and ``result``
+            
+        Examples:
+        | ${steps} | Evaluate | [('type', 'id:UserName', 'admin'), ('click', 'name:Login')] |
+        | ${timings} | Execute Control Actions | ${steps} |
+        """
+        return self.control_operations.execute_control_actions(steps, timeout)
+    
     @keyword
     def set_control_value(self, control_identifier, value, timeout=None):
         """Set the value of a control.
@@ -343,6 +563,70 @@ class RobocorpWindows:
         """
         return self.control_operations.get_control_value(control_identifier, timeout)
     
+    @keyword
+    def fill_form(self, fields, timeout=None):
+        """Set the values of several controls in the current window.
+        
+        All controls are resolved together in one UI tree walk before any value is set, so a
+        missing control fails the keyword without changing the form. Values are set in the
+        order of the dictionary and failures are reported together at the end.
+        
+        Args:
+            fields: Dictionary of control identifier to value
+            timeout: Timeout shared by all controls (default: library timeout)
+            
+        Examples:
+        | &{form} | Create Dictionary | id:FirstName=John | id:LastName=Smith |
+        | Fill Form | ${form} |
+        """
+        return self.control_operations.fill_form(fields, timeout)
+    
+    @keyword
+    def read_form(self, *control_identifiers, timeout=None):
+        """Get the values of several controls in the current window.
+        
+        All controls are resolved together in one UI tree walk. Controls that are not found or
+        cannot be read are reported together in one error.
+        
+        Args:
+            *control_identifiers: Control identifiers (name, id, class name, or other criteria)
+            timeout: Timeout shared by all controls (default: library timeout)
+            
+        Returns:
+            dict: Mapping of control identifier to value, in the given order
+            
+        Examples:
+        | ${values} | Read Form | id:FirstName | id:LastName |
+        """
+        return self.control_operations.read_form(*control_identifiers, timeout=timeout)
+    
+    @keyword
+    def extract_table(self, control_identifier, path=None, offset=0, limit=None, include_header=True, timeout=None):
+        """Extract the rows of a table, grid or list view control.
+        
+        The table control is found once and its rows are read page by page, scrolling down
+        through virtualized tables. With ``path`` the rows are written to a CSV file as they
+        are read; without it one bounded page of rows is returned.
+        
+        Args:
+            control_identifier: Identifier of the table control
+            path: CSV file to write (default: return the rows instead)
+            offset: Number of data rows to skip (default: 0)
+            limit: Maximum number of data rows (default: all rows when writing a file,
+                100 rows otherwise)
+            include_header: Whether to put the column titles first (default: True)
+            timeout: Timeout for waiting until the table control is available (default: library timeout)
+            
+        Returns:
+            int or list: Number of data rows written when ``path`` is given, otherwise a list
+            of rows with the column titles first
+            
+        Examples:
+        | ${count} | Extract Table | id:OrdersGrid | path=${OUTPUT_DIR}/orders.csv |
+        | ${rows} | Extract Table | id:OrdersGrid | limit=20 |
+        """
+        return self.control_operations.extract_table(control_identifier, path, offset, limit, include_header, timeout)
+    
     @keyword
     def select_from_combobox(self, control_identifier, item, timeout=None):
         """Select an item from a combobox control.
@@ -455,21 +739,15 @@ class RobocorpWindows:
         Args:
             condition: Callable that returns a truthy value when the condition is met
             timeout: Maximum time to wait in seconds
-            retry_interval: Interval between retries in seconds
+            retry_interval: Maximum interval between retries in seconds; retries start
+                much sooner and back off up to this value
             
         Returns:
             The result of the condition function if it was met, None otherwise
         """
         timeout = timeout or self.timeout
-        retry_interval = retry_interval or self.retry_interval
-        end_time = time.time() + timeout
-        
-        while time.time() < end_time:
-            result = condition()
-            if result:
-                return result
-            time.sleep(retry_interval)
-        return None
+        poller = Poller(max_interval=retry_interval) if retry_interval else self.poller
+        return poller.poll(condition, timeout)
     
     # 异步控件操作关键字
     @keyword("Async Type Into Control")
@@ -482,7 +760,7 @@ class RobocorpWindows:
             timeout: 超时时间（秒）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Type Into Control | name=LargeTextArea | ${long_text} |
@@ -492,22 +770,24 @@ class RobocorpWindows:
         return self.async_control_operations.async_type_into_control(control_identifier, text, timeout)
     
     @keyword("Async Find All Controls")
-    def async_find_all_controls(self, control_identifier, timeout=None):
+    def async_find_all_controls(self, control_identifier, timeout=None, max_results=None):
         """异步查找所有匹配的控件
         
         Args:
             control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            timeout: 等待第一个匹配控件的超时时间（秒）
+            max_results: 最多返回的控件数量（默认：不限制）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Find All Controls | name=ListBoxItem |
         | ${controls} | Wait For Async Task | ${task_id} |
         | Log | Found ${len(controls)} controls |
+        | ${task_id} | Async Find All Controls | class:ListItem | max_results=100 |
         """
-        return self.async_control_operations.async_find_all_controls(control_identifier, timeout)
+        return self.async_control_operations.async_find_all_controls(control_identifier, timeout, max_results)
     
     @keyword("Wait For Async Task")
     def wait_for_async_task(self, task_id, timeout=None):
@@ -527,6 +807,41 @@ class RobocorpWindows:
         """
         return self.async_control_operations.wait_for_async_task(task_id, timeout)
     
+    @keyword("Cancel Async Task")
+    def cancel_async_task(self, task_id):
+        """取消尚未开始执行的异步任务
+        
+        已开始执行的任务无法中断，会继续执行到完成，可以用Wait For Async Task取走结果。
+        
+        Args:
+            task_id: 异步任务的ID
+            
+        Returns:
+            bool: 是否已取消
+            
+        Examples:
+        | ${task_id} | Async Click Control | name=LongRunningButton |
+        | ${cancelled} | Cancel Async Task | ${task_id} |
+        """
+        return self.async_control_operations.cancel_async_task(task_id)
+    
+    @keyword("Get Async Task Status")
+    def get_async_task_status(self, task_id):
+        """获取异步任务的状态，不等待任务完成
+        
+        Args:
+            task_id: 异步任务的ID
+            
+        Returns:
+            dict: 包含task_id、state（pending、running、done、failed或cancelled）、
+                description和elapsed（秒），失败的任务还包含error
+            
+        Examples:
+        | ${status} | Get Async Task Status | ${task_id} |
+        | Should Be Equal | ${status}[state] | done |
+        """
+        return self.async_control_operations.get_async_task_status(task_id)
+    
     @keyword("Async Click Control")
     def async_click_control(self, control_identifier, timeout=None):
         """异步点击控件
@@ -536,7 +851,7 @@ class RobocorpWindows:
             timeout: 超时时间（秒）
             
         Returns:
-            str: 任务ID，可用于后续查询结果
+            int: 任务ID，可用于后续查询结果
             
         Examples:
         | ${task_id} | Async Click Control | name=LongRunningButton |
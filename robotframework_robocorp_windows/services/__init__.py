@@ -6,8 +6,14 @@
 
 from .window_service import WindowService
 from .control_service import ControlService
+from .async_control_service import AsyncControlService
+from .locator_planner import LocatorPlanner
+from .window_registry import WindowRegistry
 
 __all__ = [
     'WindowService',
-    'ControlService'
+    'ControlService',
+    'AsyncControlService',
+    'LocatorPlanner',
+    'WindowRegistry'
 ]
\ No newline at end of file
@@ -0,0 +1,192 @@
+# robotframework_robocorp_windows/services/async_control_service.py
+
+"""
+asyncio控件操作服务，供Python代码（自定义库、监听器）通过await调用，可以与asyncio.gather组合
+"""
+
+import asyncio
+from .control_service import ControlService
+from ..utils.com_apartment import ComThreadPoolExecutor
+from ..utils.exceptions import ControlNotFoundError
+from ..utils.locator_utils import locator_utils
+from ..utils.polling import Deadline
+
+
+class AsyncControlService:
+    """asyncio控件操作服务
+
+    桥接策略：
+    - 阻塞的UIA调用在专用的COM线程池上执行，每次只提交一次不等待的探测或一次操作
+    - 等待控件出现或消失时，轮询间隔在事件循环上用asyncio.sleep等待，不占用工作线程，
+      几十个并发等待只需要少量工作线程
+    - 与同步的ControlService共用控件缓存和否定缓存，同步关键字找到的控件对异步调用同样命中
+    """
+
+    # 没有传入线程池时创建的线程池的工作线程数
+    MAX_WORKERS = 4
+
+    def __init__(self, control_service=None, executor=None, poller=None, apartment=None, max_workers=None):
+        """初始化异步控件服务
+
+        Args:
+            control_service: 共享的ControlService实例，如果为None则创建新实例
+            executor: 执行UIA调用的线程池，如果为None则创建专用的ComThreadPoolExecutor
+            poller: Poller实例，提供轮询间隔，如果为None则使用control_service的轮询器
+            apartment: ComApartment实例，仅在创建线程池时使用
+            max_workers: 创建线程池时的工作线程数，如果为None则使用MAX_WORKERS
+        """
+        self.control_service = control_service or ControlService()
+        self.poller = poller or self.control_service.poller
+        self._owns_executor = executor is None
+        self.executor = executor or ComThreadPoolExecutor(
+            max_workers=max_workers or self.MAX_WORKERS, apartment=apartment,
+            thread_name_prefix='rfw-asyncio')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def find_control(self, window, control_identifier, timeout=10):
+        """查找控件，等待期间不占用工作线程
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            timeout: 超时时间（秒）或Deadline实例
+
+        Returns:
+            ControlElement: 找到的控件元素
+
+        Raises:
+            ValueError: 定位器格式无效时
+            ControlNotFoundError: 控件未找到时
+        """
+        locator = locator_utils.compile_valid(control_identifier)
+        cache = self.control_service.control_cache
+        if self.control_service.cache_enabled and cache.is_known_absent(window, locator):
+            raise ControlNotFoundError(f"Control not found with identifier: {locator} (cached negative result)")
+
+        deadline = Deadline.coerce(timeout)
+        control = await self.poller.poll_async(
+            lambda: self._run(self.control_service.probe_control, window, locator, deadline.timeout),
+            deadline)
+        if control is None:
+            if self.control_service.cache_enabled:
+                cache.set_negative(window, locator)
+            raise ControlNotFoundError(f"Control not found with identifier: {locator}")
+        return control
+
+    async def click(self, window, control_identifier, timeout=10):
+        """查找并点击控件
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+            timeout: 查找控件的超时时间（秒）或Deadline实例
+
+        Returns:
+            ControlElement: 被点击的控件元素
+
+        Raises:
+            ControlNotFoundError: 控件未找到时
+            ControlOperationException: 点击失败时
+        """
+        control = await self.find_control(window, control_identifier, timeout)
+        await self._run(self._act, window, self.control_service.click_control, control)
+        return control
+
+    async def type(self, window, control_identifier, text, timeout=10):
+        """查找控件并输入文本
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+            text: 要输入的文本
+            timeout: 查找控件的超时时间（秒）或Deadline实例
+
+        Returns:
+            ControlElement: 输入文本的控件元素
+
+        Raises:
+            ControlNotFoundError: 控件未找到时
+            ControlOperationException: 输入失败时
+        """
+        control = await self.find_control(window, control_identifier, timeout)
+        await self._run(self._act, window, self.control_service.type_into_control, control, text)
+        return control
+
+    async def wait_for(self, window, control_identifier, timeout=10, state='exists'):
+        """等待控件出现或消失
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+            timeout: 超时时间（秒）或Deadline实例
+            state: 'exists'等待控件出现，'absent'等待控件消失
+
+        Returns:
+            ControlElement: state为exists时返回找到的控件，state为absent时返回True
+
+        Raises:
+            ValueError: state无效时
+            AssertionError: 超时时控件仍未达到期望状态
+        """
+        if state == 'exists':
+            try:
+                return await self.find_control(window, control_identifier, timeout)
+            except ControlNotFoundError:
+                raise AssertionError(f"Control not found: {control_identifier}")
+        if state != 'absent':
+            raise ValueError(f"Invalid state '{state}', expected 'exists' or 'absent'")
+
+        locator = locator_utils.compile_valid(control_identifier)
+
+        async def control_absent():
+            # 每次探测都绕过缓存，否则缓存命中会让已消失的控件一直被视为存在
+            return await self._run(self._find_uncached, window, locator) is None
+
+        if await self.poller.poll_async(control_absent, timeout):
+            self.control_service.control_cache.remove(window, locator)
+            return True
+        raise AssertionError(f"Control should not exist but was found: {control_identifier}")
+
+    async def close(self):
+        """关闭自己创建的线程池，在事件循环之外等待工作线程退出COM套间"""
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+    def shutdown(self, wait=True):
+        """同步关闭自己创建的线程池，供监听器等非异步代码调用
+
+        Args:
+            wait: 是否等待工作线程退出
+        """
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    def _find_uncached(self, window, locator):
+        """不使用缓存探测一次控件，未找到时返回None"""
+        try:
+            return self.control_service.find_control(window, locator, 0, use_cache=False)
+        except ControlNotFoundError:
+            return None
+
+    def _act(self, window, action, control, *args):
+        """在工作线程上执行控件操作，操作可能改变界面，之后清空该窗口的否定缓存"""
+        action(control, *args)
+        self.control_service.clear_negative_cache(window)
+
+    async def _run(self, fn, *args):
+        """在COM线程池上执行阻塞调用
+
+        Args:
+            fn: 可调用对象
+            *args: 位置参数
+
+        Returns:
+            Any: 调用结果
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
@@ -5,27 +5,57 @@
 """
 
 from ..drivers.robocorp_driver import RobocorpWindowsDriver
+from ..drivers.snapshot_diff import diff_snapshots
+from .locator_planner import LocatorPlanner
 from ..utils.exceptions import (
     ControlNotFoundError,
     ControlOperationException
 )
 from ..utils.cache import ControlCache
+from ..utils.polling import Poller, Deadline
+from ..utils.locator_utils import locator_utils
 from robocorp.windows import ElementNotFound
 
 
 class ControlService:
     """控件操作服务，提供控件相关的业务逻辑"""
     
-    def __init__(self, driver=None):
+    # 等待条件中表示等待控件消失的前缀
+    ABSENT_PREFIX = 'NOT '
+    
+    # 返回数据而不写文件、且没有指定limit时提取表格的最大行数
+    DEFAULT_TABLE_PAGE_SIZE = 100
+    
+    # 批量执行支持的操作：操作名 -> (控件操作方法, 参数个数, 是否可能改变界面)
+    BATCH_ACTIONS = {
+        'click': ('click_control', 0, True),
+        'double_click': ('double_click_control', 0, True),
+        'right_click': ('right_click_control', 0, True),
+        'type': ('type_into_control', 1, True),
+        'set_value': ('set_control_value', 1, True),
+        'select': ('select_from_combobox', 1, True),
+        'check': ('check_checkbox', 0, True),
+        'uncheck': ('uncheck_checkbox', 0, True),
+        'get_text': ('get_control_text', 0, False),
+        'get_value': ('get_control_value', 0, False),
+    }
+    
+    def __init__(self, driver=None, control_cache=None, poller=None, planner=None):
         """初始化控件服务
         
         Args:
             driver: RobocorpWindowsDriver实例，如果为None则创建新实例
+            control_cache: ControlCache实例，如果为None则创建新实例
+            poller: Poller实例，如果为None则使用默认退避参数创建
+            planner: LocatorPlanner实例，用于备选定位器，如果为None则创建新实例
         """
         self.driver = driver or RobocorpWindowsDriver()
+        self.poller = poller or Poller()
+        self.planner = planner or LocatorPlanner(self.driver, poller=self.poller)
         self.logger = None
-        self.control_cache = ControlCache()
+        self.control_cache = control_cache if control_cache is not None else ControlCache()
         self.cache_enabled = True  # 默认启用缓存
+        self.validate_cache_hits = True  # 默认在缓存命中时校验控件是否仍然有效
     
     def set_logger(self, logger):
         """设置日志记录器
@@ -35,14 +65,15 @@ class ControlService:
         """
         self.logger = logger
         self.driver.set_logger(logger)
+        self.planner.set_logger(logger)
     
     def find_control(self, window, control_identifier, timeout=10, use_cache=True):
         """在窗口中查找控件
 
         Args:
             window: 窗口元素
-            control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            timeout: 超时时间（秒）或Deadline实例
             use_cache: 是否使用缓存（默认：True）
             
         Returns:
@@ -58,33 +89,378 @@ class ControlService:
         if self.logger:
             self.logger.debug(f"Finding control with identifier: '{control_identifier}', timeout: {timeout}, use_cache: {use_cache}")
         
-        # 验证定位器格式
-        from ..utils.locator_utils import locator_utils
-        locator_utils.validate_locator_format(control_identifier)
+        # 解析并验证定位器，之后缓存和驱动层都使用解析后的定位器
+        control_identifier = locator_utils.compile_valid(control_identifier)
         
         if use_cache and self.cache_enabled:
-            # 尝试从缓存获取
-            control, is_cached = self.control_cache.get(window, control_identifier)
+            control, is_cached = self._get_cached_control(window, control_identifier)
             if is_cached:
                 if self.logger:
                     self.logger.debug(f"Control '{control_identifier}' found in cache")
                 return control
+            # 最近确认不存在的控件直接失败，不再等待整个超时时间
+            if self.control_cache.is_known_absent(window, control_identifier):
+                if self.logger:
+                    self.logger.debug(f"Control '{control_identifier}' found in negative cache")
+                raise ControlNotFoundError(f"Control not found with identifier: {control_identifier} (cached negative result)")
         
-        # 从驱动层查找控件
-        control = self.driver.find_control(window, control_identifier, timeout)
+        # 从驱动层查找控件，截止时间原样传递给驱动层；备选定位器由规划器决定尝试顺序
+        try:
+            if control_identifier.alternatives:
+                control = self.planner.find_control(window, control_identifier, timeout)
+            else:
+                control = self.driver.find_control(window, control_identifier, timeout)
+        except ControlNotFoundError:
+            if use_cache and self.cache_enabled:
+                self.control_cache.set_negative(window, control_identifier)
+            raise
         
         elapsed_time = time.time() - start_time
         if self.logger:
             self.logger.debug(f"Control '{control_identifier}' found in {elapsed_time:.3f} seconds")
         
         if use_cache and self.cache_enabled:
-            # 将控件存入缓存
-            self.control_cache.set(window, control_identifier, control, timeout)
-            if self.logger:
-                self.logger.debug(f"Control '{control_identifier}' cached")
+            self._cache_control(window, control_identifier, control, timeout)
         
         return control
     
+    def probe_control(self, window, control_identifier, expire_time=None):
+        """探测一次控件，不等待，供调用方自行轮询
+
+        与find_control共用缓存：命中缓存时直接返回，找到的控件存入缓存；
+        未找到时不记录否定缓存，否则在否定缓存有效期内后续探测都会直接失败。
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+            expire_time: 找到的控件在缓存中的过期时间（秒），如果为None则使用缓存默认值
+
+        Returns:
+            ControlElement: 找到的控件元素，未找到时返回None
+
+        Raises:
+            ValueError: 定位器格式无效时
+        """
+        control_identifier = locator_utils.compile_valid(control_identifier)
+        use_cache = self.cache_enabled
+        
+        if use_cache:
+            control, is_cached = self._get_cached_control(window, control_identifier)
+            if is_cached:
+                return control
+        
+        try:
+            if control_identifier.alternatives:
+                control = self.planner.find_control(window, control_identifier, 0)
+            else:
+                control = self.driver.find_control(window, control_identifier, 0)
+        except ControlNotFoundError:
+            return None
+        
+        if use_cache:
+            self._cache_control(window, control_identifier, control, expire_time)
+        return control
+    
+    def find_controls(self, window, control_identifiers, timeout=10, use_cache=True):
+        """在一次窗口子树遍历中查找多个控件
+        
+        已缓存的控件直接返回，其余定位器交给驱动层在同一次遍历中解析，
+        每找到一个控件立即写入缓存。备选定位器由规划器逐个解析，与其他定位器共用截止时间。
+        
+        Args:
+            window: 窗口元素
+            control_identifiers: 控件标识符列表
+            timeout: 超时时间（秒）或Deadline实例，所有定位器共用
+            use_cache: 是否使用缓存（默认：True）
+            
+        Returns:
+            dict: 定位器字符串 -> 控件元素，顺序与传入的定位器一致
+            
+        Raises:
+            ValueError: 定位器格式无效时
+            ControlNotFoundError: 有控件未找到时，消息中列出所有未找到的定位器
+        """
+        locators = [locator_utils.compile_valid(identifier) for identifier in control_identifiers]
+        if self.logger:
+            self.logger.debug(f"Finding {len(locators)} controls in one tree walk, timeout: {timeout}")
+        
+        controls = self._collect_controls(window, locators, Deadline.coerce(timeout), use_cache)
+        
+        missing = [locator.raw for locator in locators if locator.raw not in controls]
+        if missing:
+            raise ControlNotFoundError(f"Controls not found with identifiers: {', '.join(dict.fromkeys(missing))}")
+        
+        return {locator.raw: controls[locator.raw] for locator in locators}
+    
+    def _collect_controls(self, window, locators, deadline, use_cache=True):
+        """查找多个控件，返回找到的控件，未找到的定位器不报错
+        
+        Args:
+            window: 窗口元素
+            locators: CompiledLocator列表，重复的定位器只查找一次
+            deadline: 所有定位器共用的Deadline，Deadline(0)时每个定位器只探测一次
+            use_cache: 是否使用缓存
+            
+        Returns:
+            dict: 定位器字符串 -> 控件元素，只包含找到的控件
+        """
+        use_cache = use_cache and self.cache_enabled
+        controls = {}
+        pending = []
+        for locator in locators:
+            if locator.raw in controls or locator in pending:
+                continue
+            if use_cache:
+                control, is_cached = self._get_cached_control(window, locator)
+                if is_cached:
+                    controls[locator.raw] = control
+                    continue
+            pending.append(locator)
+        
+        def _on_found(locator, control):
+            if use_cache:
+                self._cache_control(window, locator, control, deadline)
+        
+        walked = [locator for locator in pending if not locator.alternatives]
+        if walked:
+            controls.update(self.driver.find_controls(window, walked, deadline, on_found=_on_found))
+        for locator in pending:
+            if locator.alternatives:
+                try:
+                    control = self.planner.find_control(window, locator, deadline)
+                except ControlNotFoundError:
+                    continue
+                controls[locator.raw] = control
+                _on_found(locator, control)
+        
+        return controls
+    
+    def iter_controls(self, window, control_identifier, timeout=10, max_results=None):
+        """查找所有匹配的控件，以生成器方式逐个返回
+        
+        结果不写入缓存：列表项等批量控件通常只使用一次，写入缓存会挤掉常用控件。
+        
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+            timeout: 等待第一个匹配控件的超时时间（秒）或Deadline实例
+            max_results: 最多返回的控件数量，为None时不限制
+            
+        Yields:
+            ControlElement: 匹配的控件元素
+            
+        Raises:
+            ValueError: 定位器格式无效时
+        """
+        locator = locator_utils.compile_valid(control_identifier)
+        if self.logger:
+            self.logger.debug(f"Finding all controls: {locator}, timeout: {timeout}, max_results: {max_results}")
+        if locator.alternatives:
+            yield from self.planner.iter_controls(window, locator, timeout, max_results)
+            return
+        yield from self.driver.iter_controls(window, locator, timeout, max_results)
+    
+    def capture_snapshot(self, window, max_depth=None):
+        """采集窗口子树快照，之后的只读校验可以直接在快照上查询
+        
+        Args:
+            window: 窗口元素
+            max_depth: 最大采集深度，为None时使用驱动的默认深度
+            
+        Returns:
+            UISnapshot: 窗口子树快照
+        """
+        snapshot = self.driver.capture_snapshot(window, max_depth)
+        if self.logger:
+            self.logger.debug(f"Captured UI snapshot with {len(snapshot)} elements")
+        return snapshot
+    
+    def get_ui_changes(self, window, snapshot, max_depth=None):
+        """重新采集窗口子树，并与之前的快照比较
+        
+        Args:
+            window: 窗口元素
+            snapshot: 之前采集的快照
+            max_depth: 最大采集深度，为None时使用驱动的默认深度
+            
+        Returns:
+            SnapshotDiff: 差异，new属性为本次采集的快照
+        """
+        diff = diff_snapshots(snapshot, self.capture_snapshot(window, max_depth))
+        if self.logger:
+            self.logger.debug(f"UI changes since snapshot: {diff!r}")
+        return diff
+    
+    def save_snapshot(self, window, path, max_depth=None):
+        """采集窗口子树并保存为快照文件，供离线验证定位器
+        
+        Args:
+            window: 窗口元素
+            path: 快照文件路径
+            max_depth: 最大采集深度，为None时使用驱动的默认深度
+            
+        Returns:
+            int: 写入的元素数量
+        """
+        count = self.driver.save_snapshot(window, path, max_depth)
+        if self.logger:
+            self.logger.debug(f"Saved UI snapshot with {count} elements to {path}")
+        return count
+    
+    def iter_table_rows(self, window, control_identifier, timeout=10):
+        """逐行读取表格控件的数据行，以生成器方式返回
+        
+        表格控件只查找一次，之后逐页读取已实现的数据行并向下滚动，
+        调用方停止迭代后不再滚动和读取。
+        
+        Args:
+            window: 窗口元素
+            control_identifier: 表格控件的标识符
+            timeout: 查找表格控件的超时时间（秒）或Deadline实例
+            
+        Yields:
+            list: 每个数据行的单元格文本
+            
+        Raises:
+            ControlNotFoundError: 表格控件未找到时
+        """
+        grid = self.find_control(window, control_identifier, timeout)
+        yield from self._iter_grid_rows(grid)
+    
+    def extract_table(self, window, control_identifier, path=None, timeout=10, offset=0, limit=None,
+                      include_header=True):
+        """提取表格控件的数据，写入CSV文件或返回一页数据
+        
+        数据行逐行读取，写入文件时边读边写，返回一页数据时读到该页末尾即停止，
+        内存占用与表格总行数无关。
+        
+        Args:
+            window: 窗口元素
+            control_identifier: 表格控件的标识符
+            path: CSV文件路径，为None时返回数据而不写文件
+            timeout: 查找表格控件的超时时间（秒）或Deadline实例
+            offset: 跳过的数据行数
+            limit: 最多提取的数据行数，为None时写入文件不限制，返回数据时为DEFAULT_TABLE_PAGE_SIZE
+            include_header: 是否把列标题作为第一行（表格没有表头时忽略）
+            
+        Returns:
+            int or list: 写入文件时返回写入的数据行数（不含表头），否则返回行列表（表头在前）
+            
+        Raises:
+            ValueError: offset或limit为负数时
+            ControlNotFoundError: 表格控件未找到时
+        """
+        import csv
+        import itertools
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError(f"offset and limit must not be negative, got offset={offset}, limit={limit}")
+        if limit is None and path is None:
+            limit = self.DEFAULT_TABLE_PAGE_SIZE
+        
+        grid = self.find_control(window, control_identifier, timeout)
+        header = self.driver.get_table_header(grid) if include_header else []
+        rows = itertools.islice(self._iter_grid_rows(grid), offset, None if limit is None else offset + limit)
+        
+        if path is None:
+            return ([header] if header else []) + list(rows)
+        
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if header:
+                writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        if self.logger:
+            self.logger.debug(f"Wrote {count} table rows from '{control_identifier}' to {path}")
+        return count
+    
+    def _iter_grid_rows(self, grid):
+        """逐页读取表格的数据行，支持虚拟化的表格
+        
+        先滚动到顶部，读取当前已实现的行后向下滚动一页，直到滚动位置不再变化。
+        相邻两页可能有重叠的行，只与上一页比较行标识去重，因此内存占用只与一页的行数有关。
+        行标识优先使用UIA运行时ID，取不到时使用单元格文本，此时页边界上内容完全相同的相邻行会被合并。
+        
+        Args:
+            grid: 表格控件
+            
+        Yields:
+            list: 每个数据行的单元格文本
+        """
+        self.driver.scroll_table(grid, to_top=True)
+        previous_keys = set()
+        while True:
+            page_keys = set()
+            for row in self.driver.get_table_rows(grid):
+                cells = self.driver.get_table_row_cells(row)
+                key = self._get_row_key(row, cells)
+                page_keys.add(key)
+                if key not in previous_keys:
+                    yield cells
+            if not self.driver.scroll_table(grid):
+                return
+            previous_keys = page_keys
+    
+    def _get_row_key(self, row, cells):
+        """获取数据行的标识，用于相邻两页之间去重
+        
+        Args:
+            row: 数据行元素
+            cells: 数据行的单元格文本
+            
+        Returns:
+            tuple: 行标识
+        """
+        fingerprint = self.driver.get_control_fingerprint(row)
+        if fingerprint and fingerprint[0] == 'runtime_id':
+            return fingerprint
+        return ('cells',) + tuple(cells)
+    
+    def _get_cached_control(self, window, locator):
+        """从缓存获取控件，命中时用指纹确认控件没有被销毁重建
+        
+        Args:
+            window: 窗口元素
+            locator: CompiledLocator
+            
+        Returns:
+            tuple: (control, is_cached)
+        """
+        validator = self._is_same_control if self.validate_cache_hits else None
+        return self.control_cache.get(window, locator, validator)
+    
+    def _cache_control(self, window, locator, control, timeout):
+        """将控件存入缓存，过期时间使用原始超时时间
+        
+        Args:
+            window: 窗口元素
+            locator: CompiledLocator
+            control: 控件元素
+            timeout: 查找时使用的超时时间（秒）或Deadline实例
+        """
+        expire_time = timeout.timeout if isinstance(timeout, Deadline) else timeout
+        fingerprint = self.driver.get_control_fingerprint(control) if self.validate_cache_hits else None
+        self.control_cache.set(window, locator, control, expire_time, fingerprint)
+        if self.logger:
+            self.logger.debug(f"Control '{locator}' cached")
+    
+    def _is_same_control(self, control, fingerprint):
+        """校验缓存的控件是否仍是界面上的同一个元素
+        
+        Args:
+            control: 缓存的控件元素
+            fingerprint: 缓存时记录的控件指纹
+            
+        Returns:
+            bool: 指纹一致时返回True，控件已失效或被重建时返回False
+        """
+        is_same = self.driver.get_control_fingerprint(control) == fingerprint
+        if not is_same and self.logger:
+            self.logger.debug("Cached control is stale, finding it again")
+        return is_same
+    
     def clear_cache(self, window=None):
         """清空缓存
         
@@ -93,6 +469,14 @@ class ControlService:
         """
         self.control_cache.clear(window)
     
+    def clear_negative_cache(self, window=None):
+        """清空否定缓存，在可能改变界面的操作之后调用
+        
+        Args:
+            window: 窗口元素，如果提供则只清空该窗口的否定缓存
+        """
+        self.control_cache.clear_negative(window)
+    
     def enable_cache(self):
         """启用缓存"""
         self.cache_enabled = True
@@ -281,40 +665,316 @@ class ControlService:
         Args:
             window: 窗口元素
             control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            timeout: 超时时间（秒）或Deadline实例
             
         Raises:
             AssertionError: 控件不存在时
         """
-        import time
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                self.find_control(window, control_identifier, timeout=0.5)
-                return True
-            except ControlNotFoundError:
-                time.sleep(0.5)
-        
-        raise AssertionError(f"Control not found: {control_identifier}")
+        # 只在驱动层轮询一次，使用同一个截止时间，不再嵌套超时循环
+        try:
+            self.find_control(window, control_identifier, Deadline.coerce(timeout))
+            return True
+        except ControlNotFoundError:
+            raise AssertionError(f"Control not found: {control_identifier}")
     
     def control_should_not_exist(self, window, control_identifier, timeout=10):
         """验证控件是否不存在
         
+        每次探测都绕过缓存直接查询驱动层，否则缓存命中会让已消失的控件一直被视为存在。
+        
         Args:
             window: 窗口元素
             control_identifier: 控件标识符
-            timeout: 超时时间（秒）
+            timeout: 超时时间（秒）或Deadline实例
             
         Raises:
             AssertionError: 控件存在时
         """
-        import time
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        def control_absent():
             try:
-                self.find_control(window, control_identifier, timeout=0.5)
-                time.sleep(0.5)
+                self.find_control(window, control_identifier, timeout=0, use_cache=False)
+                return False
             except ControlNotFoundError:
                 return True
         
+        if self.poller.poll(control_absent, Deadline.coerce(timeout)):
+            # 控件已消失，移除可能残留的缓存项
+            self.control_cache.remove(window, control_identifier)
+            return True
+        
         raise AssertionError(f"Control should not exist but was found: {control_identifier}")
+    
+    def wait_for_any_control(self, window, conditions, timeout=10):
+        """等待多个条件中的任意一个满足
+        
+        每次轮询在一次探测中求值所有条件，所有条件共用一个截止时间，
+        最坏情况下的等待时间是一个超时时间，而不是各个条件超时时间之和。
+        
+        Args:
+            window: 窗口元素
+            conditions: 条件列表，每个条件是一个定位器（等待控件出现），
+                或以"NOT "开头的定位器（等待控件消失）
+            timeout: 超时时间（秒）或Deadline实例
+            
+        Returns:
+            tuple: (满足的条件, 控件元素)，按传入顺序取第一个满足的条件；等待控件消失的条件对应的控件为None
+            
+        Raises:
+            ValueError: 没有条件或定位器格式无效时
+            AssertionError: 超时时没有任何条件满足
+        """
+        parsed = self._parse_conditions(conditions)
+        
+        def any_met():
+            results = self._evaluate_conditions(window, parsed)
+            for condition, _, _ in parsed:
+                if condition in results:
+                    return condition, results[condition]
+            return None
+        
+        matched = self.poller.poll(any_met, Deadline.coerce(timeout))
+        if matched is None:
+            raise AssertionError(f"None of the conditions was met: {', '.join(condition for condition, _, _ in parsed)}")
+        if self.logger:
+            self.logger.debug(f"Condition met: {matched[0]}")
+        return matched
+    
+    def wait_for_all_controls(self, window, conditions, timeout=10):
+        """等待多个条件全部满足
+        
+        每次轮询在一次探测中求值所有条件，所有条件在同一次探测中同时满足才算完成。
+        
+        Args:
+            window: 窗口元素
+            conditions: 条件列表，格式同wait_for_any_control
+            timeout: 超时时间（秒）或Deadline实例
+            
+        Returns:
+            dict: 条件 -> 控件元素，顺序与传入的条件一致；等待控件消失的条件对应的值为None
+            
+        Raises:
+            ValueError: 没有条件或定位器格式无效时
+            AssertionError: 超时时仍有条件未满足，消息中列出最后一次探测时未满足的条件
+        """
+        parsed = self._parse_conditions(conditions)
+        last_results = {}
+        
+        def all_met():
+            last_results.clear()
+            last_results.update(self._evaluate_conditions(window, parsed))
+            if len(last_results) == len(parsed):
+                return {condition: last_results[condition] for condition, _, _ in parsed}
+            return None
+        
+        matched = self.poller.poll(all_met, Deadline.coerce(timeout))
+        if matched is None:
+            unmet = [condition for condition, _, _ in parsed if condition not in last_results]
+            raise AssertionError(f"Conditions not met: {', '.join(unmet)}")
+        return matched
+    
+    def _parse_conditions(self, conditions):
+        """解析等待条件
+        
+        Args:
+            conditions: 条件列表
+            
+        Returns:
+            list: (条件字符串, CompiledLocator, 是否等待控件消失)列表，重复的条件只保留一个
+            
+        Raises:
+            ValueError: 没有条件或定位器格式无效时
+        """
+        parsed = {}
+        for condition in conditions:
+            condition = str(condition)
+            absent = condition.startswith(self.ABSENT_PREFIX)
+            locator = condition[len(self.ABSENT_PREFIX):].strip() if absent else condition
+            parsed.setdefault(condition, (condition, locator_utils.compile_valid(locator), absent))
+        if not parsed:
+            raise ValueError("At least one condition is required")
+        return list(parsed.values())
+    
+    def _evaluate_conditions(self, window, parsed):
+        """探测一次所有条件，不等待
+        
+        等待出现的定位器使用缓存并在一次子树遍历中查找；
+        等待消失的定位器绕过缓存，否则缓存命中会让已消失的控件一直被视为存在。
+        
+        Args:
+            window: 窗口元素
+            parsed: _parse_conditions返回的条件列表
+            
+        Returns:
+            dict: 满足的条件 -> 控件元素（等待消失的条件为None）
+        """
+        now = Deadline(0)
+        present = [locator for _, locator, absent in parsed if not absent]
+        gone = [locator for _, locator, absent in parsed if absent]
+        found = self._collect_controls(window, present, now) if present else {}
+        still_there = self._collect_controls(window, gone, now, use_cache=False) if gone else {}
+        
+        results = {}
+        for condition, locator, absent in parsed:
+            if absent:
+                if locator.raw not in still_there:
+                    # 控件已消失，移除可能残留的缓存项
+                    self.control_cache.remove(window, locator)
+                    results[condition] = None
+            elif locator.raw in found:
+                results[condition] = found[locator.raw]
+        return results
+    
+    def fill_form(self, window, fields, timeout=10):
+        """按顺序设置多个控件的值
+        
+        所有控件在一次子树遍历中解析，有控件未找到时不设置任何值；
+        某个控件设置失败时继续设置其余控件，最后统一报告所有失败的控件。
+        
+        Args:
+            window: 窗口元素
+            fields: 定位器 -> 值的字典，按字典顺序设置
+            timeout: 所有控件共用的超时时间（秒）或Deadline实例
+            
+        Raises:
+            ValueError: 定位器格式无效时
+            ControlNotFoundError: 有控件未找到时，消息中列出所有未找到的定位器
+            ControlOperationException: 有控件设置失败时，消息中列出所有失败的控件
+        """
+        controls = self.find_controls(window, list(fields), timeout)
+        errors = []
+        for locator, value in fields.items():
+            try:
+                self.set_control_value(controls[str(locator)], value)
+            except ControlOperationException as e:
+                errors.append(f"{locator} ({str(e)})")
+        self.clear_negative_cache(window)
+        if errors:
+            raise ControlOperationException(f"Failed to fill {len(errors)} of {len(fields)} fields: {'; '.join(errors)}")
+    
+    def read_form(self, window, control_identifiers, timeout=10):
+        """读取多个控件的值
+        
+        所有控件在一次子树遍历中解析，未找到或读取失败的控件不中断读取，最后统一报告。
+        
+        Args:
+            window: 窗口元素
+            control_identifiers: 控件标识符列表
+            timeout: 所有控件共用的超时时间（秒）或Deadline实例
+            
+        Returns:
+            dict: 定位器字符串 -> 控件值，顺序与传入的定位器一致
+            
+        Raises:
+            ValueError: 定位器格式无效时
+            ControlOperationException: 有控件未找到或读取失败时，消息中列出所有失败的控件
+        """
+        locators = list(dict.fromkeys(locator_utils.compile_valid(identifier) for identifier in control_identifiers))
+        controls = self._collect_controls(window, locators, Deadline.coerce(timeout))
+        values = {}
+        errors = []
+        for locator in locators:
+            control = controls.get(locator.raw)
+            if control is None:
+                errors.append(f"{locator.raw} (Control not found)")
+                continue
+            try:
+                values[locator.raw] = self.get_control_value(control)
+            except ControlOperationException as e:
+                errors.append(f"{locator.raw} ({str(e)})")
+        if errors:
+            raise ControlOperationException(f"Failed to read {len(errors)} fields: {'; '.join(errors)}")
+        return values
+    
+    def execute_actions(self, window, steps, timeout=10):
+        """在一次调用中按顺序执行一组控件操作
+        
+        执行前先解析和校验所有步骤并预编译定位器，步骤格式有误时不执行任何操作；
+        启用缓存时先在一次子树遍历中预取当前已存在的控件，之后各步骤查找控件时直接命中缓存，
+        由操作打开的对话框等后出现的控件在对应步骤中按超时时间等待。
+        
+        Args:
+            window: 窗口元素
+            steps: 步骤列表，每个步骤是(操作, 定位器, *参数)序列，
+                或包含action、locator和可选args的字典
+            timeout: 每个步骤查找控件的超时时间（秒）
+            
+        Returns:
+            list: 每个步骤一个字典，包含step（从1开始）、action、locator、elapsed（秒）和result
+                （get_text和get_value的返回值，其他操作为None）
+            
+        Raises:
+            ValueError: 步骤格式、操作名或定位器无效时
+            ControlNotFoundError: 某个步骤的控件未找到时，消息中包含步骤序号
+            ControlOperationException: 某个步骤的操作失败时，消息中包含步骤序号
+        """
+        import time
+        parsed = self._parse_steps(steps)
+        
+        if self.cache_enabled and parsed:
+            self._collect_controls(window, [locator for _, locator, _ in parsed], Deadline(0))
+        
+        results = []
+        for number, (action, locator, args) in enumerate(parsed, 1):
+            method_name, _, changes_ui = self.BATCH_ACTIONS[action]
+            start_time = time.perf_counter()
+            try:
+                control = self.find_control(window, locator, timeout)
+                result = getattr(self, method_name)(control, *args)
+            except ControlNotFoundError as e:
+                raise ControlNotFoundError(f"Step {number} ({action} {locator}) failed: {str(e)}") from e
+            except Exception as e:
+                raise ControlOperationException(f"Step {number} ({action} {locator}) failed: {str(e)}") from e
+            if changes_ui:
+                self.clear_negative_cache(window)
+            results.append({
+                'step': number,
+                'action': action,
+                'locator': locator.raw,
+                'elapsed': round(time.perf_counter() - start_time, 4),
+                'result': result
+            })
+        
+        if self.logger:
+            self.logger.debug(f"Executed {len(results)} control actions in "
+                              f"{sum(result['elapsed'] for result in results):.3f} seconds")
+        return results
+    
+    def _parse_steps(self, steps):
+        """解析并校验批量操作步骤
+        
+        Args:
+            steps: 步骤列表
+            
+        Returns:
+            list: (操作名, CompiledLocator, 参数元组)列表
+            
+        Raises:
+            ValueError: 步骤格式、操作名、参数个数或定位器无效时，消息中包含步骤序号
+        """
+        parsed = []
+        for number, step in enumerate(steps, 1):
+            if isinstance(step, dict):
+                action = step.get('action')
+                locator = step.get('locator')
+                args = step.get('args', ())
+                args = tuple(args) if isinstance(args, (list, tuple)) else (args,)
+            elif isinstance(step, (list, tuple)) and len(step) >= 2:
+                action, locator, *args = step
+                args = tuple(args)
+            else:
+                raise ValueError(f"Step {number} must be a (action, locator, *args) sequence "
+                                 f"or a dictionary, got: {step!r}")
+            
+            action = str(action or '').strip().lower().replace(' ', '_').replace('-', '_')
+            if action not in self.BATCH_ACTIONS:
+                raise ValueError(f"Step {number} has unsupported action '{action}'. "
+                                 f"Supported actions: {', '.join(self.BATCH_ACTIONS)}")
+            arg_count = self.BATCH_ACTIONS[action][1]
+            if len(args) != arg_count:
+                raise ValueError(f"Step {number} ({action}) expects {arg_count} argument(s), got {len(args)}")
+            try:
+                locator = locator_utils.compile_valid(locator)
+            except ValueError as e:
+                raise ValueError(f"Step {number} ({action}): {str(e)}")
+            parsed.append((action, locator, args))
+        return parsed
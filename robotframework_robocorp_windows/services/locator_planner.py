@@ -0,0 +1,253 @@
+# robotframework_robocorp_windows/services/locator_planner.py
+
+"""
+备选定位器规划器，按代价和历史命中率决定备选项的尝试顺序
+"""
+
+import threading
+from ..drivers.robocorp_driver import RobocorpWindowsDriver
+from ..extensions.base import get_extension_manager
+from ..utils.exceptions import ControlNotFoundError
+from ..utils.locator_utils import locator_utils
+from ..utils.polling import Poller, Deadline
+
+
+class LocatorPlanner:
+    """备选定位器规划器
+
+    备选定位器 ``id:btnSave || name:Save || text:Save`` 中的各备选项按预期代价排序：
+    - 基础代价按策略区分，AutomationId最便宜，其次是名称、类名、文本、正则和xpath；
+      链式备选项每多一步增加代价；自定义策略的代价取其cost属性（没有时使用默认值）
+    - 预期代价 = 基础代价 / 估计命中率，命中率按应用（可执行文件）分别统计，
+      使用拉普拉斯平滑，没有历史记录时按基础代价排序
+    - 每轮按顺序以零超时各探测一次，整轮都未命中时按退避策略等待后重试，
+      所有备选项共用同一个截止时间，不会在某一个备选项上耗尽整个超时时间
+
+    统计数据加锁，可在同步关键字与异步线程池之间共享同一实例。
+    """
+
+    # 定位策略 -> 基础代价
+    STRATEGY_COSTS = {
+        'id': 1.0,
+        'name': 2.0,
+        'class': 3.0,
+        'text': 4.0,
+        'index': 5.0,
+        'regex': 6.0,
+        'xpath': 8.0,
+        'executable': 8.0
+    }
+
+    # 自定义策略没有cost属性时的基础代价
+    DEFAULT_CUSTOM_COST = 2.0
+
+    # 链式备选项每多一步增加的代价
+    CHAIN_STEP_COST = 1.0
+
+    def __init__(self, driver=None, extension_manager=None, poller=None):
+        """初始化规划器
+
+        Args:
+            driver: RobocorpWindowsDriver实例，如果为None则创建新实例
+            extension_manager: ExtensionManager实例，用于读取自定义定位策略的代价，如果为None则使用全局扩展管理器
+            poller: Poller实例，如果为None则使用默认退避参数创建
+        """
+        self.driver = driver or RobocorpWindowsDriver()
+        self.extension_manager = extension_manager if extension_manager is not None else get_extension_manager()
+        self.poller = poller or Poller()
+        self.logger = None
+        self._statistics = {}  # 应用 -> {备选项定位器字符串: [尝试次数, 命中次数]}
+        self._lock = threading.Lock()
+
+    def set_logger(self, logger):
+        """设置日志记录器
+
+        Args:
+            logger: 日志记录器对象
+        """
+        self.logger = logger
+
+    @staticmethod
+    def get_application_key(window):
+        """获取统计命中率使用的应用标识
+
+        Args:
+            window: 窗口元素
+
+        Returns:
+            str: 窗口的可执行文件路径，获取不到时使用窗口名称
+        """
+        for attribute in ('executable', 'name'):
+            try:
+                value = getattr(window, attribute, None)
+            except Exception:
+                value = None
+            if isinstance(value, str) and value:
+                return value
+        return 'default'
+
+    def get_base_cost(self, alternative):
+        """获取备选项的基础代价
+
+        Args:
+            alternative: CompiledLocator
+
+        Returns:
+            float: 基础代价
+        """
+        custom_strategy = self.extension_manager.locator_strategies.get(alternative.strategy)
+        if custom_strategy is not None and not alternative.is_chained:
+            cost = getattr(custom_strategy, 'cost', self.DEFAULT_CUSTOM_COST)
+        else:
+            cost = min(self.STRATEGY_COSTS.get(criterion.strategy, self.DEFAULT_CUSTOM_COST)
+                       for criterion in alternative.parts[-1].criteria)
+        return cost + self.CHAIN_STEP_COST * (len(alternative.parts) - 1)
+
+    def plan(self, window, locator):
+        """确定备选项的尝试顺序
+
+        Args:
+            window: 窗口元素
+            locator: 备选定位器字符串或CompiledLocator
+
+        Returns:
+            list: 按预期代价升序排列的备选项CompiledLocator，代价相同时保持原顺序
+        """
+        locator = locator_utils.compile(locator)
+        alternatives = locator.alternatives or (locator,)
+        with self._lock:
+            statistics = dict(self._statistics.get(self.get_application_key(window), {}))
+
+        def expected_cost(alternative):
+            attempts, hits = statistics.get(alternative.raw, (0, 0))
+            hit_rate = (hits + 1) / (attempts + 2)
+            return self.get_base_cost(alternative) / hit_rate
+
+        return sorted(alternatives, key=expected_cost)
+
+    def find_control(self, window, locator, timeout=10):
+        """按规划顺序查找备选定位器对应的控件
+
+        Args:
+            window: 窗口元素
+            locator: 备选定位器字符串或CompiledLocator
+            timeout: 超时时间（秒）或上层传入的Deadline
+
+        Returns:
+            ControlElement: 找到的控件元素
+
+        Raises:
+            ControlNotFoundError: 所有备选项都未找到控件时
+        """
+        locator = locator_utils.compile(locator)
+        deadline = Deadline.coerce(timeout)
+        ordered = self.plan(window, locator)
+        if self.logger:
+            self.logger.debug(f"Planned fallback order for '{locator}': {' || '.join(str(alternative) for alternative in ordered)}")
+
+        tried = []
+
+        def _probe_all():
+            for alternative in ordered:
+                if alternative not in tried:
+                    tried.append(alternative)
+                control = self._probe(window, alternative)
+                if control is not None:
+                    return alternative, control
+            return None
+
+        result = self.poller.poll(_probe_all, deadline)
+        self._record(window, tried, result[0] if result else None)
+        if result is None:
+            raise ControlNotFoundError(f"Control not found with any fallback identifier: {locator}")
+        if self.logger:
+            self.logger.debug(f"Fallback locator '{locator}' matched alternative '{result[0]}'")
+        return result[1]
+
+    def iter_controls(self, window, locator, timeout=10, max_results=None):
+        """按规划顺序查找备选定位器匹配的所有控件
+
+        每轮按规划顺序以零超时探测各备选项，返回第一个有匹配的备选项的全部结果。
+
+        Args:
+            window: 窗口元素
+            locator: 备选定位器字符串或CompiledLocator
+            timeout: 等待第一个匹配控件的超时时间（秒）或上层传入的Deadline
+            max_results: 最多返回的控件数量，为None时不限制
+
+        Yields:
+            ControlElement: 命中的备选项匹配的控件元素；超时仍无匹配时不产生任何元素
+        """
+        locator = locator_utils.compile(locator)
+        deadline = Deadline.coerce(timeout)
+        ordered = self.plan(window, locator)
+        tried = []
+
+        def _first_match():
+            for alternative in ordered:
+                if alternative not in tried:
+                    tried.append(alternative)
+                matches = self.driver.iter_controls(window, alternative, 0, max_results)
+                control = next(matches, None)
+                if control is not None:
+                    return alternative, control, matches
+            return None
+
+        result = self.poller.poll(_first_match, deadline)
+        self._record(window, tried, result[0] if result else None)
+        if result:
+            _, control, matches = result
+            yield control
+            yield from matches
+
+    def get_statistics(self, window=None):
+        """获取命中率统计
+
+        Args:
+            window: 窗口元素，如果提供则只返回该窗口所属应用的统计
+
+        Returns:
+            dict: 应用 -> {备选项: (尝试次数, 命中次数)}，或单个应用的 {备选项: (尝试次数, 命中次数)}
+        """
+        with self._lock:
+            if window is not None:
+                return {raw: tuple(counts) for raw, counts in
+                        self._statistics.get(self.get_application_key(window), {}).items()}
+            return {application: {raw: tuple(counts) for raw, counts in entries.items()}
+                    for application, entries in self._statistics.items()}
+
+    def reset_statistics(self):
+        """清空命中率统计"""
+        with self._lock:
+            self._statistics.clear()
+
+    def _probe(self, window, alternative):
+        """以零超时探测一次备选项
+
+        Args:
+            window: 窗口元素
+            alternative: CompiledLocator
+
+        Returns:
+            ControlElement: 找到的控件，未找到时返回None
+        """
+        try:
+            return self.driver.find_control(window, alternative, 0)
+        except ControlNotFoundError:
+            return None
+
+    def _record(self, window, tried, hit):
+        """记录一次查找中各备选项的尝试和命中
+
+        Args:
+            window: 窗口元素
+            tried: 本次查找中尝试过的备选项
+            hit: 命中的备选项，全部未命中时为None
+        """
+        with self._lock:
+            entries = self._statistics.setdefault(self.get_application_key(window), {})
+            for alternative in tried:
+                counts = entries.setdefault(alternative.raw, [0, 0])
+                counts[0] += 1
+                if alternative == hit:
+                    counts[1] += 1
@@ -0,0 +1,311 @@
+# robotframework_robocorp_windows/services/window_registry.py
+
+"""
+顶级窗口注册表，按句柄、进程ID、可执行文件、标题和类名索引桌面上的窗口
+"""
+
+import ntpath
+import threading
+import time
+from ..drivers.robocorp_driver import RobocorpWindowsDriver
+from ..utils.exceptions import WindowNotFoundError
+from ..utils.polling import Poller, Deadline
+
+
+class WindowEntry:
+    """注册表中的一个顶级窗口"""
+
+    __slots__ = ('window', 'handle', 'pid', 'executable', 'title', 'class_name')
+
+    def __init__(self, window, handle, pid, executable, title, class_name):
+        """初始化窗口条目
+
+        Args:
+            window: 窗口元素
+            handle: 窗口句柄
+            pid: 进程ID
+            executable: 可执行文件路径
+            title: 窗口标题
+            class_name: 窗口类名
+        """
+        self.window = window
+        self.handle = handle
+        self.pid = pid
+        self.executable = executable
+        self.title = title
+        self.class_name = class_name
+
+    @property
+    def attributes(self):
+        """参与索引的属性，用于判断刷新时条目是否变化"""
+        return (self.pid, self.executable, self.title, self.class_name)
+
+    def __repr__(self):
+        return f"WindowEntry(handle={self.handle!r}, pid={self.pid!r}, title={self.title!r})"
+
+
+class WindowRegistry:
+    """顶级窗口注册表
+
+    注册表策略：
+    - 一次桌面枚举刷新所有索引，刷新是增量的：句柄和属性都未变化的窗口保留原条目，
+      只有新增、变化和消失的窗口更新索引
+    - 按 pid、可执行文件（完整路径和文件名，不区分大小写）、标题和类名建立「值 -> 句柄」索引，
+      多个条件时从候选最少的索引开始求交集，结果按桌面枚举顺序返回
+    - 查找时先使用现有索引，候选窗口仍然存在且标题未变时直接返回，不枚举桌面；
+      未命中时才重新枚举
+    - 所有读写操作加锁，可在同步关键字与异步线程池之间共享同一实例
+    """
+
+    def __init__(self, driver=None, poller=None):
+        """初始化窗口注册表
+
+        Args:
+            driver: RobocorpWindowsDriver实例，如果为None则创建新实例
+            poller: Poller实例，如果为None则使用默认退避参数创建
+        """
+        self.driver = driver or RobocorpWindowsDriver()
+        self.poller = poller or Poller()
+        self.logger = None
+        self.last_refresh = None  # 最近一次刷新的time.monotonic()时间
+        self.refresh_count = 0
+        self._entries = {}  # 句柄 -> WindowEntry
+        self._positions = {}  # 句柄 -> 最近一次枚举中的位置
+        self._indexes = {'pid': {}, 'executable': {}, 'title': {}, 'class_name': {}}  # 属性 -> {值: {句柄: None}}
+        self._lock = threading.RLock()
+
+    def set_logger(self, logger):
+        """设置日志记录器
+
+        Args:
+            logger: 日志记录器对象
+        """
+        self.logger = logger
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def refresh(self):
+        """枚举一次桌面并增量更新索引
+
+        Returns:
+            dict: 本次刷新中 added、changed、removed 的窗口数量
+        """
+        windows = self.driver.list_windows()
+        stats = {'added': 0, 'changed': 0, 'removed': 0}
+        with self._lock:
+            positions = {}
+            for window in windows:
+                entry = self._make_entry(window)
+                if entry.handle in positions:
+                    continue
+                positions[entry.handle] = len(positions)
+                current = self._entries.get(entry.handle)
+                if current is not None and current.attributes == entry.attributes:
+                    current.window = window
+                    continue
+                if current is None:
+                    stats['added'] += 1
+                else:
+                    stats['changed'] += 1
+                    self._unindex(current)
+                self._entries[entry.handle] = entry
+                self._index(entry)
+            for handle in [handle for handle in self._entries if handle not in positions]:
+                self._unindex(self._entries.pop(handle))
+                stats['removed'] += 1
+            self._positions = positions
+            self.last_refresh = time.monotonic()
+            self.refresh_count += 1
+        if self.logger:
+            self.logger.debug(f"Window registry refreshed: {len(positions)} windows, {stats}")
+        return stats
+
+    def lookup(self, title=None, class_name=None, pid=None, executable=None):
+        """在现有索引中查找窗口，不枚举桌面
+
+        Args:
+            title: 窗口标题（完全匹配）
+            class_name: 窗口类名
+            pid: 进程ID
+            executable: 可执行文件名或完整路径（不区分大小写）
+
+        Returns:
+            list: 满足所有条件的WindowEntry，按最近一次枚举的顺序排列；未提供条件时返回全部窗口
+        """
+        criteria = self._criteria(title, class_name, pid, executable)
+        with self._lock:
+            if not criteria:
+                handles = list(self._entries)
+            else:
+                postings = sorted((self._indexes[attribute].get(value, {}) for attribute, value in criteria),
+                                  key=len)
+                handles = [handle for handle in postings[0] if all(handle in other for other in postings[1:])]
+            handles.sort(key=lambda handle: self._positions.get(handle, len(self._positions)))
+            return [self._entries[handle] for handle in handles]
+
+    def resolve(self, title=None, class_name=None, pid=None, executable=None):
+        """查找一个满足条件的窗口，必要时刷新一次
+
+        参数与lookup一致。
+
+        Returns:
+            WindowElement: 找到的窗口元素，未找到时返回None
+        """
+        for entry in self.lookup(title, class_name, pid, executable):
+            if self._is_current(entry, title):
+                return entry.window
+        self.refresh()
+        for entry in self.lookup(title, class_name, pid, executable):
+            return entry.window
+        return None
+
+    def find_window(self, title=None, class_name=None, pid=None, executable=None, timeout=10):
+        """等待并返回一个满足条件的窗口
+
+        参数与lookup一致。
+
+        Args:
+            timeout: 超时时间（秒）或上层传入的Deadline
+
+        Returns:
+            WindowElement: 找到的窗口元素
+
+        Raises:
+            WindowNotFoundError: 超时仍未找到窗口时
+        """
+        deadline = Deadline.coerce(timeout)
+        window = self.poller.poll(lambda: self.resolve(title, class_name, pid, executable), deadline)
+        if window is not None:
+            return window
+        raise WindowNotFoundError(f"Window not found with {self.describe(title, class_name, pid, executable)}")
+
+    def is_open(self, title=None, class_name=None, pid=None, executable=None):
+        """检查当前是否有满足条件的窗口，重新枚举桌面
+
+        关闭检查不能依赖现有索引：上次刷新之后可能打开了新的同名窗口。
+
+        参数与lookup一致。
+
+        Returns:
+            bool: 是否存在满足条件的窗口
+        """
+        self.refresh()
+        return bool(self.lookup(title, class_name, pid, executable))
+
+    def clear(self):
+        """清空注册表"""
+        with self._lock:
+            self._entries.clear()
+            self._positions = {}
+            for index in self._indexes.values():
+                index.clear()
+            self.last_refresh = None
+
+    @staticmethod
+    def describe(title=None, class_name=None, pid=None, executable=None):
+        """生成查找条件的描述，用于异常消息
+
+        Returns:
+            str: 如 "title='Notepad', class_name='Notepad'"
+        """
+        criteria = [f"{name}='{value}'" for name, value in
+                    (('title', title), ('class_name', class_name), ('pid', pid), ('executable', executable))
+                    if value is not None]
+        return ', '.join(criteria) or 'any title'
+
+    def _make_entry(self, window):
+        """读取窗口属性并创建条目
+
+        Args:
+            window: 窗口元素
+
+        Returns:
+            WindowEntry: 窗口条目，窗口没有句柄时使用id(window)
+        """
+        info = self.driver.get_window_info(window)
+        handle = info.get('handle')
+        return WindowEntry(
+            window,
+            handle if handle is not None else id(window),
+            info.get('pid'),
+            info.get('executable'),
+            info.get('title'),
+            info.get('class_name')
+        )
+
+    def _is_current(self, entry, title):
+        """检查索引中的窗口是否仍然存在且标题未变
+
+        类名、进程和可执行文件在窗口的生命周期内不变，只有标题需要重新读取。
+
+        Args:
+            entry: WindowEntry
+            title: 查找时使用的标题，为None时不检查标题
+
+        Returns:
+            bool: 条目是否仍然有效
+        """
+        try:
+            if not self.driver.window_exists(entry.window):
+                return False
+            return title is None or self.driver.get_window_title(entry.window) == title
+        except Exception:
+            return False
+
+    @staticmethod
+    def _criteria(title, class_name, pid, executable):
+        """将查找条件转换为 (索引属性, 索引值) 列表
+
+        Returns:
+            list: 索引条件，只包含提供了的条件
+        """
+        criteria = []
+        if title is not None:
+            criteria.append(('title', title))
+        if class_name is not None:
+            criteria.append(('class_name', class_name))
+        if pid is not None:
+            criteria.append(('pid', _normalize_pid(pid)))
+        if executable is not None:
+            criteria.append(('executable', executable.lower()))
+        return criteria
+
+    def _index_values(self, entry):
+        """获取条目在各索引中的值
+
+        Args:
+            entry: WindowEntry
+
+        Returns:
+            list: (索引属性, 索引值) 列表，可执行文件同时按完整路径和文件名索引
+        """
+        values = [('pid', _normalize_pid(entry.pid)), ('title', entry.title), ('class_name', entry.class_name)]
+        if entry.executable:
+            executable = str(entry.executable).lower()
+            values.append(('executable', executable))
+            basename = ntpath.basename(executable)
+            if basename != executable:
+                values.append(('executable', basename))
+        return [(attribute, value) for attribute, value in values if value is not None]
+
+    def _index(self, entry):
+        for attribute, value in self._index_values(entry):
+            self._indexes[attribute].setdefault(value, {})[entry.handle] = None
+
+    def _unindex(self, entry):
+        for attribute, value in self._index_values(entry):
+            handles = self._indexes[attribute].get(value)
+            if handles is not None:
+                handles.pop(entry.handle, None)
+                if not handles:
+                    del self._indexes[attribute][value]
+
+
+def _normalize_pid(pid):
+    """将进程ID统一为整数，无法转换时原样返回"""
+    try:
+        return int(pid)
+    except (TypeError, ValueError):
+        return pid
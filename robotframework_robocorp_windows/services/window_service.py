@@ -5,6 +5,8 @@
 """
 
 from ..drivers.robocorp_driver import RobocorpWindowsDriver
+from ..utils.polling import Poller, Deadline
+from .window_registry import WindowRegistry
 from ..utils.exceptions import (
     WindowNotFoundError,
     ApplicationLaunchError,
@@ -15,13 +17,17 @@ from ..utils.exceptions import (
 class WindowService:
     """窗口管理服务，提供窗口相关的业务逻辑"""
     
-    def __init__(self, driver=None):
+    def __init__(self, driver=None, poller=None, registry=None):
         """初始化窗口服务
         
         Args:
             driver: RobocorpWindowsDriver实例，如果为None则创建新实例
+            poller: Poller实例，如果为None则使用默认退避参数创建
+            registry: WindowRegistry实例，如果为None则创建新实例
         """
         self.driver = driver or RobocorpWindowsDriver()
+        self.poller = poller or Poller()
+        self.registry = registry or WindowRegistry(self.driver, self.poller)
         self.logger = None
     
     def set_logger(self, logger):
@@ -32,31 +38,180 @@ class WindowService:
         """
         self.logger = logger
         self.driver.set_logger(logger)
+        self.registry.set_logger(logger)
     
-    def launch_application(self, app_path, timeout=10):
-        """启动Windows应用程序并找到主窗口
+    def launch_application(self, app_path, timeout=10, wait_for_idle=False):
+        """启动Windows应用程序并等待主窗口就绪
         
         Args:
             app_path: 应用程序可执行文件路径
             timeout: 超时时间（秒）
+            wait_for_idle: 是否还要等待进程处理完启动输入
             
         Returns:
-            tuple: (executable_name, window) - 可执行文件名和找到的窗口元素
+            tuple: (executable_name, window) - 可执行文件名和找到的窗口元素，超时未就绪时窗口为None
             
         Raises:
-            ApplicationLaunchError: 应用程序启动失败时
-            WindowNotFoundError: 未找到主窗口时
+            ApplicationLaunchError: 应用程序启动失败或进程在就绪前异常退出时
         """
-        # 启动应用程序
-        executable_name = self.driver.launch_application(app_path)
+        executable_name, process = self.spawn_application(app_path)
+        window = self.wait_for_application(process, executable_name, timeout, wait_for_idle)
+        return executable_name, window
+    
+    def launch_applications(self, app_paths, timeout=10, wait_for_idle=False):
+        """同时启动多个应用程序并并发等待全部就绪
         
-        # 尝试查找主窗口
+        先启动所有进程，再在同一个轮询循环中检查所有就绪条件，总等待时间约等于最慢的应用程序。
+        有应用程序启动失败或异常退出时，终止已经启动的其他进程后再抛出异常，不留下未注册的进程。
+        
+        Args:
+            app_paths: 应用程序可执行文件路径列表
+            timeout: 所有应用程序共用的超时时间（秒）
+            wait_for_idle: 是否还要等待进程处理完启动输入
+            
+        Returns:
+            list: (executable_name, window) 列表，顺序与传入的路径一致，超时未就绪的窗口为None
+            
+        Raises:
+            ApplicationLaunchError: 有应用程序启动失败或进程在就绪前异常退出时
+        """
+        launches = []
         try:
-            window = self.driver.find_window_by_executable(executable_name, timeout)
-            return executable_name, window
-        except WindowNotFoundError:
-            # 如果找不到，返回None作为窗口
-            return executable_name, None
+            for app_path in app_paths:
+                launches.append(self.spawn_application(app_path))
+            windows = self.wait_for_applications([process for _, process in launches],
+                                                 [executable_name for executable_name, _ in launches],
+                                                 timeout, wait_for_idle)
+        except Exception:
+            for executable_name, process in launches:
+                if self.logger:
+                    self.logger.debug(f"Terminating {executable_name} (pid {process.pid}) after a failed launch")
+                self.driver.terminate_application(process)
+            raise
+        return [(executable_name, window) for (executable_name, _), window in zip(launches, windows)]
+    
+    def spawn_application(self, app_path):
+        """启动应用程序进程，不等待就绪
+        
+        Args:
+            app_path: 应用程序可执行文件路径
+            
+        Returns:
+            tuple: (executable_name, process) - 可执行文件名和进程
+            
+        Raises:
+            ApplicationLaunchError: 应用程序启动失败时
+        """
+        process = self.driver.launch_application(app_path)
+        if self.logger:
+            self.logger.debug(f"Started {app_path} with pid {process.pid}")
+        return self.driver.get_executable_name(app_path), process
+    
+    def wait_for_application(self, process, executable_name, timeout=10, wait_for_idle=False):
+        """按自适应退避轮询等待启动的应用程序就绪
+        
+        就绪条件：
+        - 进程运行中时，窗口注册表中出现属于该进程ID的顶级窗口
+        - 进程以退出码0提前退出时视为启动器（启动后把工作交给其他进程），之后按可执行文件名等待主窗口
+        - 进程以非0退出码提前退出时立即失败，不再等待到超时
+        - wait_for_idle为True时，还要求进程已处理完启动输入（WaitForInputIdle）
+        
+        Args:
+            process: spawn_application返回的进程
+            executable_name: 可执行文件名
+            timeout: 超时时间（秒）或Deadline实例
+            wait_for_idle: 是否还要等待进程处理完启动输入
+            
+        Returns:
+            WindowElement: 主窗口，超时未就绪时返回None
+            
+        Raises:
+            ApplicationLaunchError: 进程在就绪前以非0退出码退出时
+        """
+        return self.wait_for_applications([process], [executable_name], timeout, wait_for_idle)[0]
+    
+    def wait_for_applications(self, processes, executable_names, timeout=10, wait_for_idle=False):
+        """在同一个轮询循环中等待多个应用程序就绪
+        
+        就绪条件与wait_for_application一致。每轮只在有应用程序未命中现有索引时枚举一次桌面，
+        之后所有未就绪的应用程序都在同一次枚举结果上检查，所有应用程序共用同一个截止时间。
+        
+        Args:
+            processes: spawn_application返回的进程列表
+            executable_names: 与进程对应的可执行文件名列表
+            timeout: 超时时间（秒）或Deadline实例
+            wait_for_idle: 是否还要等待进程处理完启动输入
+            
+        Returns:
+            list: 与进程对应的主窗口列表，超时未就绪的为None
+            
+        Raises:
+            ApplicationLaunchError: 有进程在就绪前以非0退出码退出时
+        """
+        deadline = Deadline.coerce(timeout)
+        checks = [self._readiness_check(process, executable_name, wait_for_idle)
+                  for process, executable_name in zip(processes, executable_names)]
+        windows = [None] * len(checks)
+        
+        def _all_ready():
+            pending = [index for index, window in enumerate(windows) if window is None]
+            # 先在现有索引中检查，仍有未就绪的应用程序时枚举一次桌面再检查
+            for refresh in (False, True):
+                if refresh:
+                    self.registry.refresh()
+                for index in pending:
+                    windows[index] = checks[index](refresh)
+                pending = [index for index in pending if windows[index] is None]
+                if not pending:
+                    return True
+            return False
+        
+        self.poller.poll(_all_ready, deadline)
+        if self.logger:
+            for process, executable_name, window in zip(processes, executable_names, windows):
+                state = "ready" if window is not None else "not ready before timeout"
+                self.logger.debug(f"Application {executable_name} (pid {process.pid}) {state}")
+        return windows
+    
+    def _readiness_check(self, process, executable_name, wait_for_idle):
+        """创建单个应用程序的就绪检查函数
+        
+        Args:
+            process: 进程
+            executable_name: 可执行文件名
+            wait_for_idle: 是否还要等待进程处理完启动输入
+            
+        Returns:
+            callable: check(refreshed)，返回就绪的主窗口或None；refreshed为False时只信任仍然存在的窗口
+        """
+        tracking = {'pid': process.pid}
+        
+        def _check(refreshed):
+            if tracking['pid'] is not None:
+                exit_code = process.poll()
+                if exit_code is not None:
+                    if exit_code != 0:
+                        raise ApplicationLaunchError(
+                            f"Application {executable_name} (pid {process.pid}) exited with code {exit_code} before it was ready")
+                    if self.logger:
+                        self.logger.debug(f"Launcher process {process.pid} exited, waiting for a window of {executable_name}")
+                    tracking['pid'] = None
+            if tracking['pid'] is not None:
+                entries = self.registry.lookup(pid=tracking['pid'])
+            else:
+                entries = self.registry.lookup(executable=executable_name)
+            window = None
+            for entry in entries:
+                if refreshed or self.driver.window_exists(entry.window):
+                    window = entry.window
+                    break
+            if window is None:
+                return None
+            if wait_for_idle and tracking['pid'] is not None and not self.driver.is_input_idle(process):
+                return None
+            return window
+        
+        return _check
     
     def connect_to_application(self, title=None, class_name=None, process=None, timeout=10):
         """连接到已运行的应用程序
@@ -88,8 +243,9 @@ class WindowService:
         
         locator = " ".join(locator_parts)
         
-        # 查找窗口
-        window = self.driver.find_window_by_locator(locator, timeout)
+        # 通过窗口注册表查找窗口
+        window = self.registry.find_window(title=title or None, class_name=class_name or None,
+                                           pid=process or None, timeout=timeout)
         return locator, window
     
     def set_current_window(self, title=None, class_name=None, timeout=10):
@@ -106,22 +262,8 @@ class WindowService:
         Raises:
             WindowNotFoundError: 未找到窗口时
         """
-        # 构建定位符字符串
-        locator_parts = []
-        if title:
-            locator_parts.append(f"name:{title}")
-        if class_name:
-            locator_parts.append(f"class:{class_name}")
-        
-        if not locator_parts:
-            # 如果没有提供定位符，使用第一个顶级窗口
-            locator = "regex:.*"
-        else:
-            locator = " ".join(locator_parts)
-        
-        # 查找窗口
-        window = self.driver.find_window_by_locator(locator, timeout)
-        return window
+        # 通过窗口注册表查找窗口，未提供条件时使用第一个顶级窗口
+        return self.registry.find_window(title=title or None, class_name=class_name or None, timeout=timeout)
     
     def get_window_title(self, window):
         """获取窗口标题
@@ -180,29 +322,16 @@ class WindowService:
         """
         def window_exists():
             try:
-                # 构建定位符字符串
-                locator_parts = []
-                if title:
-                    locator_parts.append(f"name:{title}")
-                if class_name:
-                    locator_parts.append(f"class:{class_name}")
-                
-                if not locator_parts:
+                if not title and not class_name:
                     # 如果没有提供定位符，检查当前窗口是否存在
                     return current_window is not None and self.driver.window_exists(current_window)
                 
-                locator = " ".join(locator_parts)
-                window = self.driver.get_window_by_locator(locator, timeout=0.5)
-                return window is not None
+                return self.registry.resolve(title=title or None, class_name=class_name or None) is not None
             except Exception:
                 return False
         
-        import time
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if window_exists():
-                return
-            time.sleep(0.5)
+        if self.poller.poll(window_exists, timeout):
+            return
         
         raise AssertionError(f"Window not found with title='{title}', class_name='{class_name}'")
     
@@ -220,28 +349,15 @@ class WindowService:
         """
         def window_not_exists():
             try:
-                # 构建定位符字符串
-                locator_parts = []
-                if title:
-                    locator_parts.append(f"name:{title}")
-                if class_name:
-                    locator_parts.append(f"class:{class_name}")
-                
-                if not locator_parts:
+                if not title and not class_name:
                     # 如果没有提供定位符，检查当前窗口是否关闭
                     return current_window is None or not self.driver.window_exists(current_window)
                 
-                locator = " ".join(locator_parts)
-                window = self.driver.get_window_by_locator(locator, timeout=0.5)
-                return window is None
+                return not self.registry.is_open(title=title or None, class_name=class_name or None)
             except Exception:
                 return True
         
-        import time
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if window_not_exists():
-                return
-            time.sleep(0.5)
+        if self.poller.poll(window_not_exists, timeout):
+            return
         
         raise AssertionError(f"Window is still open: title='{title}', class_name='{class_name}'")
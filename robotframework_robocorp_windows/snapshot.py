@@ -0,0 +1,109 @@
+# robotframework_robocorp_windows/snapshot.py
+
+"""
+离线快照查询命令行工具，不需要Windows桌面即可在保存的快照文件上验证定位器
+
+用法：
+    python -m robotframework_robocorp_windows.snapshot query dump.bin "name:OK"
+    python -m robotframework_robocorp_windows.snapshot query dump.bin "class:ListItem" --max-results 10
+    python -m robotframework_robocorp_windows.snapshot info dump.bin
+"""
+
+import argparse
+import sys
+from .drivers.snapshot_file import open_snapshot
+from .utils.exceptions import SnapshotFormatError
+from .utils.locator_utils import locator_utils
+
+
+def format_node(node):
+    """将快照节点格式化为一行制表符分隔的文本
+
+    Args:
+        node: SnapshotNode
+
+    Returns:
+        str: 节点序号、控件类型、名称、类名、AutomationId和边界矩形，没有值的属性输出为空字符串
+    """
+    left, top, right, bottom = node.rect
+    return '\t'.join([
+        str(node.index),
+        node.control_type or '',
+        repr(node.name or ''),
+        node.class_name or '',
+        node.automation_id or '',
+        f"({left}, {top}, {right}, {bottom})"
+    ])
+
+
+def query(path, locator, max_results=None, out=None):
+    """在快照文件上查询定位器并输出匹配的节点
+
+    Args:
+        path: 快照文件路径
+        locator: 定位器字符串
+        max_results: 最多输出的节点数量
+        out: 输出流，默认为标准输出
+
+    Returns:
+        int: 匹配的节点数量
+    """
+    out = out or sys.stdout
+    compiled = locator_utils.compile_valid(locator)
+    count = 0
+    with open_snapshot(path) as snapshot:
+        for node in snapshot.find_all(compiled, max_results):
+            out.write(format_node(node) + '\n')
+            count += 1
+    return count
+
+
+def info(path, out=None):
+    """输出快照文件的概要信息
+
+    Args:
+        path: 快照文件路径
+        out: 输出流，默认为标准输出
+    """
+    out = out or sys.stdout
+    with open_snapshot(path) as snapshot:
+        out.write(f"nodes: {len(snapshot)}\n")
+        out.write(f"strings: {len(snapshot.strings)}\n")
+        out.write(f"root: {format_node(snapshot.node(0))}\n")
+
+
+def main(argv=None):
+    """命令行入口
+
+    Args:
+        argv: 命令行参数，默认使用sys.argv
+
+    Returns:
+        int: 退出码，0表示找到匹配的节点，1表示没有匹配，2表示参数或文件错误
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m robotframework_robocorp_windows.snapshot',
+        description='Evaluate locators against a saved UI snapshot without a live desktop.'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    query_parser = commands.add_parser('query', help='print the elements matching a locator')
+    query_parser.add_argument('path', help='snapshot file saved with Save UI Snapshot')
+    query_parser.add_argument('locator', help='locator, e.g. "name:OK" or "name:Panel > class:Edit"')
+    query_parser.add_argument('--max-results', type=int, default=None, help='stop after this many matches')
+    info_parser = commands.add_parser('info', help='print a summary of a snapshot file')
+    info_parser.add_argument('path', help='snapshot file saved with Save UI Snapshot')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'info':
+            info(args.path)
+            return 0
+        count = query(args.path, args.locator, args.max_results)
+    except (OSError, ValueError, SnapshotFormatError) as error:
+        sys.stderr.write(f"error: {error}\n")
+        return 2
+    return 0 if count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
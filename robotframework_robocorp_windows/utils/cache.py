@@ -4,112 +4,245 @@
 缓存工具类，用于缓存控件查找结果，提高性能
 """
 
+import threading
 import time
 from collections import OrderedDict
 
 
 class ControlCache:
     """控件缓存类，用于缓存控件查找结果
-    
+
     缓存策略：
-    - 基于「窗口句柄+控件定位符」作为key
+    - 基于「窗口句柄+控件定位符」元组作为key
     - 设置过期时间（默认与timeout一致）
-    - 当窗口状态变化时，自动清空关联缓存
+    - LRU淘汰：命中时将条目移到队尾，超出容量时淘汰最久未使用的条目
+    - 维护「窗口句柄 -> key集合」的二级索引，按窗口清空缓存时无需扫描全部key
+    - 所有读写操作加锁，可在同步关键字与异步线程池之间共享同一实例
+    - 可选的否定缓存：记录「窗口+定位符」最近未找到的结果，使用单独的较短过期时间
+    - 缓存项可附带控件指纹，命中时由调用方提供的校验函数确认控件仍然有效
     """
-    
-    def __init__(self, default_expire_time=10):
+
+    def __init__(self, default_expire_time=10, max_size=100, negative_expire_time=None):
         """初始化缓存
-        
+
         Args:
             default_expire_time: 默认过期时间（秒）
+            max_size: 最大缓存条目数
+            negative_expire_time: 否定缓存的过期时间（秒），为None或0时不启用否定缓存
         """
         self.cache = OrderedDict()
         self.default_expire_time = default_expire_time
-    
+        self.max_size = max_size
+        self.negative_expire_time = negative_expire_time
+        self._window_index = {}  # 窗口句柄 -> 该窗口下的缓存key集合
+        self._negative_cache = {}  # 窗口句柄 -> {控件标识符: 过期时间}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _get_window_handle(window):
+        """获取窗口句柄
+
+        Args:
+            window: 窗口元素
+
+        Returns:
+            窗口句柄，窗口没有handle属性时使用id(window)
+        """
+        return getattr(window, 'handle', id(window))
+
     def _get_key(self, window, control_identifier):
         """生成缓存键
-        
+
         Args:
             window: 窗口元素
-            control_identifier: 控件标识符
-            
+            control_identifier: 控件标识符（定位器字符串或CompiledLocator）
+
         Returns:
-            str: 缓存键
+            tuple: 缓存键 (window_handle, locator_string)
         """
-        window_handle = getattr(window, 'handle', id(window))
-        return f"{window_handle}_{control_identifier}"
-    
-    def get(self, window, control_identifier):
+        return (self._get_window_handle(window), str(control_identifier))
+
+    def _remove(self, key):
+        """移除缓存项并同步更新窗口索引
+
+        Args:
+            key: 缓存键
+        """
+        self.cache.pop(key, None)
+        window_keys = self._window_index.get(key[0])
+        if window_keys is not None:
+            window_keys.discard(key)
+            if not window_keys:
+                del self._window_index[key[0]]
+
+    def get(self, window, control_identifier, validator=None):
         """从缓存中获取控件
-        
+
         Args:
             window: 窗口元素
             control_identifier: 控件标识符
-            
+            validator: 可选的校验函数validator(control, fingerprint) -> bool，
+                缓存项带有指纹时在命中后调用，返回False时视为失效并移除
+
         Returns:
             tuple: (control, is_cached) - 控件元素和是否来自缓存的标志
         """
         key = self._get_key(window, control_identifier)
-        if key in self.cache:
-            control, expire_time = self.cache[key]
-            if time.time() < expire_time:
-                # 缓存未过期，返回控件
-                return control, True
-            else:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None, False
+            control, expire_time, fingerprint = entry
+            if time.time() >= expire_time:
                 # 缓存已过期，移除并返回None
-                del self.cache[key]
-        return None, False
-    
-    def set(self, window, control_identifier, control, expire_time=None):
+                self._remove(key)
+                return None, False
+            # 缓存未过期，标记为最近使用
+            self.cache.move_to_end(key)
+
+        # 校验可能涉及跨进程调用，在锁外执行
+        if validator is not None and fingerprint is not None and not validator(control, fingerprint):
+            with self._lock:
+                # 只移除仍是同一条的缓存项，避免误删其他线程刚写入的新结果
+                if self.cache.get(key) is entry:
+                    self._remove(key)
+            return None, False
+        return control, True
+
+    def set(self, window, control_identifier, control, expire_time=None, fingerprint=None):
         """将控件存入缓存
-        
+
         Args:
             window: 窗口元素
             control_identifier: 控件标识符
             control: 控件元素
             expire_time: 过期时间（秒），如果为None则使用默认值
+            fingerprint: 控件指纹（如运行时ID或边界矩形），用于命中时校验控件是否仍然有效
         """
         key = self._get_key(window, control_identifier)
         expire_time = time.time() + (expire_time or self.default_expire_time)
-        self.cache[key] = (control, expire_time)
-        
-        # 限制缓存大小，防止内存溢出
-        if len(self.cache) > 100:
-            # 删除最旧的缓存项
-            self.cache.popitem(last=False)
-    
+        with self._lock:
+            self.cache[key] = (control, expire_time, fingerprint)
+            self.cache.move_to_end(key)
+            self._window_index.setdefault(key[0], set()).add(key)
+
+            # 限制缓存大小，防止内存溢出
+            while len(self.cache) > self.max_size:
+                # 淘汰最久未使用的缓存项
+                oldest_key = next(iter(self.cache))
+                self._remove(oldest_key)
+
+    def remove(self, window, control_identifier):
+        """移除单个缓存项
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+        """
+        with self._lock:
+            self._remove(self._get_key(window, control_identifier))
+
+    def is_negative_cache_enabled(self):
+        """检查否定缓存是否启用
+
+        Returns:
+            bool: 否定缓存是否启用
+        """
+        return bool(self.negative_expire_time)
+
+    def set_negative(self, window, control_identifier):
+        """记录控件未找到的结果，否定缓存未启用时不做任何操作
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+        """
+        if not self.is_negative_cache_enabled():
+            return
+        window_handle = self._get_window_handle(window)
+        with self._lock:
+            locator_key = str(control_identifier)
+            window_entries = self._negative_cache.setdefault(window_handle, {})
+            window_entries.pop(locator_key, None)
+            window_entries[locator_key] = time.time() + self.negative_expire_time
+            # 限制单个窗口的否定缓存大小，淘汰最早记录的条目
+            if len(window_entries) > self.max_size:
+                del window_entries[next(iter(window_entries))]
+
+    def is_known_absent(self, window, control_identifier):
+        """检查控件是否在否定缓存中（最近未找到且未过期）
+
+        Args:
+            window: 窗口元素
+            control_identifier: 控件标识符
+
+        Returns:
+            bool: 控件是否已知不存在
+        """
+        if not self.is_negative_cache_enabled():
+            return False
+        window_handle = self._get_window_handle(window)
+        with self._lock:
+            window_entries = self._negative_cache.get(window_handle)
+            if not window_entries:
+                return False
+            locator_key = str(control_identifier)
+            expire_time = window_entries.get(locator_key)
+            if expire_time is None:
+                return False
+            if time.time() < expire_time:
+                return True
+            del window_entries[locator_key]
+            if not window_entries:
+                del self._negative_cache[window_handle]
+        return False
+
+    def clear_negative(self, window=None):
+        """清空否定缓存
+
+        Args:
+            window: 窗口元素，如果提供则只清空该窗口的否定缓存
+        """
+        with self._lock:
+            if window is not None:
+                self._negative_cache.pop(self._get_window_handle(window), None)
+            else:
+                self._negative_cache.clear()
+
     def clear(self, window=None):
-        """清空缓存
-        
+        """清空缓存（包括否定缓存）
+
         Args:
             window: 窗口元素，如果提供则只清空该窗口的缓存
         """
-        if window:
-            # 只清空指定窗口的缓存
-            window_handle = getattr(window, 'handle', id(window))
-            keys_to_remove = [key for key in self.cache if key.startswith(f"{window_handle}_")]
-            for key in keys_to_remove:
-                del self.cache[key]
-        else:
-            # 清空所有缓存
-            self.cache.clear()
-    
+        with self._lock:
+            if window is not None:
+                # 只清空指定窗口的缓存，通过索引直接定位该窗口的key
+                window_keys = self._window_index.pop(self._get_window_handle(window), ())
+                for key in window_keys:
+                    self.cache.pop(key, None)
+            else:
+                # 清空所有缓存
+                self.cache.clear()
+                self._window_index.clear()
+            self.clear_negative(window)
+
     def clear_all(self):
         """清空所有缓存
         """
         self.clear()
-    
+
     def size(self):
         """获取缓存大小
-        
+
         Returns:
             int: 缓存中的控件数量
         """
         return len(self.cache)
-    
+
     def __len__(self):
         """获取缓存大小
-        
+
         Returns:
             int: 缓存中的控件数量
         """
@@ -0,0 +1,143 @@
+# robotframework_robocorp_windows/utils/com_apartment.py
+
+"""
+COM套间管理，线程池的每个工作线程只进入一次COM套间，关闭线程池时在同一线程上退出
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from .logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ComApartment:
+    """COM套间的进入和退出操作
+
+    所有COM调用都集中在这里，测试中可以替换为不调用COM的假实现，在非Windows平台上验证线程池的生命周期。
+    """
+
+    def initialize(self):
+        """在当前线程进入COM套间"""
+        from comtypes import CoInitialize
+        CoInitialize()
+
+    def uninitialize(self):
+        """在当前线程退出COM套间"""
+        from comtypes import CoUninitialize
+        CoUninitialize()
+
+
+class ComThreadPoolExecutor(ThreadPoolExecutor):
+    """每个工作线程只初始化一次COM的线程池
+
+    线程池策略：
+    - 工作线程启动时由initializer进入COM套间，之后执行的所有任务共用该套间，
+      任务之间不再重复CoInitialize/CoUninitialize，缓存在线程上的COM代理也保持有效
+    - 进入套间失败时只记录警告，工作线程照常执行任务，不会让整个线程池不可用
+    - 关闭线程池时向每个已进入套间的工作线程提交一个退出任务，退出任务在屏障上互相等待，
+      使每个工作线程领取一个退出任务，在进入套间的同一线程上执行CoUninitialize；
+      退出是幂等的，某个线程重复领取退出任务时直接跳过
+    - 关闭时最多等待TEARDOWN_TIMEOUT秒，仍在执行长时间UIA调用的工作线程不再等待，
+      记录警告后直接关闭线程池
+    """
+
+    # 退出任务在屏障上等待其他工作线程、以及关闭时等待退出任务完成的最长时间（秒）
+    TEARDOWN_TIMEOUT = 5
+
+    def __init__(self, max_workers=None, apartment=None, thread_name_prefix='rfw-com'):
+        """初始化线程池
+
+        Args:
+            max_workers: 最大工作线程数
+            apartment: ComApartment实例，如果为None则使用调用comtypes的默认实现
+            thread_name_prefix: 工作线程名称前缀
+        """
+        self.apartment = apartment or ComApartment()
+        self._local = threading.local()
+        self._workers = set()  # 已进入COM套间的工作线程ID
+        self._workers_lock = threading.Lock()
+        self._pending = weakref.WeakSet()  # 已提交的任务，用于cancel_futures
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix,
+                         initializer=self._enter_apartment)
+
+    @property
+    def initialized_workers(self):
+        """已进入COM套间的工作线程数量"""
+        with self._workers_lock:
+            return len(self._workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = super().submit(fn, *args, **kwargs)
+        self._pending.add(future)
+        return future
+
+    def _enter_apartment(self):
+        """工作线程的initializer，进入COM套间
+
+        进入失败时不抛出异常，否则线程池会被标记为broken，之后提交的所有任务都会失败。
+        """
+        try:
+            self.apartment.initialize()
+        except Exception as e:
+            logger.warn(f"Worker thread {threading.current_thread().name} could not enter a COM apartment: {e}")
+            return
+        self._local.initialized = True
+        with self._workers_lock:
+            self._workers.add(threading.get_ident())
+
+    def _leave_apartment(self, barrier):
+        """退出任务，在当前工作线程上退出COM套间
+
+        Args:
+            barrier: 同一轮退出任务共用的屏障，使每个工作线程只领取一个退出任务
+        """
+        try:
+            barrier.wait(self.TEARDOWN_TIMEOUT)
+        except threading.BrokenBarrierError:
+            pass
+        if getattr(self._local, 'initialized', False):
+            self._local.initialized = False
+            with self._workers_lock:
+                self._workers.discard(threading.get_ident())
+            self.apartment.uninitialize()
+
+    def _submit_teardown(self):
+        """向每个已进入套间的工作线程提交一个退出任务
+
+        Returns:
+            list: 退出任务的future列表，没有需要退出的工作线程时为空列表
+        """
+        worker_count = self.initialized_workers
+        if not worker_count:
+            return []
+        barrier = threading.Barrier(worker_count)
+        try:
+            return [super(ComThreadPoolExecutor, self).submit(self._leave_apartment, barrier)
+                    for _ in range(worker_count)]
+        except RuntimeError:
+            # 线程池已经关闭，工作线程已退出
+            return []
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """在每个工作线程上退出COM套间后关闭线程池
+
+        Args:
+            wait: 是否等待所有任务和COM退出完成后返回
+            cancel_futures: 是否取消尚未开始的任务（退出任务不会被取消）
+        """
+        if cancel_futures:
+            for future in list(self._pending):
+                future.cancel()
+        teardown = self._submit_teardown()
+        if wait and teardown:
+            futures_wait(teardown, timeout=self.TEARDOWN_TIMEOUT)
+            # 退出任务也可能被关闭过程中新启动的工作线程领取，以仍在套间中的线程数为准
+            busy = self.initialized_workers
+            if busy:
+                logger.warn(f"{busy} COM worker thread(s) still busy after {self.TEARDOWN_TIMEOUT} seconds, "
+                            f"shutting down without waiting for them")
+                wait = False
+        super().shutdown(wait=wait)
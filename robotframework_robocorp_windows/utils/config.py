@@ -114,7 +114,9 @@ def get_default_config() -> Dict[str, Any]:
         'retry_interval': 0.5,
         'log_level': 'INFO',
         'cache_enabled': True,
-        'async_max_workers': 5
+        'async_max_workers': 5,
+        'async_max_pending': 100,
+        'async_result_ttl': 300
     }
 
 
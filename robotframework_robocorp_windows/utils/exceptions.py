@@ -103,3 +103,8 @@ class AsyncOperationException(ControlError):
 class TimeoutError(RobocorpWindowsError):
     """操作超时异常"""
     pass
+
+
+class SnapshotFormatError(RobocorpWindowsError):
+    """快照文件格式无效或版本不受支持时抛出"""
+    pass
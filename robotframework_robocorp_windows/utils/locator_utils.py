@@ -4,6 +4,120 @@
 定位器工具函数，用于验证和处理控件定位器
 """
 
+import re
+from functools import lru_cache
+from .xpath import compile_xpath, XPathSyntaxError
+
+
+class LocatorPart:
+    """定位器链中的单个步骤，如 ``name:OK`` 或 ``class:Edit``
+    
+    同一步骤中用空格分隔的多个条件（如 ``name:OK class:Button``）需要同时满足，
+    第一个条件保存在strategy/value中，其余条件保存在extra中。
+    """
+    
+    __slots__ = ('strategy', 'value', 'explicit', 'regex', 'extra', 'match_value')
+    
+    def __init__(self, strategy, value, explicit, regex=None, extra=()):
+        """初始化定位步骤
+        
+        Args:
+            strategy: 定位策略
+            value: 定位值
+            explicit: 定位器中是否显式写出了策略前缀
+            regex: 预编译的正则表达式（仅regex策略）
+            extra: 同一步骤中的其他条件（LocatorPart元组）
+        """
+        self.strategy = strategy
+        self.value = value
+        self.explicit = explicit
+        self.regex = regex
+        self.extra = extra
+        # 匹配时使用的值，去掉成对的引号，如 name:"Save As"
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+            self.match_value = value[1:-1]
+        else:
+            self.match_value = value
+    
+    @property
+    def criteria(self):
+        """该步骤的全部条件"""
+        return (self,) + self.extra
+    
+    def __repr__(self):
+        return f"LocatorPart({self.strategy!r}, {self.value!r})"
+
+
+class CompiledLocator:
+    """已解析的定位器，解析一次后由LocatorUtils缓存复用
+    
+    包含策略、定位值、链式子定位器（``name:X > class:Y``）、备选项（``id:a || name:b``）和预编译的正则表达式，
+    服务层、驱动层和缓存都直接使用该对象，不再重复拆分和验证定位器字符串。
+    str(locator) 返回原始定位器字符串。
+    """
+    
+    __slots__ = ('raw', 'parts', 'is_valid', 'message', 'alternatives', 'walkable')
+    
+    def __init__(self, raw, parts, is_valid, message, alternatives=(), walkable=True):
+        """初始化已解析的定位器
+        
+        Args:
+            raw: 原始定位器字符串
+            parts: LocatorPart元组，链式定位器的每一步；备选定位器为空元组
+            is_valid: 定位器是否有效
+            message: 验证结果消息
+            alternatives: 备选定位器（``id:a || name:b``）中各备选项的CompiledLocator元组
+            walkable: parts是否完整表达了定位器；包含robocorp-windows的其他语法时为False，
+                不能在内存中求值，只能把原始字符串交给robocorp-windows
+        """
+        self.raw = raw
+        self.parts = parts
+        self.is_valid = is_valid
+        self.message = message
+        self.alternatives = alternatives
+        self.walkable = walkable
+    
+    @property
+    def strategy(self):
+        """第一步的定位策略"""
+        return self.parts[0].strategy if self.parts else None
+    
+    @property
+    def value(self):
+        """第一步的定位值"""
+        return self.parts[0].value if self.parts else None
+    
+    @property
+    def has_explicit_strategy(self):
+        """定位器是否以显式的策略前缀开头"""
+        return bool(self.parts) and self.parts[0].explicit
+    
+    @property
+    def is_chained(self):
+        """是否为链式定位器"""
+        return len(self.parts) > 1
+    
+    @property
+    def xpath(self):
+        """xpath策略的已编译表达式，其他策略为None"""
+        if self.is_valid and self.strategy == 'xpath':
+            return compile_xpath(self.value)
+        return None
+    
+    def __str__(self):
+        return self.raw
+    
+    def __repr__(self):
+        return f"CompiledLocator({self.raw!r})"
+    
+    def __eq__(self, other):
+        if isinstance(other, CompiledLocator):
+            return self.raw == other.raw
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash(self.raw)
+
 
 class LocatorUtils:
     """定位器工具类，提供定位器验证和处理功能"""
@@ -16,37 +130,215 @@ class LocatorUtils:
         'text',      # 控件文本
         'xpath',     # XPath定位
         'index',     # 控件索引
-        'executable' # 可执行文件名
+        'executable', # 可执行文件名
+        'regex'      # 正则表达式匹配名称
     }
     
+    # 链式定位器的分隔符，如 name:Panel > class:Edit
+    CHAIN_SEPARATOR = ' > '
+    
+    # 备选定位器的分隔符，如 id:btnSave || name:Save，由LocatorPlanner按代价顺序尝试
+    ALTERNATIVE_SEPARATOR = ' || '
+    
+    # 不拆分链的策略，其定位值本身可能包含分隔符
+    UNCHAINED_STRATEGIES = {'xpath'}
+    
+    # 通过ExtensionManager注册的自定义定位策略，定位值原样交给插件，不拆分链
+    CUSTOM_LOCATOR_STRATEGIES = set()
+    
+    # robocorp-windows定位器中组合条件的关键字，如 name:OK and type:Button
+    BOOLEAN_OPERATORS = {'and', 'or'}
+    
+    # 已解析定位器的缓存容量
+    COMPILED_CACHE_SIZE = 1024
+    
+    @classmethod
+    def compile(cls, locator):
+        """解析定位器，结果按定位器字符串缓存在有界的备忘录中
+        
+        Args:
+            locator: 定位器字符串或CompiledLocator
+            
+        Returns:
+            CompiledLocator: 已解析的定位器（无效定位器的is_valid为False）
+            
+        Raises:
+            TypeError: 定位器不是字符串时
+        """
+        if isinstance(locator, CompiledLocator):
+            return locator
+        if not isinstance(locator, str):
+            raise TypeError(f"Locator must be a string, got {type(locator).__name__}")
+        return _compile_locator(locator)
+    
+    @classmethod
+    def clear_compiled_cache(cls):
+        """清空已解析定位器的缓存，在支持的定位策略变化后调用"""
+        _compile_locator.cache_clear()
+    
+    @classmethod
+    def register_custom_strategy(cls, strategy):
+        """将自定义定位策略前缀加入有效前缀
+        
+        与内置策略同名的插件替换内置策略的单步定位器，前缀本身已经有效，不需要加入。
+        
+        Args:
+            strategy: 定位策略名称
+        """
+        if strategy not in cls.SUPPORTED_LOCATOR_STRATEGIES and strategy not in cls.CUSTOM_LOCATOR_STRATEGIES:
+            cls.CUSTOM_LOCATOR_STRATEGIES.add(strategy)
+            cls.clear_compiled_cache()
+    
+    @classmethod
+    def unregister_custom_strategy(cls, strategy):
+        """移除自定义定位策略前缀
+        
+        Args:
+            strategy: 定位策略名称
+        """
+        if strategy in cls.CUSTOM_LOCATOR_STRATEGIES:
+            cls.CUSTOM_LOCATOR_STRATEGIES.discard(strategy)
+            cls.clear_compiled_cache()
+    
+    @classmethod
+    def _parse_part(cls, text):
+        """解析链中的单个步骤
+        
+        Args:
+            text: 单个步骤的定位器字符串
+            
+        Returns:
+            LocatorPart: 解析后的定位步骤
+        """
+        text = text.strip()
+        if ':' not in text:
+            # 没有策略前缀，默认使用name策略
+            return LocatorPart('name', text, False)
+        strategy, value = text.split(':', 1)
+        strategy = strategy.strip()
+        if strategy in cls.UNCHAINED_STRATEGIES or strategy in cls.CUSTOM_LOCATOR_STRATEGIES:
+            return LocatorPart(strategy, value.strip(), True)
+        
+        # 同一步骤中以空格分隔的多个条件，如 name:OK class:Button
+        criteria = _criteria_splitter(frozenset(cls.SUPPORTED_LOCATOR_STRATEGIES)).split(text)
+        if len(criteria) == 1:
+            return LocatorPart(strategy, value.strip(), True)
+        parsed = []
+        for criterion in criteria:
+            if ':' not in criterion:
+                # 第一个条件没有策略前缀，如 Panel name:OK，默认使用name策略
+                parsed.append(LocatorPart('name', criterion.strip(), False))
+                continue
+            criterion_strategy, criterion_value = criterion.split(':', 1)
+            parsed.append(LocatorPart(criterion_strategy.strip(), criterion_value.strip(), True))
+        first = parsed[0]
+        first.extra = tuple(parsed[1:])
+        return first
+    
+    @classmethod
+    def _has_foreign_syntax(cls, step):
+        """检查步骤中是否包含无法解析为条件的robocorp-windows语法
+        
+        这类语法包括未知的条件前缀（如 ``type:Button``）和 ``and``/``or``。
+        拆分条件时只识别已知的策略前缀，这些语法会被并入前一个条件的定位值，
+        因此包含它们的定位器不能在内存中求值。
+        
+        Args:
+            step: 单个步骤的定位器字符串
+            
+        Returns:
+            bool: 是否包含无法解析的语法
+        """
+        # 引号内的定位值可以包含任意文本
+        unquoted = re.sub(r'"[^"]*"|\'[^\']*\'', ' ', step)
+        for token in unquoted.split():
+            if token in cls.BOOLEAN_OPERATORS:
+                return True
+            key, separator, _ = token.partition(':')
+            if separator and key and key not in cls.SUPPORTED_LOCATOR_STRATEGIES:
+                return True
+        return False
+    
+    @classmethod
+    def _compile(cls, locator):
+        """解析并验证定位器（不使用缓存）
+        
+        Args:
+            locator: 定位器字符串
+            
+        Returns:
+            CompiledLocator: 已解析的定位器
+        """
+        if not locator:
+            return CompiledLocator(locator, (), False, "Locator cannot be empty")
+        
+        if cls.ALTERNATIVE_SEPARATOR in locator:
+            alternatives = tuple(cls.compile(text.strip()) for text in locator.split(cls.ALTERNATIVE_SEPARATOR))
+            for alternative in alternatives:
+                if not alternative.is_valid:
+                    return CompiledLocator(locator, (), False, f"Invalid fallback alternative '{alternative.raw}': {alternative.message}")
+            strategies = ' || '.join(alternative.strategy for alternative in alternatives)
+            return CompiledLocator(locator, (), True, f"Valid fallback locator with strategies: {strategies}", alternatives)
+        
+        first = cls._parse_part(locator)
+        if (first.strategy in cls.UNCHAINED_STRATEGIES or first.strategy in cls.CUSTOM_LOCATOR_STRATEGIES
+                or cls.CHAIN_SEPARATOR not in locator):
+            steps = [locator]
+        else:
+            steps = locator.split(cls.CHAIN_SEPARATOR)
+        
+        parts = []
+        walkable = True
+        for step in steps:
+            if not step.strip():
+                return CompiledLocator(locator, tuple(parts), False, "Locator chain cannot contain an empty step")
+            part = cls._parse_part(step) if len(steps) > 1 else first
+            # 检查定位器是否包含支持的策略前缀
+            if part.strategy in cls.CUSTOM_LOCATOR_STRATEGIES and len(steps) > 1:
+                return CompiledLocator(locator, tuple(parts), False, f"Custom locator strategy cannot be used in a chain: {part.strategy}")
+            if (part.explicit and part.strategy not in cls.SUPPORTED_LOCATOR_STRATEGIES
+                    and part.strategy not in cls.CUSTOM_LOCATOR_STRATEGIES):
+                return CompiledLocator(locator, tuple(parts), False, f"Invalid locator strategy: {part.strategy}. Valid strategies: {', '.join(cls.get_supported_strategies())}")
+            for criterion in part.criteria:
+                if criterion.strategy == 'regex':
+                    try:
+                        criterion.regex = re.compile(criterion.match_value)
+                    except re.error as e:
+                        return CompiledLocator(locator, tuple(parts), False, f"Invalid regular expression in locator: {criterion.value} ({e})")
+            if part.strategy == 'xpath':
+                try:
+                    compile_xpath(part.value)
+                except XPathSyntaxError as e:
+                    return CompiledLocator(locator, tuple(parts), False, str(e))
+            elif part.strategy not in cls.CUSTOM_LOCATOR_STRATEGIES and cls._has_foreign_syntax(step):
+                walkable = False
+            parts.append(part)
+        
+        if len(parts) > 1:
+            message = f"Valid chained locator with strategies: {' > '.join(part.strategy for part in parts)}"
+        elif first.explicit:
+            message = f"Valid locator with strategy: {first.strategy}"
+        else:
+            message = "Valid locator (using default 'name' strategy)"
+        return CompiledLocator(locator, tuple(parts), True, message, walkable=walkable)
+    
     @classmethod
     def validate_locator(cls, locator):
         """验证定位器格式是否有效
         
         Args:
-            locator: 要验证的定位器字符串
+            locator: 要验证的定位器字符串或CompiledLocator
             
         Returns:
             tuple: (is_valid, message)
             - is_valid: 定位器是否有效
             - message: 验证结果消息
         """
-        if not isinstance(locator, str):
+        if not isinstance(locator, (str, CompiledLocator)):
             return False, f"Locator must be a string, got {type(locator).__name__}"
         
-        if not locator:
-            return False, "Locator cannot be empty"
-        
-        # 检查定位器是否包含支持的策略前缀
-        if locator.count(':') >= 1:
-            strategy = locator.split(':', 1)[0].strip()
-            if strategy in cls.SUPPORTED_LOCATOR_STRATEGIES:
-                return True, f"Valid locator with strategy: {strategy}"
-            else:
-                return False, f"Invalid locator strategy: {strategy}. Valid strategies: {', '.join(cls.SUPPORTED_LOCATOR_STRATEGIES)}"
-        else:
-            # 没有策略前缀，默认使用name策略
-            return True, "Valid locator (using default 'name' strategy)"
+        compiled = cls.compile(locator)
+        return compiled.is_valid, compiled.message
     
     @classmethod
     def validate_locator_format(cls, locator):
@@ -60,9 +352,29 @@ class LocatorUtils:
         """
         is_valid, message = cls.validate_locator(locator)
         if not is_valid:
-            raise ValueError(message + f". Valid locator formats: {', '.join([f'{strategy}:value' for strategy in cls.SUPPORTED_LOCATOR_STRATEGIES])}")
+            raise ValueError(message + f". Valid locator formats: {', '.join([f'{strategy}:value' for strategy in cls.get_supported_strategies()])}")
         return message
     
+    @classmethod
+    def compile_valid(cls, locator):
+        """解析定位器，并在无效时抛出异常
+        
+        Args:
+            locator: 定位器字符串或CompiledLocator
+            
+        Returns:
+            CompiledLocator: 已解析的有效定位器
+            
+        Raises:
+            ValueError: 定位器格式无效时
+        """
+        if isinstance(locator, (str, CompiledLocator)):
+            compiled = cls.compile(locator)
+            if compiled.is_valid:
+                return compiled
+        # 生成与validate_locator_format一致的错误消息
+        cls.validate_locator_format(locator)
+    
     @classmethod
     def get_locator_strategy(cls, locator):
         """获取定位器的策略
@@ -75,11 +387,9 @@ class LocatorUtils:
             - strategy: 定位策略
             - value: 定位值
         """
-        if ':' in locator:
-            strategy, value = locator.split(':', 1)
-            return strategy.strip(), value.strip()
-        # 默认使用name策略
-        return 'name', locator
+        compiled = cls.compile(locator)
+        part = compiled.parts[0] if compiled.parts else cls._parse_part(locator)
+        return part.strategy, part.value
     
     @classmethod
     def format_locator(cls, strategy, value):
@@ -92,7 +402,7 @@ class LocatorUtils:
         Returns:
             str: 格式化后的定位器
         """
-        if strategy not in cls.SUPPORTED_LOCATOR_STRATEGIES:
+        if strategy not in cls.SUPPORTED_LOCATOR_STRATEGIES and strategy not in cls.CUSTOM_LOCATOR_STRATEGIES:
             raise ValueError(f"Invalid locator strategy: {strategy}")
         return f"{strategy}:{value}"
     
@@ -101,9 +411,9 @@ class LocatorUtils:
         """获取支持的定位策略列表
         
         Returns:
-            list: 支持的定位策略列表
+            list: 支持的定位策略列表，包括已注册的自定义定位策略
         """
-        return sorted(list(cls.SUPPORTED_LOCATOR_STRATEGIES))
+        return sorted(cls.SUPPORTED_LOCATOR_STRATEGIES | cls.CUSTOM_LOCATOR_STRATEGIES)
     
     @classmethod
     def get_valid_locator_examples(cls):
@@ -124,5 +434,23 @@ class LocatorUtils:
         return examples
 
 
+@lru_cache(maxsize=8)
+def _criteria_splitter(strategies):
+    """构建拆分同一步骤中多个条件的正则表达式
+
+    Args:
+        strategies: 支持的定位策略集合（frozenset）
+
+    Returns:
+        Pattern: 在「空格 + 已知策略前缀」处拆分的正则表达式
+    """
+    alternatives = '|'.join(re.escape(strategy) for strategy in sorted(strategies, key=len, reverse=True))
+    return re.compile(rf'\s+(?=(?:{alternatives}):)')
+
+
+# 已解析定位器的有界缓存
+_compile_locator = lru_cache(maxsize=LocatorUtils.COMPILED_CACHE_SIZE)(LocatorUtils._compile)
+
+
 # 创建工具类实例，方便直接使用
 locator_utils = LocatorUtils()
\ No newline at end of file
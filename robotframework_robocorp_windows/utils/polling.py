@@ -0,0 +1,143 @@
+# robotframework_robocorp_windows/utils/polling.py
+
+"""
+轮询引擎，为查找循环提供自适应退避的等待策略，以及跨层传递的截止时间
+"""
+
+import asyncio
+import time
+
+
+class Deadline:
+    """截止时间，从关键字层经服务层传递到驱动层
+
+    各层使用剩余时间预算，而不是各自重新开始计时，避免嵌套超时循环叠加超时。
+    """
+
+    def __init__(self, timeout):
+        """初始化截止时间
+
+        Args:
+            timeout: 从现在开始的时间预算（秒）
+        """
+        self.timeout = max(timeout or 0, 0)
+        self.end_time = time.monotonic() + self.timeout
+
+    @classmethod
+    def coerce(cls, timeout):
+        """将超时时间或截止时间统一转换为Deadline
+
+        Args:
+            timeout: 超时时间（秒）或Deadline实例
+
+        Returns:
+            Deadline: 传入的Deadline实例本身，或按超时时间新建的实例
+        """
+        if isinstance(timeout, cls):
+            return timeout
+        return cls(timeout)
+
+    def remaining(self):
+        """获取剩余时间
+
+        Returns:
+            float: 剩余时间（秒），已过期时为0
+        """
+        return max(self.end_time - time.monotonic(), 0)
+
+    def expired(self):
+        """检查是否已过期
+
+        Returns:
+            bool: 是否已过期
+        """
+        return time.monotonic() >= self.end_time
+
+    def __repr__(self):
+        return f"Deadline(timeout={self.timeout}, remaining={self.remaining():.3f})"
+
+
+class Poller:
+    """自适应退避轮询器
+
+    轮询策略：
+    - 首次探测失败后从很短的间隔开始等待，之后按倍数增长
+    - 等待间隔最大不超过max_interval（通常为库的retry_interval）
+    - 最后一次等待截断到剩余时间，超时前会再探测一次，不会超出超时时间
+
+    轮询器本身不保存轮询状态，可以在多个服务和线程之间共享。
+    """
+
+    def __init__(self, initial_interval=0.005, backoff_factor=2.0, max_interval=0.5):
+        """初始化轮询器
+
+        Args:
+            initial_interval: 首次等待间隔（秒）
+            backoff_factor: 每次等待后间隔的增长倍数
+            max_interval: 最大等待间隔（秒）
+
+        Raises:
+            ValueError: 参数无效时
+        """
+        if initial_interval <= 0:
+            raise ValueError(f"initial_interval must be positive, got {initial_interval}")
+        if backoff_factor < 1:
+            raise ValueError(f"backoff_factor must be at least 1, got {backoff_factor}")
+        self.initial_interval = initial_interval
+        self.backoff_factor = backoff_factor
+        self.max_interval = max(max_interval, initial_interval)
+
+    def intervals(self):
+        """生成等待间隔序列
+
+        Yields:
+            float: 下一次等待的间隔（秒）
+        """
+        interval = self.initial_interval
+        while True:
+            yield interval
+            interval = min(interval * self.backoff_factor, self.max_interval)
+
+    def poll(self, probe, timeout):
+        """反复调用探测函数，直到返回真值或超时
+
+        探测函数至少会被调用一次，即使timeout为0。
+
+        Args:
+            probe: 无参可调用对象，条件满足时返回真值
+            timeout: 超时时间（秒）或Deadline实例
+
+        Returns:
+            探测函数返回的真值结果，超时返回None
+        """
+        deadline = Deadline.coerce(timeout)
+        intervals = self.intervals()
+        while True:
+            result = probe()
+            if result:
+                return result
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return None
+            time.sleep(min(next(intervals), remaining))
+
+    async def poll_async(self, probe, timeout):
+        """poll的asyncio版本，等待间隔交还给事件循环，不占用线程
+
+        Args:
+            probe: 无参协程函数，条件满足时返回真值
+            timeout: 超时时间（秒）或Deadline实例
+
+        Returns:
+            探测函数返回的真值结果，超时返回None
+        """
+        deadline = Deadline.coerce(timeout)
+        intervals = self.intervals()
+        while True:
+            result = await probe()
+            if result:
+                return result
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(next(intervals), remaining))
@@ -0,0 +1,249 @@
+# robotframework_robocorp_windows/utils/task_registry.py
+
+"""
+异步任务注册表，为线程池任务分配单调递增的任务ID，并限制未完成任务数量和已完成结果的保留时间
+"""
+
+import itertools
+from collections import deque
+import threading
+import time
+from .exceptions import AsyncOperationException
+
+
+class AsyncTask:
+    """注册表中的一个异步任务"""
+
+    __slots__ = ('task_id', 'future', 'description', 'submitted_at', 'finished_at')
+
+    def __init__(self, task_id, future, description):
+        """初始化任务记录
+
+        Args:
+            task_id: 任务ID
+            future: 线程池返回的Future
+            description: 任务描述，用于状态查询和日志
+        """
+        self.task_id = task_id
+        self.future = future
+        self.description = description
+        self.submitted_at = time.monotonic()
+        self.finished_at = None
+
+    @property
+    def state(self):
+        """任务状态：pending、running、cancelled、failed或done"""
+        future = self.future
+        if future.cancelled():
+            return 'cancelled'
+        if not future.done():
+            return 'running' if future.running() else 'pending'
+        return 'failed' if future.exception() is not None else 'done'
+
+
+class AsyncTaskRegistry:
+    """异步任务注册表
+
+    注册表策略：
+    - 任务ID由单调递增的计数器生成，不会像id(future)那样在对象回收后被复用
+    - 未完成的任务达到max_pending时，提交新任务会等待有任务完成（背压），等待超时则提交失败
+    - 已完成但从未被取走结果的任务在result_ttl秒后清理，每次提交和查询时顺带清理；
+      完成的任务按完成时间进入队列，清理时只从队首弹出过期的任务，开销与保留的任务数量无关
+    - 所有读写操作加锁，任务完成回调在工作线程上执行
+    """
+
+    def __init__(self, max_pending=100, result_ttl=300):
+        """初始化任务注册表
+
+        Args:
+            max_pending: 未完成任务的最大数量
+            result_ttl: 已完成任务的结果保留时间（秒），为None或0时不自动清理
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._tasks = {}  # 任务ID -> AsyncTask，按提交顺序排列
+        self._finished = deque()  # (完成时间, 任务ID)，按完成时间排列
+        self._ids = itertools.count(1)
+        self._pending = 0
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._tasks)
+
+    @property
+    def pending_count(self):
+        """未完成的任务数量"""
+        with self._condition:
+            return self._pending
+
+    def submit(self, executor, fn, description=None, timeout=None):
+        """向线程池提交任务并注册
+
+        Args:
+            executor: 线程池
+            fn: 无参可调用对象
+            description: 任务描述
+            timeout: 未完成任务已满时等待空位的最长时间（秒），为None时一直等待
+
+        Returns:
+            int: 任务ID
+
+        Raises:
+            AsyncOperationException: 等待空位超时时
+        """
+        with self._condition:
+            self._cleanup()
+            if not self._condition.wait_for(lambda: self._pending < self.max_pending, timeout):
+                raise AsyncOperationException(
+                    f"Too many pending async tasks ({self._pending}/{self.max_pending}), "
+                    f"no task finished within {timeout} seconds")
+            task = AsyncTask(next(self._ids), executor.submit(fn), description)
+            self._tasks[task.task_id] = task
+            self._pending += 1
+        task.future.add_done_callback(lambda _: self._on_done(task))
+        return task.task_id
+
+    def get(self, task_id):
+        """获取任务记录
+
+        Args:
+            task_id: 任务ID（整数或数字字符串）
+
+        Returns:
+            AsyncTask: 任务记录
+
+        Raises:
+            ValueError: 任务不存在或已被清理时
+        """
+        task_id = self._normalize(task_id)
+        with self._condition:
+            self._cleanup()
+            task = self._tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"Task with ID {task_id} not found")
+        return task
+
+    def result(self, task_id, timeout=None):
+        """等待任务完成并取走结果，取走后任务从注册表中移除
+
+        Args:
+            task_id: 任务ID
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            Any: 任务的返回值
+
+        Raises:
+            ValueError: 任务不存在时
+            TimeoutError: 任务在超时时间内未完成时，任务保留在注册表中
+            Exception: 任务抛出的异常或CancelledError
+        """
+        task = self.get(task_id)
+        try:
+            return task.future.result(timeout=timeout)
+        finally:
+            if task.future.done():
+                self.remove(task.task_id)
+
+    def cancel(self, task_id):
+        """取消尚未开始的任务
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            bool: 是否已取消，任务已开始或已完成时返回False
+        """
+        task = self.get(task_id)
+        cancelled = task.future.cancel()
+        if cancelled:
+            self.remove(task.task_id)
+        return cancelled
+
+    def status(self, task_id):
+        """获取任务状态
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            dict: task_id、state、description、elapsed（秒），失败时还包含error
+        """
+        task = self.get(task_id)
+        state = task.state
+        end = task.finished_at if task.finished_at is not None else time.monotonic()
+        status = {
+            'task_id': task.task_id,
+            'state': state,
+            'description': task.description,
+            'elapsed': round(end - task.submitted_at, 3)
+        }
+        if state == 'failed':
+            status['error'] = str(task.future.exception())
+        return status
+
+    def remove(self, task_id):
+        """从注册表中移除任务，不影响任务本身的执行
+
+        Args:
+            task_id: 任务ID
+        """
+        with self._condition:
+            self._tasks.pop(self._normalize(task_id), None)
+
+    def cleanup(self):
+        """清理超过保留时间的已完成任务
+
+        Returns:
+            int: 清理的任务数量
+        """
+        with self._condition:
+            return self._cleanup()
+
+    def clear(self):
+        """清空注册表"""
+        with self._condition:
+            self._tasks.clear()
+            self._finished.clear()
+
+    def _cleanup(self):
+        """清理超过保留时间的已完成任务（调用方持有锁）"""
+        if not self.result_ttl:
+            return 0
+        expire_before = time.monotonic() - self.result_ttl
+        finished = self._finished
+        count = 0
+        while finished and finished[0][0] < expire_before:
+            _, task_id = finished.popleft()
+            # 结果已被取走或已取消的任务不在注册表中
+            if self._tasks.pop(task_id, None) is not None:
+                count += 1
+        return count
+
+    def _on_done(self, task):
+        """任务完成回调，记录完成时间并唤醒等待空位的提交者
+
+        Args:
+            task: AsyncTask
+        """
+        with self._condition:
+            task.finished_at = time.monotonic()
+            if self.result_ttl:
+                self._finished.append((task.finished_at, task.task_id))
+            self._pending -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _normalize(task_id):
+        """将任务ID统一为整数
+
+        Raises:
+            ValueError: 任务ID不是整数时
+        """
+        try:
+            return int(task_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Task with ID {task_id} not found")
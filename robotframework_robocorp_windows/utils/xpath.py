@@ -0,0 +1,508 @@
+# robotframework_robocorp_windows/utils/xpath.py
+
+"""
+XPath子集求值引擎，用于 xpath: 定位策略
+
+支持的语法：
+- 路径：``/``、``//``、``.``、``..``、``|`` 合并多个路径
+- 轴：child、descendant、descendant-or-self、self、parent、ancestor、ancestor-or-self、
+  following-sibling、preceding-sibling
+- 节点测试：``*``、``node()``、控件类型（``Button`` 同时匹配 ``Button`` 和 ``ButtonControl``）
+- 谓词：位置 ``[2]``、``[last()]``、``[position() < 3]``，属性比较 ``[@Name='OK']``，
+  ``and``/``or``/``not()``，``contains()``、``starts-with()``
+- 属性：Name、AutomationId（id）、ClassName（class）、ControlType，以及left/top/right/bottom/width/height
+
+反向轴（parent、ancestor、preceding-sibling）上的位置从离上下文节点最近的节点开始计数。
+表达式以窗口为上下文节点求值，``/`` 与 ``//`` 开头的路径同样从窗口开始，结果不包含窗口本身。
+编译后的表达式按字符串缓存。求值通过树适配器访问元素，适配器提供索引时，
+``//`` 步骤上的属性相等条件会直接从索引取候选节点，而不是枚举所有后代。
+
+树适配器需要提供：
+- root: 上下文节点（窗口）
+- children(node) / parent(node): 子节点列表（文档顺序）和父节点（根节点为None）
+- get(node, attribute): 读取ATTRIBUTES中的属性
+- order(node): 文档顺序的排序键
+- lookup(attribute, value): 按属性值取节点（文档顺序），不支持索引时返回None
+"""
+
+import re
+from functools import lru_cache
+
+
+# 属性名（小写） -> 适配器属性名
+ATTRIBUTES = {
+    'name': 'name',
+    'automationid': 'automation_id',
+    'id': 'automation_id',
+    'classname': 'class_name',
+    'class': 'class_name',
+    'controltype': 'control_type',
+    'left': 'left',
+    'x': 'left',
+    'top': 'top',
+    'y': 'top',
+    'right': 'right',
+    'bottom': 'bottom',
+    'width': 'width',
+    'height': 'height'
+}
+
+# 适配器可以建立索引的属性
+INDEXABLE_ATTRIBUTES = {'name', 'automation_id', 'class_name'}
+
+AXES = {
+    'child', 'descendant', 'descendant-or-self', 'self', 'parent',
+    'ancestor', 'ancestor-or-self', 'following-sibling', 'preceding-sibling'
+}
+
+FUNCTIONS = {'contains': 2, 'starts-with': 2, 'not': 1, 'last': 0, 'position': 0}
+
+_TOKEN_PATTERN = re.compile(r"""\s*(?:
+    (?P<string>'[^']*'|"[^"]*")
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<op>//|/|::|\.\.|\.|\[|\]|\(|\)|@|,|!=|<=|>=|=|<|>|\*|\|)
+  | (?P<name>[A-Za-z_][\w-]*)
+)""", re.VERBOSE)
+
+
+class XPathSyntaxError(ValueError):
+    """XPath表达式语法错误或使用了不支持的语法"""
+    pass
+
+
+class Step:
+    """路径中的一个步骤"""
+
+    __slots__ = ('axis', 'node_test', 'predicates', 'descendant', 'index_lookup')
+
+    def __init__(self, axis, node_test, predicates, descendant):
+        """初始化步骤
+
+        Args:
+            axis: 轴名
+            node_test: 节点测试，``*`` 表示任意节点
+            predicates: 谓词表达式列表
+            descendant: 步骤前是否为 ``//``（先取上下文节点的所有后代及自身再应用本步骤）
+        """
+        self.axis = axis
+        self.node_test = node_test
+        self.predicates = predicates
+        self.descendant = descendant
+        self.index_lookup = self._find_index_lookup()
+
+    def _find_index_lookup(self):
+        """找出可以下推到索引的属性相等条件
+
+        只有 ``//X`` 或 descendant 轴、且谓词都与位置无关时才能下推，
+        此时结果等于「上下文节点的后代中满足条件的节点」，与兄弟节点的位置无关。
+
+        Returns:
+            tuple: (属性名, 值)，无法下推时为None
+        """
+        if not ((self.descendant and self.axis == 'child') or (not self.descendant and self.axis == 'descendant')):
+            return None
+        if any(_is_positional(predicate) for predicate in self.predicates):
+            return None
+        for predicate in self.predicates:
+            for conjunct in _conjuncts(predicate):
+                if conjunct[0] == 'cmp' and conjunct[1] == '=':
+                    left, right = conjunct[2], conjunct[3]
+                    if right[0] == 'attr':
+                        left, right = right, left
+                    if left[0] == 'attr' and right[0] == 'str' and left[1] in INDEXABLE_ATTRIBUTES:
+                        return left[1], right[1]
+        return None
+
+
+class XPathExpression:
+    """已编译的XPath表达式"""
+
+    def __init__(self, source, paths):
+        """初始化表达式
+
+        Args:
+            source: 表达式字符串
+            paths: 路径列表（``|`` 合并），每个路径为Step列表
+        """
+        self.source = source
+        self.paths = paths
+
+    def select(self, tree):
+        """在元素树上求值
+
+        Args:
+            tree: 树适配器
+
+        Returns:
+            list: 匹配的节点，按文档顺序排列且不重复
+        """
+        results = []
+        for steps in self.paths:
+            context = [tree.root]
+            for step in steps:
+                context = _evaluate_step(tree, step, context)
+                if not context:
+                    break
+            results.extend(context)
+        if len(self.paths) > 1:
+            results = _document_order(tree, results)
+        return [node for node in results if node != tree.root]
+
+    def __repr__(self):
+        return f"XPathExpression({self.source!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_xpath(source):
+    """编译XPath表达式，结果按表达式字符串缓存
+
+    Args:
+        source: XPath表达式
+
+    Returns:
+        XPathExpression: 已编译的表达式
+
+    Raises:
+        XPathSyntaxError: 表达式无效或使用了不支持的语法时
+    """
+    return _Parser(source).parse()
+
+
+def _tokenize(source):
+    """将表达式拆分为 (类型, 值) 列表"""
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN_PATTERN.match(source, position)
+        if not match or match.end() == position:
+            raise XPathSyntaxError(f"Invalid XPath expression: unexpected character at {position}: {source!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1]
+        elif kind == 'number':
+            value = float(value)
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """递归下降解析器"""
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.position = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise XPathSyntaxError("Invalid XPath expression: expression is empty")
+        paths = [self._parse_path()]
+        while self._accept('op', '|'):
+            paths.append(self._parse_path())
+        if self.position != len(self.tokens):
+            self._fail(f"unexpected {self.tokens[self.position][1]!r}")
+        return XPathExpression(self.source, paths)
+
+    def _peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _accept(self, kind, value=None):
+        token_kind, token_value = self._peek()
+        if token_kind == kind and (value is None or token_value == value):
+            self.position += 1
+            return token_value if value is None else True
+        return None
+
+    def _expect(self, kind, value=None):
+        result = self._accept(kind, value)
+        if result is None:
+            self._fail(f"expected {value or kind}")
+        return result
+
+    def _fail(self, message):
+        raise XPathSyntaxError(f"Invalid XPath expression {self.source!r}: {message}")
+
+    def _parse_path(self):
+        steps = []
+        descendant = bool(self._accept('op', '//'))
+        if not descendant:
+            self._accept('op', '/')
+        steps.append(self._parse_step(descendant))
+        while True:
+            if self._accept('op', '//'):
+                steps.append(self._parse_step(True))
+            elif self._accept('op', '/'):
+                steps.append(self._parse_step(False))
+            else:
+                return steps
+
+    def _parse_step(self, descendant):
+        if self._accept('op', '..'):
+            return Step('parent', '*', [], descendant)
+        if self._accept('op', '.'):
+            return Step('self', '*', [], descendant)
+        if self._peek() == ('op', '@'):
+            self._fail("attribute steps are not supported, use a predicate such as [@Name='OK']")
+        axis = 'child'
+        if self._peek()[0] == 'name' and self._peek(1) == ('op', '::'):
+            axis = self._accept('name')
+            self.position += 1
+            if axis not in AXES:
+                self._fail(f"unsupported axis {axis!r}")
+        if self._accept('op', '*'):
+            node_test = '*'
+        else:
+            node_test = self._expect('name')
+            if self._accept('op', '('):
+                if node_test != 'node':
+                    self._fail(f"unsupported node test {node_test}()")
+                self._expect('op', ')')
+                node_test = '*'
+        predicates = []
+        while self._accept('op', '['):
+            predicates.append(self._parse_or())
+            self._expect('op', ']')
+        return Step(axis, node_test, predicates, descendant)
+
+    def _parse_or(self):
+        expression = self._parse_and()
+        while self._accept('name', 'or'):
+            expression = ('or', expression, self._parse_and())
+        return expression
+
+    def _parse_and(self):
+        expression = self._parse_comparison()
+        while self._accept('name', 'and'):
+            expression = ('and', expression, self._parse_comparison())
+        return expression
+
+    def _parse_comparison(self):
+        expression = self._parse_value()
+        for operator in ('=', '!=', '<=', '>=', '<', '>'):
+            if self._accept('op', operator):
+                return ('cmp', operator, expression, self._parse_value())
+        return expression
+
+    def _parse_value(self):
+        kind, value = self._peek()
+        if kind == 'string':
+            self.position += 1
+            return ('str', value)
+        if kind == 'number':
+            self.position += 1
+            return ('num', value)
+        if self._accept('op', '@'):
+            name = self._expect('name')
+            attribute = ATTRIBUTES.get(name.lower())
+            if attribute is None:
+                self._fail(f"unsupported attribute @{name}. Supported attributes: Name, AutomationId, ClassName, ControlType, left, top, right, bottom, width, height")
+            return ('attr', attribute)
+        if self._accept('op', '('):
+            expression = self._parse_or()
+            self._expect('op', ')')
+            return expression
+        if kind == 'name' and self._peek(1) == ('op', '('):
+            self.position += 2
+            if value not in FUNCTIONS:
+                self._fail(f"unsupported function {value}()")
+            arguments = []
+            if not self._accept('op', ')'):
+                arguments.append(self._parse_or())
+                while self._accept('op', ','):
+                    arguments.append(self._parse_or())
+                self._expect('op', ')')
+            if len(arguments) != FUNCTIONS[value]:
+                self._fail(f"{value}() takes {FUNCTIONS[value]} argument(s)")
+            return ('call', value, tuple(arguments))
+        self._fail(f"unexpected {value!r}" if kind else "unexpected end of expression")
+
+
+def _is_positional(expression):
+    """检查谓词是否依赖节点位置（数字谓词、position()、last()）"""
+    if expression[0] == 'num':
+        return True
+    if expression[0] == 'call':
+        return expression[1] in ('position', 'last') or any(_is_positional(argument) for argument in expression[2])
+    if expression[0] in ('and', 'or'):
+        return _is_positional(expression[1]) or _is_positional(expression[2])
+    if expression[0] == 'cmp':
+        return _is_positional(expression[2]) or _is_positional(expression[3])
+    return False
+
+
+def _conjuncts(expression):
+    """展开顶层的and条件"""
+    if expression[0] == 'and':
+        return _conjuncts(expression[1]) + _conjuncts(expression[2])
+    return [expression]
+
+
+def _document_order(tree, nodes):
+    """去重并按文档顺序排序"""
+    unique = {tree.order(node): node for node in nodes}
+    return [unique[key] for key in sorted(unique)]
+
+
+def _axis_nodes(tree, node, axis):
+    """获取节点在指定轴上的节点，反向轴按离节点由近到远排列"""
+    if axis == 'child':
+        return list(tree.children(node))
+    if axis == 'self':
+        return [node]
+    if axis in ('descendant', 'descendant-or-self'):
+        result = [node] if axis == 'descendant-or-self' else []
+        stack = list(reversed(tree.children(node)))
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(reversed(tree.children(current)))
+        return result
+    parent = tree.parent(node)
+    if axis == 'parent':
+        return [] if parent is None else [parent]
+    if axis in ('ancestor', 'ancestor-or-self'):
+        result = [node] if axis == 'ancestor-or-self' else []
+        while parent is not None:
+            result.append(parent)
+            parent = tree.parent(parent)
+        return result
+    if parent is None:
+        return []
+    siblings = list(tree.children(parent))
+    position = next(index for index, sibling in enumerate(siblings) if sibling == node)
+    if axis == 'following-sibling':
+        return siblings[position + 1:]
+    return siblings[:position][::-1]
+
+
+def _matches_node_test(tree, node, node_test):
+    if node_test == '*':
+        return True
+    control_type = tree.get(node, 'control_type') or ''
+    return control_type == node_test or control_type == node_test + 'Control'
+
+
+def _evaluate_step(tree, step, context):
+    """对上下文节点集合求值一个步骤
+
+    Returns:
+        list: 结果节点，按文档顺序排列且不重复
+    """
+    if step.index_lookup is not None:
+        candidates = tree.lookup(*step.index_lookup)
+        if candidates is not None:
+            context_set = set(context)
+            result = []
+            for node in candidates:
+                if not _matches_node_test(tree, node, step.node_test):
+                    continue
+                if not all(_truthy(_evaluate(tree, predicate, node, 1, 1)) for predicate in step.predicates):
+                    continue
+                if _has_ancestor_in(tree, node, context_set):
+                    result.append(node)
+            return result
+
+    if step.descendant:
+        origins = []
+        for node in context:
+            origins.extend(_axis_nodes(tree, node, 'descendant-or-self'))
+        origins = _document_order(tree, origins)
+    else:
+        origins = context
+
+    result = []
+    for origin in origins:
+        nodes = [node for node in _axis_nodes(tree, origin, step.axis) if _matches_node_test(tree, node, step.node_test)]
+        for predicate in step.predicates:
+            size = len(nodes)
+            nodes = [node for position, node in enumerate(nodes, 1)
+                     if _predicate_matches(tree, predicate, node, position, size)]
+        result.extend(nodes)
+    return _document_order(tree, result)
+
+
+def _has_ancestor_in(tree, node, nodes):
+    """检查节点是否为集合中某个节点的后代（不含自身）"""
+    parent = tree.parent(node)
+    while parent is not None:
+        if parent in nodes:
+            return True
+        parent = tree.parent(parent)
+    return False
+
+
+def _predicate_matches(tree, predicate, node, position, size):
+    value = _evaluate(tree, predicate, node, position, size)
+    if isinstance(value, float):
+        return value == position
+    return _truthy(value)
+
+
+def _truthy(value):
+    if isinstance(value, float):
+        return value != 0
+    return bool(value)
+
+
+def _evaluate(tree, expression, node, position, size):
+    """对谓词表达式求值"""
+    kind = expression[0]
+    if kind == 'str':
+        return expression[1]
+    if kind == 'num':
+        return expression[1]
+    if kind == 'attr':
+        value = tree.get(node, expression[1])
+        return '' if value is None else value
+    if kind == 'and':
+        return (_truthy(_evaluate(tree, expression[1], node, position, size))
+                and _truthy(_evaluate(tree, expression[2], node, position, size)))
+    if kind == 'or':
+        return (_truthy(_evaluate(tree, expression[1], node, position, size))
+                or _truthy(_evaluate(tree, expression[2], node, position, size)))
+    if kind == 'cmp':
+        return _compare(expression[1],
+                        _evaluate(tree, expression[2], node, position, size),
+                        _evaluate(tree, expression[3], node, position, size))
+    name, arguments = expression[1], expression[2]
+    if name == 'position':
+        return float(position)
+    if name == 'last':
+        return float(size)
+    values = [_evaluate(tree, argument, node, position, size) for argument in arguments]
+    if name == 'not':
+        return not _truthy(values[0])
+    if name == 'contains':
+        return _to_string(values[1]) in _to_string(values[0])
+    return _to_string(values[0]).startswith(_to_string(values[1]))
+
+
+def _compare(operator, left, right):
+    if operator in ('=', '!=') and not (isinstance(left, (int, float)) or isinstance(right, (int, float))):
+        equal = _to_string(left) == _to_string(right)
+        return equal if operator == '=' else not equal
+    try:
+        left, right = float(left), float(right)
+    except (TypeError, ValueError):
+        return False
+    if operator == '=':
+        return left == right
+    if operator == '!=':
+        return left != right
+    if operator == '<':
+        return left < right
+    if operator == '>':
+        return left > right
+    if operator == '<=':
+        return left <= right
+    return left >= right
+
+
+def _to_string(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
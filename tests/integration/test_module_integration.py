@@ -10,6 +10,25 @@ from robotframework_robocorp_windows.library import RobocorpWindows
 from robotframework_robocorp_windows.services.window_service import WindowService
 from robotframework_robocorp_windows.services.control_service import ControlService
 from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
+from robotframework_robocorp_windows.utils import com_apartment
+from robotframework_robocorp_windows.utils.com_apartment import ComApartment
+
+
+class FakeApartment(ComApartment):
+    """不调用COM的套间实现，使异步工作线程在没有comtypes的环境中也能运行"""
+
+    def initialize(self):
+        pass
+
+    def uninitialize(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_com_apartment():
+    """库创建的异步线程池使用FakeApartment"""
+    with patch.object(com_apartment, 'ComApartment', FakeApartment):
+        yield
 
 
 class TestModuleIntegration:
@@ -83,8 +102,8 @@ class TestModuleIntegration:
         window_service = WindowService()
         
         # 模拟驱动层
-        with patch.object(window_service.driver, 'launch_application', return_value="test_app.exe"):
-            with patch.object(window_service.driver, 'find_window_by_executable', return_value=MagicMock()):
+        with patch.object(window_service.driver, 'launch_application', return_value=MagicMock(pid=1234, **{'poll.return_value': None})):
+            with patch.object(window_service.registry, 'lookup', return_value=[MagicMock()]):
                 # 调用服务方法
                 executable_name, window = window_service.launch_application("test_app.exe")
                 
@@ -116,6 +135,35 @@ class TestModuleIntegration:
             assert mock_find_control.call_count == 1  # 调用次数不变，说明使用了缓存
             assert control1 == control2
     
+    def test_shared_service_layer(self):
+        """测试所有关键字模块共享同一个驱动、缓存和服务层"""
+        lib = RobocorpWindows()
+        
+        assert lib.control_operations.control_service is lib.control_service
+        assert lib.async_control_operations.control_service is lib.control_service
+        assert lib.window_management.window_service is lib.window_service
+        assert lib.control_service.driver is lib.driver
+        assert lib.window_service.driver is lib.driver
+        assert lib.control_service.control_cache is lib.control_cache
+    
+    def test_shared_cache_between_sync_and_async(self):
+        """测试同步关键字查找的控件可被异步关键字从缓存中命中"""
+        lib = RobocorpWindows()
+        
+        mock_window = MagicMock()
+        mock_window.handle = 12345
+        mock_control = MagicMock()
+        lib.current_window = mock_window
+        
+        with patch.object(lib.driver, 'find_control', return_value=mock_control) as mock_find_control:
+            lib.control_operations.find_control("name:OK")
+            task_id = lib.async_control_operations.async_click_control("name:OK")
+            lib.async_control_operations.wait_for_async_task(task_id)
+            
+            # 异步点击命中了同步查找写入的缓存
+            assert mock_find_control.call_count == 1
+            mock_control.click.assert_called_once()
+    
     def test_async_operations_integration(self):
         """测试异步操作的集成"""
         # 创建库实例
@@ -9,6 +9,25 @@ import pytest
 from unittest.mock import MagicMock, patch
 from robotframework_robocorp_windows.library import RobocorpWindows
 from robotframework_robocorp_windows.services.control_service import ControlService
+from robotframework_robocorp_windows.utils import com_apartment
+from robotframework_robocorp_windows.utils.com_apartment import ComApartment
+
+
+class FakeApartment(ComApartment):
+    """不调用COM的套间实现，使异步工作线程在没有comtypes的环境中也能运行"""
+
+    def initialize(self):
+        pass
+
+    def uninitialize(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_com_apartment():
+    """库创建的异步线程池使用FakeApartment"""
+    with patch.object(com_apartment, 'ComApartment', FakeApartment):
+        yield
 
 
 class TestPerformance:
@@ -0,0 +1,145 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.services.async_control_service import AsyncControlService
+from robotframework_robocorp_windows.services.control_service import ControlService
+from robotframework_robocorp_windows.utils.cache import ControlCache
+from robotframework_robocorp_windows.utils.exceptions import ControlNotFoundError
+from robotframework_robocorp_windows.utils.polling import Poller
+
+
+class FakeDriver:
+    """Driver whose controls appear and disappear on a schedule"""
+
+    def __init__(self):
+        self.controls = {}  # locator string -> (appear_at, control)
+        self.threads = set()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def set_logger(self, logger):
+        pass
+
+    def show(self, locator, delay=0.0):
+        control = Mock(name=locator)
+        self.controls[locator] = (time.monotonic() + delay, control)
+        return control
+
+    def hide(self, locator):
+        self.controls.pop(locator, None)
+
+    def find_control(self, window, locator, timeout):
+        with self.lock:
+            self.calls += 1
+            self.threads.add(threading.get_ident())
+        appear_at, control = self.controls.get(str(locator), (None, None))
+        if appear_at is None or time.monotonic() < appear_at:
+            raise ControlNotFoundError(f"Control not found with identifier: {locator}")
+        return control
+
+    def get_control_fingerprint(self, control):
+        return id(control)
+
+
+class TestAsyncControlService(unittest.TestCase):
+    """Test the asyncio API bridged to a worker pool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.driver = FakeDriver()
+        poller = Poller(initial_interval=0.001, max_interval=0.01)
+        cache = ControlCache(negative_expire_time=60)
+        self.control_service = ControlService(self.driver, cache, poller)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.service = AsyncControlService(self.control_service, executor=self.executor)
+        self.window = Mock()
+
+    def tearDown(self):
+        """Stop the worker pool"""
+        self.executor.shutdown(wait=True)
+
+    def test_concurrent_waits_share_a_small_pool(self):
+        """Test that many concurrent waits finish together on two worker threads"""
+        controls = [self.driver.show(f"name:Item{i}", delay=0.05) for i in range(20)]
+
+        async def wait_all():
+            return await asyncio.gather(*[self.service.wait_for(self.window, f"name:Item{i}", timeout=5)
+                                          for i in range(20)])
+
+        start = time.monotonic()
+        found = asyncio.run(wait_all())
+
+        self.assertEqual(found, controls)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertLessEqual(len(self.driver.threads), 2)
+
+    def test_found_controls_are_shared_with_sync_service(self):
+        """Test that async finds populate the cache used by the sync service"""
+        control = self.driver.show("name:OK")
+        self.assertIs(asyncio.run(self.service.find_control(self.window, "name:OK", timeout=1)), control)
+        calls = self.driver.calls
+
+        self.assertIs(self.control_service.find_control(self.window, "name:OK", timeout=0), control)
+        self.assertEqual(self.driver.calls, calls)
+
+    def test_timeout_records_negative_result_until_action(self):
+        """Test that a missing control is remembered and actions clear the negative cache"""
+        with self.assertRaises(ControlNotFoundError):
+            asyncio.run(self.service.find_control(self.window, "name:Missing", timeout=0.02))
+
+        self.driver.show("name:Missing")
+        with self.assertRaises(ControlNotFoundError) as context:
+            asyncio.run(self.service.find_control(self.window, "name:Missing", timeout=1))
+        self.assertIn("cached negative result", str(context.exception))
+
+        button = self.driver.show("name:Apply")
+        asyncio.run(self.service.click(self.window, "name:Apply", timeout=1))
+        button.click.assert_called_once_with()
+        self.assertIsNotNone(asyncio.run(self.service.find_control(self.window, "name:Missing", timeout=0)))
+
+    def test_type_and_wait_for_absent(self):
+        """Test typing into a control and waiting for a control to disappear"""
+        edit = self.driver.show("class:Edit")
+        self.driver.show("name:Progress")
+
+        async def scenario():
+            await self.service.type(self.window, "class:Edit", "hello", timeout=1)
+            asyncio.get_running_loop().call_later(0.05, self.driver.hide, "name:Progress")
+            return await self.service.wait_for(self.window, "name:Progress", timeout=5, state='absent')
+
+        self.assertTrue(asyncio.run(scenario()))
+        edit.type.assert_called_once_with("hello")
+
+        with self.assertRaises(AssertionError):
+            asyncio.run(self.service.wait_for(self.window, "class:Edit", timeout=0.02, state='absent'))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.wait_for(self.window, "class:Edit", state='visible'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.utils.cache import ControlCache
+
+class TestControlCache(unittest.TestCase):
+    """Unit tests for ControlCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cache = ControlCache(default_expire_time=10, max_size=3)
+        self.window = Mock()
+        self.window.handle = 1001
+        self.other_window = Mock()
+        self.other_window.handle = 1002
+
+    def test_set_and_get(self):
+        """Test that a stored control is returned from cache"""
+        control = Mock()
+        self.cache.set(self.window, "name:OK", control)
+
+        cached, is_cached = self.cache.get(self.window, "name:OK")
+        self.assertTrue(is_cached)
+        self.assertIs(cached, control)
+
+    def test_get_missing(self):
+        """Test that a missing key is reported as not cached"""
+        cached, is_cached = self.cache.get(self.window, "name:Missing")
+        self.assertFalse(is_cached)
+        self.assertIsNone(cached)
+
+    def test_keys_are_tuples(self):
+        """Test that cache keys are (window_handle, locator) tuples"""
+        self.cache.set(self.window, "name:OK", Mock())
+        self.assertIn((1001, "name:OK"), self.cache.cache)
+
+    def test_expired_entry_is_removed(self):
+        """Test that expired entries are dropped on access"""
+        with patch('robotframework_robocorp_windows.utils.cache.time.time', return_value=100.0):
+            self.cache.set(self.window, "name:OK", Mock(), expire_time=1)
+        with patch('robotframework_robocorp_windows.utils.cache.time.time', return_value=102.0):
+            _, is_cached = self.cache.get(self.window, "name:OK")
+        self.assertFalse(is_cached)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache._window_index, {})
+
+    def test_lru_eviction_keeps_recently_used(self):
+        """Test that a hit moves the entry to the end so hot controls survive eviction"""
+        self.cache.set(self.window, "name:A", Mock())
+        self.cache.set(self.window, "name:B", Mock())
+        self.cache.set(self.window, "name:C", Mock())
+
+        # Touch A so B becomes the least recently used entry
+        self.cache.get(self.window, "name:A")
+        self.cache.set(self.window, "name:D", Mock())
+
+        self.assertTrue(self.cache.get(self.window, "name:A")[1])
+        self.assertFalse(self.cache.get(self.window, "name:B")[1])
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn((1001, "name:B"), self.cache._window_index[1001])
+
+    def test_clear_window_only(self):
+        """Test that clearing one window keeps entries of other windows"""
+        self.cache.set(self.window, "name:A", Mock())
+        self.cache.set(self.other_window, "name:A", Mock())
+
+        self.cache.clear(self.window)
+
+        self.assertFalse(self.cache.get(self.window, "name:A")[1])
+        self.assertTrue(self.cache.get(self.other_window, "name:A")[1])
+        self.assertNotIn(1001, self.cache._window_index)
+
+    def test_clear_all(self):
+        """Test that clear_all removes every entry and the window index"""
+        self.cache.set(self.window, "name:A", Mock())
+        self.cache.set(self.other_window, "name:B", Mock())
+
+        self.cache.clear_all()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache._window_index, {})
+
+    def test_window_without_handle(self):
+        """Test that windows without handle fall back to id(window)"""
+        window = object()
+        control = Mock()
+        self.cache.set(window, "name:A", control)
+        self.assertIs(self.cache.get(window, "name:A")[0], control)
+        self.cache.clear(window)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_validator_accepts_live_entry(self):
+        """Test that a hit whose fingerprint validates is returned"""
+        control = Mock()
+        self.cache.set(self.window, "name:OK", control, fingerprint=(1, 2, 3))
+        validator = Mock(return_value=True)
+
+        cached, is_cached = self.cache.get(self.window, "name:OK", validator)
+
+        self.assertTrue(is_cached)
+        self.assertIs(cached, control)
+        validator.assert_called_once_with(control, (1, 2, 3))
+
+    def test_validator_rejects_stale_entry(self):
+        """Test that a hit whose fingerprint no longer matches is dropped"""
+        self.cache.set(self.window, "name:OK", Mock(), fingerprint=(1, 2, 3))
+
+        _, is_cached = self.cache.get(self.window, "name:OK", Mock(return_value=False))
+
+        self.assertFalse(is_cached)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache._window_index, {})
+
+    def test_validator_skipped_without_fingerprint(self):
+        """Test that entries cached without a fingerprint are trusted until they expire"""
+        self.cache.set(self.window, "name:OK", Mock())
+        validator = Mock(return_value=False)
+
+        self.assertTrue(self.cache.get(self.window, "name:OK", validator)[1])
+        validator.assert_not_called()
+
+    def test_negative_cache_disabled_by_default(self):
+        """Test that negative results are not remembered unless enabled"""
+        self.cache.set_negative(self.window, "name:Dialog")
+        self.assertFalse(self.cache.is_known_absent(self.window, "name:Dialog"))
+
+    def test_negative_cache(self):
+        """Test that negative results are remembered per window with their own TTL"""
+        cache = ControlCache(negative_expire_time=1)
+        with patch('robotframework_robocorp_windows.utils.cache.time.time', return_value=100.0):
+            cache.set_negative(self.window, "name:Dialog")
+            self.assertTrue(cache.is_known_absent(self.window, "name:Dialog"))
+            self.assertFalse(cache.is_known_absent(self.other_window, "name:Dialog"))
+        with patch('robotframework_robocorp_windows.utils.cache.time.time', return_value=101.5):
+            self.assertFalse(cache.is_known_absent(self.window, "name:Dialog"))
+        self.assertEqual(cache._negative_cache, {})
+
+    def test_clear_negative_for_window(self):
+        """Test that clearing negative results of one window keeps the others"""
+        cache = ControlCache(negative_expire_time=5)
+        cache.set_negative(self.window, "name:Dialog")
+        cache.set_negative(self.other_window, "name:Dialog")
+
+        cache.clear_negative(self.window)
+
+        self.assertFalse(cache.is_known_absent(self.window, "name:Dialog"))
+        self.assertTrue(cache.is_known_absent(self.other_window, "name:Dialog"))
+
+        cache.clear()
+        self.assertFalse(cache.is_known_absent(self.other_window, "name:Dialog"))
+
+if __name__ == '__main__':
+    unittest.main()
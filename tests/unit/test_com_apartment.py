@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import threading
+import time
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.utils.com_apartment import ComApartment, ComThreadPoolExecutor
+
+
+class FakeApartment(ComApartment):
+    """Apartment recording which threads entered and left, without calling COM"""
+
+    def __init__(self):
+        self.entered = []
+        self.left = []
+        self.lock = threading.Lock()
+
+    def initialize(self):
+        with self.lock:
+            self.entered.append(threading.get_ident())
+
+    def uninitialize(self):
+        with self.lock:
+            self.left.append(threading.get_ident())
+
+
+class TestComThreadPoolExecutor(unittest.TestCase):
+    """Test the per-worker COM apartment lifecycle"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.apartment = FakeApartment()
+        self.executor = ComThreadPoolExecutor(max_workers=3, apartment=self.apartment)
+
+    def tearDown(self):
+        """Shut the executor down if a test left it running"""
+        self.executor.shutdown(wait=True)
+
+    def test_workers_enter_apartment_once(self):
+        """Test that many tasks reuse the apartment of the worker they run on"""
+        threads = [future.result() for future in
+                   [self.executor.submit(threading.get_ident) for _ in range(50)]]
+
+        self.assertEqual(len(self.apartment.entered), len(set(self.apartment.entered)))
+        self.assertTrue(set(threads) <= set(self.apartment.entered))
+        self.assertLessEqual(len(self.apartment.entered), 3)
+        self.assertEqual(self.executor.initialized_workers, len(self.apartment.entered))
+        self.assertEqual(self.apartment.left, [])
+
+    def test_shutdown_leaves_apartment_on_each_worker(self):
+        """Test that shutdown uninitializes every worker exactly once on its own thread"""
+        gate = threading.Event()
+        futures = [self.executor.submit(gate.wait, 5) for _ in range(3)]
+        gate.set()
+        for future in futures:
+            future.result()
+
+        self.executor.shutdown(wait=True)
+
+        self.assertEqual(len(self.apartment.entered), 3)
+        self.assertEqual(sorted(self.apartment.left), sorted(self.apartment.entered))
+        self.assertEqual(self.executor.initialized_workers, 0)
+
+        # a second shutdown has nothing left to tear down
+        self.executor.shutdown(wait=True)
+        self.assertEqual(len(self.apartment.left), 3)
+
+    def test_cancel_futures_keeps_teardown(self):
+        """Test that cancelling queued tasks still runs the apartment teardown"""
+        gate = threading.Event()
+        running = [self.executor.submit(gate.wait, 5) for _ in range(3)]
+        queued = [self.executor.submit(threading.get_ident) for _ in range(5)]
+
+        gate.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+        self.assertTrue(all(future.done() for future in running + queued))
+        self.assertEqual(sorted(self.apartment.left), sorted(self.apartment.entered))
+
+    def test_failed_initialize_keeps_pool_usable(self):
+        """Test that a worker which cannot enter an apartment still runs tasks"""
+        apartment = FakeApartment()
+        apartment.initialize = Mock(side_effect=OSError("CoInitialize failed"))
+        executor = ComThreadPoolExecutor(max_workers=2, apartment=apartment)
+
+        self.assertEqual([executor.submit(lambda value: value * 2, i).result(timeout=5) for i in range(4)],
+                         [0, 2, 4, 6])
+        self.assertEqual(executor.initialized_workers, 0)
+        executor.shutdown(wait=True)
+        self.assertEqual(apartment.left, [])
+
+    def test_shutdown_does_not_wait_for_busy_worker(self):
+        """Test that shutdown gives up on a worker stuck in a long call after one bounded wait"""
+        gate = threading.Event()
+        started = threading.Event()
+        self.executor.submit(lambda: (started.set(), gate.wait(5)))
+        started.wait(5)
+        self.executor.TEARDOWN_TIMEOUT = 0.05
+
+        try:
+            start = time.monotonic()
+            self.executor.shutdown(wait=True)
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            gate.set()
+
+    def test_default_apartment_uses_comtypes(self):
+        """Test that the default apartment calls comtypes on the current thread"""
+        comtypes = Mock()
+        original = sys.modules.get('comtypes')
+        sys.modules['comtypes'] = comtypes
+        try:
+            apartment = ComApartment()
+            apartment.initialize()
+            apartment.uninitialize()
+        finally:
+            if original is None:
+                del sys.modules['comtypes']
+            else:
+                sys.modules['comtypes'] = original
+
+        comtypes.CoInitialize.assert_called_once_with()
+        comtypes.CoUninitialize.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
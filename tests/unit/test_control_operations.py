@@ -88,7 +88,9 @@ sys.modules['robocorp'] = mock_robocorp
 sys.modules['robocorp.windows'] = mock_robocorp
 
 # Now import our library components
+from robotframework_robocorp_windows.drivers.ui_snapshot import UISnapshot
 from robotframework_robocorp_windows.keywords.control_operations import ControlOperationsKeywords
+from robotframework_robocorp_windows.utils.exceptions import ControlNotFoundError
 
 class TestControlOperationsKeywords(unittest.TestCase):
     """Unit tests for ControlOperationsKeywords"""
@@ -135,6 +137,18 @@ class TestControlOperationsKeywords(unittest.TestCase):
         mock_control.click.assert_called_once()
         self.mock_library._log.assert_called()
     
+    def test_action_clears_negative_cache(self):
+        """Test that action keywords forget negative lookups for the current window"""
+        mock_control = MockRobocorpModule.ControlElement()
+        self.control_operations.find_control = Mock(return_value=mock_control)
+        self.control_operations.control_service.clear_negative_cache = Mock()
+        
+        self.control_operations.click_control("OKButton")
+        self.control_operations.type_into_control("Edit", "text")
+        
+        self.control_operations.control_service.clear_negative_cache.assert_called_with(self.mock_library.current_window)
+        self.assertEqual(self.control_operations.control_service.clear_negative_cache.call_count, 2)
+    
     def test_double_click_control(self):
         """Test double_click_control keyword"""
         # Mock the find_control method
@@ -212,6 +226,76 @@ class TestControlOperationsKeywords(unittest.TestCase):
         self.control_operations.control_service.control_should_not_exist.assert_called()
         self.mock_library._log.assert_called()
     
+    def test_wait_for_any_control(self):
+        """Test that Wait For Any Control returns the matched condition"""
+        self.control_operations.control_service.wait_for_any_control = Mock(return_value=("name:Error", Mock()))
+        
+        result = self.control_operations.wait_for_any_control("name:Saved", "name:Error", timeout=3)
+        
+        self.assertEqual(result, "name:Error")
+        window, conditions, deadline = self.control_operations.control_service.wait_for_any_control.call_args[0]
+        self.assertIs(window, self.mock_library.current_window)
+        self.assertEqual(conditions, ("name:Saved", "name:Error"))
+        self.assertEqual(deadline.timeout, 3)
+    
+    def test_wait_for_all_controls(self):
+        """Test that Wait For All Controls returns the controls by condition"""
+        controls = {"name:OK": Mock(), "NOT name:Loading": None}
+        self.control_operations.control_service.wait_for_all_controls = Mock(return_value=controls)
+        
+        self.assertEqual(self.control_operations.wait_for_all_controls("name:OK", "NOT name:Loading"), controls)
+        self.mock_library._log.assert_called()
+    
+    def test_execute_control_actions(self):
+        """Test that Execute Control Actions runs the batch in the current window"""
+        results = [{'step': 1, 'action': 'click', 'locator': 'name:OK', 'elapsed': 0.01, 'result': None}]
+        self.control_operations.control_service.execute_actions = Mock(return_value=results)
+        
+        self.assertEqual(self.control_operations.execute_control_actions([("click", "name:OK")]), results)
+        self.control_operations.control_service.execute_actions.assert_called_once_with(
+            self.mock_library.current_window, [("click", "name:OK")], 5)
+        self.mock_library._log.assert_called_once()
+    
+    def test_execute_control_actions_missing_control(self):
+        """Test that a missing control fails the keyword"""
+        self.control_operations.control_service.execute_actions = Mock(
+            side_effect=ControlNotFoundError("Step 2 (click name:Next) failed: Control not found"))
+        
+        with self.assertRaises(AssertionError) as context:
+            self.control_operations.execute_control_actions([("click", "name:OK"), ("click", "name:Next")])
+        self.assertIn("Step 2", str(context.exception))
+    
+    def test_fill_form(self):
+        """Test that Fill Form passes the fields to the service"""
+        self.control_operations.control_service.fill_form = Mock()
+        fields = {"id:First": "John", "id:Last": "Smith"}
+        
+        self.control_operations.fill_form(fields)
+        
+        self.control_operations.control_service.fill_form.assert_called_once_with(
+            self.mock_library.current_window, fields, 5)
+        self.mock_library._log.assert_called()
+    
+    def test_read_form(self):
+        """Test that Read Form returns the values by locator"""
+        self.control_operations.control_service.read_form = Mock(return_value={"id:First": "John"})
+        
+        self.assertEqual(self.control_operations.read_form("id:First", timeout=2), {"id:First": "John"})
+        self.control_operations.control_service.read_form.assert_called_once_with(
+            self.mock_library.current_window, ("id:First",), 2)
+    
+    def test_extract_table_passes_arguments_to_service(self):
+        """Test that Extract Table converts its arguments and leaves the default page size to the service"""
+        self.control_operations.control_service.extract_table = Mock(return_value=[["Name"], ["alpha"]])
+        
+        self.assertEqual(self.control_operations.extract_table("id:Grid", limit="20"), [["Name"], ["alpha"]])
+        self.control_operations.control_service.extract_table.assert_called_once_with(
+            self.mock_library.current_window, "id:Grid", None, 5, 0, 20, True)
+        
+        self.control_operations.extract_table("id:Grid", path="rows.csv", offset="10")
+        self.control_operations.control_service.extract_table.assert_called_with(
+            self.mock_library.current_window, "id:Grid", "rows.csv", 5, 10, None, True)
+    
     def test_set_control_value(self):
         """Test set_control_value keyword"""
         # Mock the find_control method
@@ -291,4 +375,41 @@ class TestControlOperationsKeywords(unittest.TestCase):
         
         # Verify
         mock_control.is_checked.assert_called_once()
-        self.mock_library._log.assert_called()
\ No newline at end of file
+        self.mock_library._log.assert_called()    
+    def test_snapshot_should_contain_control(self):
+        """Test that snapshot checks query the latest captured snapshot"""
+        mock_snapshot = Mock()
+        mock_snapshot.__len__ = Mock(return_value=3)
+        mock_snapshot.find.side_effect = lambda locator: "node" if locator == "name:OK" else None
+        self.control_operations.control_service.capture_snapshot = Mock(return_value=mock_snapshot)
+        
+        with self.assertRaises(AssertionError):
+            self.control_operations.snapshot_should_contain_control("name:OK")
+        
+        self.assertIs(self.control_operations.capture_ui_snapshot(), mock_snapshot)
+        self.assertEqual(self.control_operations.snapshot_should_contain_control("name:OK"), "node")
+        with self.assertRaises(AssertionError):
+            self.control_operations.snapshot_should_contain_control("name:Missing")
+    
+    def test_get_ui_changes_since_snapshot(self):
+        """Test that the diff is taken against the latest snapshot and replaces it"""
+        old_snapshot, new_snapshot = Mock(), Mock()
+        mock_diff = Mock(new=new_snapshot, added=[], removed=[], changed=[])
+        mock_diff.to_dict.return_value = {'added': [], 'removed': [], 'changed': []}
+        self.control_operations.control_service.get_ui_changes = Mock(return_value=mock_diff)
+        self.control_operations.last_snapshot = old_snapshot
+        
+        result = self.control_operations.get_ui_changes_since_snapshot()
+        
+        self.assertEqual(result, {'added': [], 'removed': [], 'changed': []})
+        self.control_operations.control_service.get_ui_changes.assert_called_once_with(
+            self.mock_library.current_window, old_snapshot, None)
+        self.assertIs(self.control_operations.last_snapshot, new_snapshot)
+        
+        # An explicitly passed empty snapshot is used as the baseline, not replaced by the latest one
+        empty_snapshot = UISnapshot()
+        self.control_operations.get_ui_changes_since_snapshot(empty_snapshot)
+        self.control_operations.control_service.get_ui_changes.assert_called_with(
+            self.mock_library.current_window, empty_snapshot, None)
+        with self.assertRaises(AssertionError):
+            self.control_operations.snapshot_should_contain_control("name:OK", empty_snapshot)
@@ -68,6 +68,9 @@ sys.modules['robocorp.windows.ElementNotFound'] = MockRobocorpModule.ElementNotF
 from robotframework_robocorp_windows.services.control_service import ControlService
 from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
 from robotframework_robocorp_windows.utils.exceptions import ControlNotFoundError, ControlOperationException
+from robotframework_robocorp_windows.utils.polling import Deadline
+from robotframework_robocorp_windows.utils.cache import ControlCache
+from robotframework_robocorp_windows.utils.locator_utils import locator_utils
 
 class TestControlService(unittest.TestCase):
     """Unit tests for ControlService"""
@@ -287,6 +290,313 @@ class TestControlService(unittest.TestCase):
         with self.assertRaises(AssertionError):
             self.control_service.control_should_not_exist(self.mock_window, "ExistingControl", timeout=1)
     
+    def test_control_should_exist_passes_deadline_to_driver(self):
+        """Test control_should_exist does a single driver lookup bounded by one deadline"""
+        self.mock_driver.find_control.side_effect = ControlNotFoundError("Control not found")
+        deadline = Deadline(0.2)
+        
+        with self.assertRaises(AssertionError):
+            self.control_service.control_should_exist(self.mock_window, "Button", timeout=deadline)
+        
+        # The driver owns the polling loop, the service does not retry on top of it
+        self.mock_driver.find_control.assert_called_once_with(self.mock_window, locator_utils.compile("Button"), deadline)
+    
+    def test_control_should_not_exist_bypasses_cache(self):
+        """Test control_should_not_exist ignores a cached hit for a control that is gone"""
+        self.mock_driver.find_control.return_value = self.mock_control
+        self.control_service.find_control(self.mock_window, "Button")
+        
+        # The control disappears, but is still cached
+        self.mock_driver.find_control.return_value = None
+        self.mock_driver.find_control.side_effect = ControlNotFoundError("Control not found")
+        
+        self.control_service.control_should_not_exist(self.mock_window, "Button", timeout=5)
+        
+        # The stale cache entry is dropped as well
+        _, is_cached = self.control_service.control_cache.get(self.mock_window, "Button")
+        self.assertFalse(is_cached)
+    
+    def test_find_control_passes_compiled_locator(self):
+        """Test that the driver receives the compiled locator and the cache is keyed by its text"""
+        self.mock_driver.find_control.return_value = self.mock_control
+        
+        self.control_service.find_control(self.mock_window, "name:Panel > class:Edit")
+        
+        locator = self.mock_driver.find_control.call_args[0][1]
+        self.assertIs(locator, locator_utils.compile("name:Panel > class:Edit"))
+        self.assertTrue(locator.is_chained)
+        self.assertTrue(self.control_service.control_cache.get(self.mock_window, "name:Panel > class:Edit")[1])
+    
+    def test_find_control_invalid_locator(self):
+        """Test that an invalid locator is rejected before reaching the driver"""
+        with self.assertRaises(ValueError):
+            self.control_service.find_control(self.mock_window, "invalid:Button")
+        self.mock_driver.find_control.assert_not_called()
+    
+    def test_find_control_negative_cache(self):
+        """Test that a remembered miss fails fast until the negative cache is cleared"""
+        control_service = ControlService(self.mock_driver, ControlCache(negative_expire_time=5))
+        self.mock_driver.find_control.side_effect = ControlNotFoundError("Control not found")
+        
+        with self.assertRaises(ControlNotFoundError):
+            control_service.find_control(self.mock_window, "OptionalDialog")
+        with self.assertRaises(ControlNotFoundError):
+            control_service.find_control(self.mock_window, "OptionalDialog")
+        # Second lookup answered from the negative cache
+        self.mock_driver.find_control.assert_called_once()
+        
+        # After an action the window is queried again
+        control_service.clear_negative_cache(self.mock_window)
+        self.mock_driver.find_control.side_effect = None
+        self.mock_driver.find_control.return_value = self.mock_control
+        self.assertEqual(control_service.find_control(self.mock_window, "OptionalDialog"), self.mock_control)
+    
+    def test_find_control_refinds_stale_cached_control(self):
+        """Test that a cached control destroyed and recreated by the app is found again"""
+        recreated_control = MockRobocorpModule.ControlElement()
+        self.mock_driver.find_control.side_effect = [self.mock_control, recreated_control]
+        self.mock_driver.get_control_fingerprint.return_value = ('runtime_id', 42, 1)
+        
+        self.assertEqual(self.control_service.find_control(self.mock_window, "Button"), self.mock_control)
+        
+        # The live element no longer matches the stored runtime id
+        self.mock_driver.get_control_fingerprint.side_effect = [('runtime_id', 42, 2), ('runtime_id', 42, 2)]
+        self.assertEqual(self.control_service.find_control(self.mock_window, "Button"), recreated_control)
+        self.assertEqual(self.mock_driver.find_control.call_count, 2)
+        
+        # The refreshed entry is served from cache again
+        self.mock_driver.get_control_fingerprint.side_effect = None
+        self.mock_driver.get_control_fingerprint.return_value = ('runtime_id', 42, 2)
+        self.assertEqual(self.control_service.find_control(self.mock_window, "Button"), recreated_control)
+        self.assertEqual(self.mock_driver.find_control.call_count, 2)
+    
+    def test_find_controls_resolves_pending_in_one_driver_call(self):
+        """Test that cached controls are reused and the rest are resolved in one batch and cached"""
+        ok_button = MockRobocorpModule.ControlElement()
+        cancel_button = MockRobocorpModule.ControlElement()
+        self.mock_driver.find_control.return_value = ok_button
+        self.control_service.find_control(self.mock_window, "name:OK")
+        
+        def fake_find_controls(window, locators, timeout, on_found=None):
+            self.assertEqual([str(locator) for locator in locators], ["name:Cancel"])
+            on_found(locators[0], cancel_button)
+            return {"name:Cancel": cancel_button}
+        
+        self.mock_driver.find_controls.side_effect = fake_find_controls
+        
+        controls = self.control_service.find_controls(self.mock_window, ["name:OK", "name:Cancel"])
+        
+        self.assertEqual(list(controls), ["name:OK", "name:Cancel"])
+        self.assertIs(controls["name:OK"], ok_button)
+        self.assertIs(controls["name:Cancel"], cancel_button)
+        self.mock_driver.find_controls.assert_called_once()
+        self.assertIs(self.control_service.control_cache.get(self.mock_window, "name:Cancel")[0], cancel_button)
+    
+    def test_find_controls_reports_all_missing(self):
+        """Test that every locator not found is listed in one error"""
+        self.mock_driver.find_controls.return_value = {"name:OK": self.mock_control}
+        
+        with self.assertRaises(ControlNotFoundError) as context:
+            self.control_service.find_controls(self.mock_window, ["name:OK", "name:Help", "id:Missing"])
+        
+        self.assertIn("name:Help, id:Missing", str(context.exception))
+    
+    def test_wait_for_any_control_evaluates_all_conditions_each_tick(self):
+        """Test that every condition is probed in one batch per tick until one is met"""
+        error_dialog = MockRobocorpModule.ControlElement()
+        ticks = []
+        
+        def fake_find_controls(window, locators, timeout, on_found=None):
+            ticks.append(sorted(str(locator) for locator in locators))
+            if len(ticks) < 3:
+                return {}
+            on_found(locators[1], error_dialog)
+            return {"name:Error": error_dialog}
+        
+        self.mock_driver.find_controls.side_effect = fake_find_controls
+        
+        condition, control = self.control_service.wait_for_any_control(
+            self.mock_window, ["name:Saved", "name:Error"], timeout=5)
+        
+        self.assertEqual((condition, control), ("name:Error", error_dialog))
+        self.assertEqual(ticks, [["name:Error", "name:Saved"]] * 3)
+        self.assertIs(self.control_service.control_cache.get(self.mock_window, "name:Error")[0], error_dialog)
+    
+    def test_wait_for_any_control_matches_disappearing_control(self):
+        """Test that NOT conditions are met once the control is gone and bypass the cache"""
+        progress = MockRobocorpModule.ControlElement()
+        self.control_service.control_cache.set(self.mock_window, "name:Progress", progress)
+        presence = iter([{"name:Progress": progress}, {}])
+        self.mock_driver.find_controls.side_effect = lambda window, locators, timeout, on_found=None: \
+            next(presence) if [str(locator) for locator in locators] == ["name:Progress"] else {}
+        
+        condition, control = self.control_service.wait_for_any_control(
+            self.mock_window, ["name:Done", "NOT name:Progress"], timeout=5)
+        
+        self.assertEqual(condition, "NOT name:Progress")
+        self.assertIsNone(control)
+        self.assertFalse(self.control_service.control_cache.get(self.mock_window, "name:Progress")[1])
+    
+    def test_wait_for_controls_timeout_reports_conditions(self):
+        """Test the failures of any and all waits within one deadline"""
+        self.mock_driver.find_controls.side_effect = lambda window, locators, timeout, on_found=None: \
+            {"name:OK": self.mock_control} if "name:OK" in [str(locator) for locator in locators] else {}
+        
+        with self.assertRaises(AssertionError) as context:
+            self.control_service.wait_for_any_control(self.mock_window, ["name:Saved", "name:Error"], timeout=0.05)
+        self.assertIn("name:Saved, name:Error", str(context.exception))
+        
+        with self.assertRaises(AssertionError) as context:
+            self.control_service.wait_for_all_controls(self.mock_window, ["name:OK", "name:Cancel"], timeout=0.05)
+        self.assertEqual(str(context.exception), "Conditions not met: name:Cancel")
+        
+        with self.assertRaises(ValueError):
+            self.control_service.wait_for_all_controls(self.mock_window, [])
+    
+    def test_wait_for_all_controls(self):
+        """Test that all conditions must hold in the same tick"""
+        cancel_button = MockRobocorpModule.ControlElement()
+        self.mock_driver.find_controls.side_effect = lambda window, locators, timeout, on_found=None: \
+            {"name:OK": self.mock_control, "name:Cancel": cancel_button} if len(locators) == 2 else {}
+        
+        controls = self.control_service.wait_for_all_controls(
+            self.mock_window, ["name:OK", "name:Cancel", "NOT name:Loading"], timeout=5)
+        
+        self.assertEqual(controls, {"name:OK": self.mock_control, "name:Cancel": cancel_button,
+                                    "NOT name:Loading": None})
+    
+    def test_execute_actions_prefetches_controls_in_one_walk(self):
+        """Test that a batch resolves existing controls together and reports each step"""
+        user_field = MockRobocorpModule.ControlElement()
+        login_button = MockRobocorpModule.ControlElement()
+        status = MockRobocorpModule.ControlElement()
+        status.text = "Logged in"
+        
+        def fake_find_controls(window, locators, timeout, on_found=None):
+            self.assertEqual([str(locator) for locator in locators], ["id:User", "name:Login", "id:Status"])
+            on_found(locators[0], user_field)
+            on_found(locators[1], login_button)
+            return {"id:User": user_field, "name:Login": login_button}
+        
+        self.mock_driver.find_controls.side_effect = fake_find_controls
+        self.mock_driver.find_control.return_value = status
+        
+        results = self.control_service.execute_actions(self.mock_window, [
+            ("type", "id:User", "admin"),
+            {"action": "Click", "locator": "name:Login"},
+            ["get text", "id:Status"],
+        ], timeout=5)
+        
+        user_field.type.assert_called_once_with("admin")
+        login_button.click.assert_called_once_with()
+        # only the control that appeared after the click is searched for on its own
+        self.mock_driver.find_control.assert_called_once()
+        self.assertEqual([(r['step'], r['action'], r['locator'], r['result']) for r in results],
+                         [(1, 'type', 'id:User', None), (2, 'click', 'name:Login', None),
+                          (3, 'get_text', 'id:Status', "Logged in")])
+        self.assertTrue(all(result['elapsed'] >= 0 for result in results))
+    
+    def test_execute_actions_validates_before_running(self):
+        """Test that invalid steps are reported before any action runs"""
+        for steps, message in [
+            ([("click", "name:OK"), ("hover", "name:OK")], "Step 2 has unsupported action 'hover'"),
+            ([("type", "id:User")], "Step 1 (type) expects 1 argument(s), got 0"),
+            ([("click", "")], "Step 1 (click): Locator cannot be empty"),
+            (["click"], "Step 1 must be a (action, locator, *args) sequence"),
+        ]:
+            with self.subTest(steps=steps):
+                with self.assertRaises(ValueError) as context:
+                    self.control_service.execute_actions(self.mock_window, steps)
+                self.assertIn(message, str(context.exception))
+        self.mock_driver.find_controls.assert_not_called()
+    
+    def test_execute_actions_stops_at_failing_step(self):
+        """Test that the failing step is named and later steps do not run"""
+        self.control_service.disable_cache()
+        self.mock_control.click.side_effect = Exception("Click failed")
+        self.mock_driver.find_control.return_value = self.mock_control
+        
+        with self.assertRaises(ControlOperationException) as context:
+            self.control_service.execute_actions(
+                self.mock_window, [("click", "name:OK"), ("type", "class:Edit", "text")])
+        
+        self.assertIn("Step 1 (click name:OK) failed: Failed to click control: Click failed", str(context.exception))
+        self.mock_control.type.assert_not_called()
+        self.mock_driver.find_controls.assert_not_called()
+    
+    def test_execute_actions_wraps_errors_with_other_signatures(self):
+        """Test that step errors whose type cannot be built from a message keep the original as cause"""
+        self.control_service.disable_cache()
+        error = UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        self.mock_driver.find_control.return_value = self.mock_control
+        
+        with patch.object(self.control_service, 'get_control_text', side_effect=error):
+            with self.assertRaises(ControlOperationException) as context:
+                self.control_service.execute_actions(self.mock_window, [("get text", "id:Status")])
+        
+        self.assertIn("Step 1 (get_text id:Status) failed:", str(context.exception))
+        self.assertIs(context.exception.__cause__, error)
+    
+    def test_fill_form_sets_values_in_order_and_reports_failures_once(self):
+        """Test that fields are resolved in one batch, written in order and failures collected"""
+        first, last, city = (MockRobocorpModule.ControlElement() for _ in range(3))
+        writes = []
+        first.set_value.side_effect = lambda value: writes.append(("first", value))
+        last.set_value.side_effect = Exception("read-only")
+        city.set_value.side_effect = lambda value: writes.append(("city", value))
+        self.mock_driver.find_controls.return_value = {"id:First": first, "id:Last": last, "id:City": city}
+        
+        with self.assertRaises(ControlOperationException) as context:
+            self.control_service.fill_form(
+                self.mock_window, {"id:First": "John", "id:Last": "Smith", "id:City": "Helsinki"})
+        
+        self.assertEqual(writes, [("first", "John"), ("city", "Helsinki")])
+        self.assertIn("Failed to fill 1 of 3 fields: id:Last (Failed to set control value: read-only)",
+                      str(context.exception))
+        self.mock_driver.find_controls.assert_called_once()
+    
+    def test_fill_form_missing_control_writes_nothing(self):
+        """Test that no value is set when any control is missing"""
+        self.mock_driver.find_controls.return_value = {"id:First": self.mock_control}
+        
+        with self.assertRaises(ControlNotFoundError) as context:
+            self.control_service.fill_form(self.mock_window, {"id:First": "John", "id:Last": "Smith"}, timeout=0)
+        
+        self.assertIn("id:Last", str(context.exception))
+        self.mock_control.set_value.assert_not_called()
+    
+    def test_read_form_reports_all_errors_after_reading(self):
+        """Test that reads continue past failures and report them in one error"""
+        first, broken = MockRobocorpModule.ControlElement(), MockRobocorpModule.ControlElement()
+        first.get_value.return_value = "John"
+        broken.get_value.side_effect = Exception("no value pattern")
+        self.mock_driver.find_controls.return_value = {"id:First": first, "id:Broken": broken}
+        
+        with self.assertRaises(ControlOperationException) as context:
+            self.control_service.read_form(self.mock_window, ["id:First", "id:Broken", "id:Missing"], timeout=0)
+        
+        self.assertEqual(str(context.exception),
+                         "Failed to read 2 fields: id:Broken (Failed to get control value: no value pattern); "
+                         "id:Missing (Control not found)")
+        first.get_value.assert_called_once_with()
+        
+        self.mock_driver.find_controls.return_value = {"id:First": first}
+        self.control_service.clear_cache()
+        self.assertEqual(self.control_service.read_form(self.mock_window, ["id:First", "id:First"]), {"id:First": "John"})
+    
+    def test_iter_controls_is_lazy_and_uncached(self):
+        """Test that iter_controls streams driver results without filling the cache"""
+        controls = [MockRobocorpModule.ControlElement() for _ in range(3)]
+        self.mock_driver.iter_controls.return_value = iter(controls)
+        
+        results = self.control_service.iter_controls(self.mock_window, "class:ListItem", timeout=5, max_results=3)
+        self.mock_driver.iter_controls.assert_not_called()
+        
+        self.assertEqual(list(results), controls)
+        self.mock_driver.iter_controls.assert_called_once_with(
+            self.mock_window, locator_utils.compile("class:ListItem"), 5, 3)
+        self.assertEqual(len(self.control_service.control_cache), 0)
+    
     def test_control_operations_with_exception(self):
         """Test control operations when they raise exceptions"""
         # Mock control methods to raise exceptions
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.extensions import ExtensionManager, LocatorStrategy
+from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
+from robotframework_robocorp_windows.services.control_service import ControlService
+from robotframework_robocorp_windows.services.locator_planner import LocatorPlanner
+from robotframework_robocorp_windows.utils.exceptions import ControlNotFoundError
+from robotframework_robocorp_windows.utils.locator_utils import locator_utils
+from robotframework_robocorp_windows.utils.polling import Poller
+
+
+class HandleStrategy(LocatorStrategy):
+    """Locator strategy resolving controls by a fixed handle table"""
+
+    cost = 0.5
+
+    def __init__(self, controls):
+        self.controls = controls
+        self.calls = []
+
+    def get_name(self):
+        return "hwnd"
+
+    def find_control(self, window, locator, timeout=10.0):
+        self.calls.append((locator, timeout))
+        if locator in self.controls:
+            return self.controls[locator]
+        raise ControlNotFoundError(f"No control with handle {locator}")
+
+    def is_available(self):
+        return True
+
+
+class TestCustomLocatorStrategies(unittest.TestCase):
+    """Test dispatch of registered locator strategies"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.control = Mock()
+        self.strategy = HandleStrategy({"0x1A2B": self.control})
+        self.extension_manager = ExtensionManager()
+        self.extension_manager.register_locator_strategy(self.strategy)
+        self.driver = RobocorpWindowsDriver(poller=Poller(initial_interval=0.001), extension_manager=self.extension_manager)
+        self.driver.get_control_fingerprint = Mock(return_value=None)
+        self.window = Mock()
+
+    def tearDown(self):
+        """Unregister the strategy so other tests see the built-in prefixes only"""
+        self.extension_manager.unregister_locator_strategy("hwnd")
+
+    def test_registered_prefix_is_valid(self):
+        """Test that registering a strategy makes its prefix valid until it is unregistered"""
+        is_valid, _ = locator_utils.validate_locator("hwnd:0x1A2B")
+        self.assertTrue(is_valid)
+        self.assertIn("hwnd", locator_utils.get_supported_strategies())
+        self.assertEqual(locator_utils.compile("hwnd:0x1A2B > name:OK").value, "0x1A2B > name:OK")
+        self.assertFalse(locator_utils.validate_locator("name:Panel > hwnd:0x1A2B")[0])
+
+        self.extension_manager.unregister_locator_strategy("hwnd")
+        self.assertFalse(locator_utils.validate_locator("hwnd:0x1A2B")[0])
+
+    def test_driver_dispatches_to_strategy(self):
+        """Test that the driver hands the locator value and remaining budget to the plugin"""
+        self.assertIs(self.driver.find_control(self.window, "hwnd:0x1A2B", timeout=5), self.control)
+        value, timeout = self.strategy.calls[0]
+        self.assertEqual(value, "0x1A2B")
+        self.assertLessEqual(timeout, 5)
+
+        with self.assertRaises(ControlNotFoundError):
+            self.driver.find_control(self.window, "hwnd:0xFFFF", timeout=0)
+        self.assertEqual(list(self.driver.iter_controls(self.window, "hwnd:0x1A2B", timeout=0)), [self.control])
+
+    def test_unregistered_prefix_uses_built_in_driver(self):
+        """Test that locators without a registered strategy never reach the plugin"""
+        self.driver.tree_walker.select_xpath = Mock(return_value=[self.control])
+        self.window.iter_children = Mock(return_value=[])
+
+        self.assertIs(self.driver.find_control(self.window, "xpath://Button", timeout=0), self.control)
+        self.assertEqual(self.strategy.calls, [])
+
+    def test_plugin_results_are_cached(self):
+        """Test that controls found by a plugin go through the shared control cache"""
+        control_service = ControlService(self.driver)
+
+        control_service.find_control(self.window, "hwnd:0x1A2B", timeout=0)
+        control_service.find_control(self.window, "hwnd:0x1A2B", timeout=0)
+
+        self.assertEqual(len(self.strategy.calls), 1)
+        self.assertIs(control_service.control_cache.get(self.window, "hwnd:0x1A2B")[0], self.control)
+
+    def test_planner_costs_custom_strategy(self):
+        """Test that fallback chains may use registered prefixes and respect their cost"""
+        planner = LocatorPlanner(self.driver, self.extension_manager, Poller(initial_interval=0.001))
+
+        plan = planner.plan(self.window, "id:btnSave || hwnd:0x1A2B")
+        self.assertEqual([str(alternative) for alternative in plan], ["hwnd:0x1A2B", "id:btnSave"])
+        self.assertIs(planner.find_control(self.window, "id:btnSave || hwnd:0x1A2B", timeout=0), self.control)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.services.locator_planner import LocatorPlanner
+from robotframework_robocorp_windows.services.control_service import ControlService
+from robotframework_robocorp_windows.extensions.base import ExtensionManager
+from robotframework_robocorp_windows.utils.exceptions import ControlNotFoundError
+from robotframework_robocorp_windows.utils.polling import Poller
+
+
+class FakeDriver:
+    """Driver that finds controls only for a fixed set of locators and records every probe"""
+
+    def __init__(self, present):
+        self.present = present
+        self.probes = []
+
+    def find_control(self, window, locator, timeout=10):
+        self.probes.append(str(locator))
+        if str(locator) in self.present:
+            return self.present[str(locator)]
+        raise ControlNotFoundError(f"Control not found with identifier: {locator}")
+
+    def iter_controls(self, window, locator, timeout=10, max_results=None):
+        self.probes.append(str(locator))
+        if str(locator) in self.present:
+            yield self.present[str(locator)]
+
+    def set_logger(self, logger):
+        pass
+
+
+class TestLocatorPlanner(unittest.TestCase):
+    """Test cost-based ordering of fallback locators"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.save_button = Mock()
+        self.driver = FakeDriver({"text:Save": self.save_button})
+        self.planner = LocatorPlanner(self.driver, ExtensionManager(), Poller(initial_interval=0.001))
+        self.window = Mock()
+        self.window.executable = "C:\\Program Files\\Editor\\editor.exe"
+
+    def test_plan_tries_cheapest_strategy_first(self):
+        """Test that alternatives are ordered by strategy cost when there is no history"""
+        plan = self.planner.plan(self.window, "text:Save || name:Toolbar > class:Button || id:btnSave || name:Save")
+        self.assertEqual([str(alternative) for alternative in plan],
+                         ["id:btnSave", "name:Save", "text:Save", "name:Toolbar > class:Button"])
+
+    def test_find_control_probes_alternatives_without_waiting(self):
+        """Test that each alternative is probed with zero timeout and the hit is returned"""
+        control = self.planner.find_control(self.window, "name:Save || text:Save || id:btnSave", timeout=5)
+
+        self.assertIs(control, self.save_button)
+        self.assertEqual(self.driver.probes, ["id:btnSave", "name:Save", "text:Save"])
+
+    def test_hit_rates_reorder_alternatives_per_application(self):
+        """Test that learned hit rates move the alternative that keeps matching to the front"""
+        locator = "id:btnSave || name:Save || text:Save"
+        for _ in range(5):
+            self.planner.find_control(self.window, locator, timeout=0)
+
+        self.assertEqual(str(self.planner.plan(self.window, locator)[0]), "text:Save")
+        statistics = self.planner.get_statistics(self.window)
+        self.assertEqual(statistics["text:Save"], (5, 5))
+        # once text:Save is ranked first the alternatives that never match stop being probed
+        self.assertLess(statistics["id:btnSave"][0], 5)
+        self.assertEqual(statistics["id:btnSave"][1], 0)
+
+        other_window = Mock()
+        other_window.executable = "C:\\Windows\\notepad.exe"
+        self.assertEqual(str(self.planner.plan(other_window, locator)[0]), "id:btnSave")
+
+        self.planner.reset_statistics()
+        self.assertEqual(str(self.planner.plan(self.window, locator)[0]), "id:btnSave")
+
+    def test_find_control_shares_one_deadline(self):
+        """Test that a miss on every alternative fails after one shared timeout"""
+        with self.assertRaises(ControlNotFoundError) as context:
+            self.planner.find_control(self.window, "id:Missing || name:Missing", timeout=0.05)
+
+        self.assertIn("id:Missing || name:Missing", str(context.exception))
+        attempts = self.planner.get_statistics(self.window)
+        self.assertEqual(attempts, {"id:Missing": (1, 0), "name:Missing": (1, 0)})
+        self.assertGreater(len(self.driver.probes), 2)
+
+    def test_iter_controls_returns_first_matching_alternative(self):
+        """Test that iter_controls streams the matches of the first alternative that has any"""
+        controls = list(self.planner.iter_controls(self.window, "id:btnSave || text:Save", timeout=0))
+
+        self.assertEqual(controls, [self.save_button])
+        self.assertEqual(self.driver.probes, ["id:btnSave", "text:Save"])
+
+
+class TestControlServiceFallbackLocators(unittest.TestCase):
+    """Test that ControlService routes fallback locators through the planner"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.save_button = Mock()
+        self.driver = FakeDriver({"name:Save": self.save_button})
+        self.driver.get_control_fingerprint = Mock(return_value=None)
+        self.control_service = ControlService(self.driver, poller=Poller(initial_interval=0.001))
+        self.window = Mock()
+
+    def test_find_control_caches_fallback_locator(self):
+        """Test that the resolved control is cached under the whole fallback locator"""
+        locator = "id:btnSave || name:Save"
+        self.assertIs(self.control_service.find_control(self.window, locator, timeout=0), self.save_button)
+        self.assertIs(self.control_service.find_control(self.window, locator, timeout=0), self.save_button)
+        self.assertEqual(self.driver.probes, ["id:btnSave", "name:Save"])
+
+    def test_find_controls_resolves_fallback_locators(self):
+        """Test that find_controls resolves fallback locators alongside plain locators"""
+        ok_button = Mock()
+        self.driver.find_controls = Mock(return_value={"name:OK": ok_button})
+
+        controls = self.control_service.find_controls(self.window, ["name:OK", "id:btnSave || name:Save"], timeout=0)
+
+        self.assertEqual(controls, {"name:OK": ok_button, "id:btnSave || name:Save": self.save_button})
+        walked = self.driver.find_controls.call_args[0][1]
+        self.assertEqual([str(locator) for locator in walked], ["name:OK"])
+
+
+if __name__ == '__main__':
+    unittest.main()
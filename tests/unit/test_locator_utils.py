@@ -1,5 +1,5 @@
 import unittest
-from robotframework_robocorp_windows.utils.locator_utils import LocatorUtils, locator_utils
+from robotframework_robocorp_windows.utils.locator_utils import LocatorUtils, CompiledLocator, locator_utils
 
 class TestLocatorUtils(unittest.TestCase):
     """Unit tests for LocatorUtils"""
@@ -112,5 +112,65 @@ class TestLocatorUtils(unittest.TestCase):
             is_valid, _ = locator_utils.validate_locator(example)
             self.assertTrue(is_valid, f"Example should be valid: {example}")
 
+    def test_compile_is_memoized(self):
+        """Test that the same locator string is parsed only once"""
+        compiled = locator_utils.compile("name:MemoButton")
+        self.assertIsInstance(compiled, CompiledLocator)
+        self.assertIs(locator_utils.compile("name:MemoButton"), compiled)
+        self.assertIs(locator_utils.compile(compiled), compiled)
+        self.assertEqual(str(compiled), "name:MemoButton")
+        self.assertEqual((compiled.strategy, compiled.value), ("name", "MemoButton"))
+    
+    def test_compile_chained_locator(self):
+        """Test parsing of chained locators"""
+        compiled = locator_utils.compile("name:Panel > class:Edit")
+        self.assertTrue(compiled.is_valid)
+        self.assertTrue(compiled.is_chained)
+        self.assertEqual([(part.strategy, part.value) for part in compiled.parts], [("name", "Panel"), ("class", "Edit")])
+        
+        # Every step of the chain is validated
+        is_valid, message = locator_utils.validate_locator("name:Panel > invalid:Edit")
+        self.assertFalse(is_valid)
+        self.assertIn("Invalid locator strategy", message)
+        
+        is_valid, message = locator_utils.validate_locator("name:Panel > ")
+        self.assertFalse(is_valid)
+    
+    def test_compile_xpath_is_not_split(self):
+        """Test that xpath values containing the chain separator stay intact"""
+        compiled = locator_utils.compile("xpath://Pane[@width > 3]")
+        self.assertFalse(compiled.is_chained)
+        self.assertEqual(compiled.value, "//Pane[@width > 3]")
+    
+    def test_compile_regex(self):
+        """Test that regex locators are precompiled and invalid patterns are rejected"""
+        compiled = locator_utils.compile("regex:Untitled.*")
+        self.assertTrue(compiled.is_valid)
+        self.assertTrue(compiled.parts[0].regex.match("Untitled - Notepad"))
+        
+        is_valid, message = locator_utils.validate_locator("regex:(")
+        self.assertFalse(is_valid)
+        self.assertIn("Invalid regular expression", message)
+    
+    def test_compile_valid(self):
+        """Test compile_valid raises for invalid locators"""
+        self.assertTrue(locator_utils.compile_valid("id:123").is_valid)
+        with self.assertRaises(ValueError):
+            locator_utils.compile_valid("invalid:Button")
+        with self.assertRaises(ValueError):
+            locator_utils.compile_valid(None)
+    
+    def test_compile_fallback_locator(self):
+        """Test that fallback locators are split into validated alternatives"""
+        compiled = locator_utils.compile("id:btnSave || name:Save || name:Toolbar > text:Save")
+        self.assertTrue(compiled.is_valid)
+        self.assertEqual([str(alternative) for alternative in compiled.alternatives],
+                         ["id:btnSave", "name:Save", "name:Toolbar > text:Save"])
+        self.assertTrue(compiled.alternatives[2].is_chained)
+        
+        is_valid, message = locator_utils.validate_locator("id:btnSave || invalid:Save")
+        self.assertFalse(is_valid)
+        self.assertIn("invalid:Save", message)
+
 if __name__ == '__main__':
     unittest.main()
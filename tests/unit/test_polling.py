@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import asyncio
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.utils.polling import Poller, Deadline
+
+class TestPoller(unittest.TestCase):
+    """Unit tests for Poller"""
+
+    def test_intervals_grow_geometrically_and_cap(self):
+        """Test that intervals start small, grow by the factor and cap at max_interval"""
+        poller = Poller(initial_interval=0.005, backoff_factor=2.0, max_interval=0.03)
+        intervals = poller.intervals()
+        self.assertEqual([next(intervals) for _ in range(5)], [0.005, 0.01, 0.02, 0.03, 0.03])
+
+    def test_invalid_parameters(self):
+        """Test that invalid backoff parameters are rejected"""
+        with self.assertRaises(ValueError):
+            Poller(initial_interval=0)
+        with self.assertRaises(ValueError):
+            Poller(backoff_factor=0.5)
+
+    def test_poll_returns_first_truthy_result(self):
+        """Test that poll returns as soon as the probe succeeds"""
+        probe = Mock(side_effect=[None, False, "found"])
+        poller = Poller(initial_interval=0.001, max_interval=0.001)
+
+        self.assertEqual(poller.poll(probe, timeout=5), "found")
+        self.assertEqual(probe.call_count, 3)
+
+    def test_poll_timeout_returns_none(self):
+        """Test that poll returns None when the probe never succeeds"""
+        poller = Poller(initial_interval=0.001, max_interval=0.01)
+        self.assertIsNone(poller.poll(lambda: None, timeout=0.05))
+
+    def test_poll_probes_once_with_zero_timeout(self):
+        """Test that the probe runs once even without a time budget"""
+        probe = Mock(return_value=None)
+        self.assertIsNone(Poller().poll(probe, timeout=0))
+        probe.assert_called_once()
+
+    def test_final_sleep_is_clamped_to_deadline(self):
+        """Test that no sleep extends past the timeout"""
+        clock = [0.0]
+
+        def fake_sleep(seconds):
+            clock[0] += seconds
+
+        poller = Poller(initial_interval=0.4, backoff_factor=2.0, max_interval=0.5)
+        with patch('robotframework_robocorp_windows.utils.polling.time.monotonic', side_effect=lambda: clock[0]), \
+                patch('robotframework_robocorp_windows.utils.polling.time.sleep', side_effect=fake_sleep) as mock_sleep:
+            self.assertIsNone(poller.poll(lambda: None, timeout=1.0))
+
+        # 0.4 + 0.5 + 0.1 (clamped) == 1.0
+        self.assertEqual([round(call.args[0], 6) for call in mock_sleep.call_args_list], [0.4, 0.5, 0.1])
+        self.assertAlmostEqual(clock[0], 1.0)
+
+    def test_poll_accepts_deadline(self):
+        """Test that poll shares the budget of a Deadline passed in from an outer layer"""
+        deadline = Deadline(0.05)
+        poller = Poller(initial_interval=0.001, max_interval=0.01)
+        self.assertIsNone(poller.poll(lambda: None, deadline))
+        self.assertTrue(deadline.expired())
+        # A second poll on the same deadline does not start a new timer
+        probe = Mock(return_value=None)
+        poller.poll(probe, deadline)
+        probe.assert_called_once()
+
+    def test_poll_async_returns_first_truthy_result(self):
+        """Test that poll_async awaits the probe until it succeeds and sleeps on the event loop"""
+        results = iter([None, 0, "found"])
+
+        async def probe():
+            return next(results)
+
+        poller = Poller(initial_interval=0.001)
+        with patch('robotframework_robocorp_windows.utils.polling.time.sleep') as mock_sleep:
+            self.assertEqual(asyncio.run(poller.poll_async(probe, 5)), "found")
+        mock_sleep.assert_not_called()
+
+        async def never():
+            return None
+
+        self.assertIsNone(asyncio.run(poller.poll_async(never, 0.01)))
+
+class TestDeadline(unittest.TestCase):
+    """Unit tests for Deadline"""
+
+    def test_remaining_and_expired(self):
+        """Test remaining time and expiry"""
+        with patch('robotframework_robocorp_windows.utils.polling.time.monotonic', return_value=100.0):
+            deadline = Deadline(2)
+        with patch('robotframework_robocorp_windows.utils.polling.time.monotonic', return_value=101.5):
+            self.assertAlmostEqual(deadline.remaining(), 0.5)
+            self.assertFalse(deadline.expired())
+        with patch('robotframework_robocorp_windows.utils.polling.time.monotonic', return_value=103.0):
+            self.assertEqual(deadline.remaining(), 0)
+            self.assertTrue(deadline.expired())
+
+    def test_coerce(self):
+        """Test that coerce keeps Deadline instances and wraps numbers"""
+        deadline = Deadline(5)
+        self.assertIs(Deadline.coerce(deadline), deadline)
+        self.assertEqual(Deadline.coerce(3).timeout, 3)
+        self.assertEqual(Deadline.coerce(None).timeout, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.drivers.ui_snapshot import UISnapshot
+from robotframework_robocorp_windows.drivers.snapshot_file import SnapshotWriter, open_snapshot
+from robotframework_robocorp_windows.drivers.snapshot_diff import diff_snapshots
+
+class FakeElement:
+    """In-memory UI element"""
+
+    def __init__(self, name="", automation_id="", class_name="", control_type="Pane", children=()):
+        self.name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.control_type = control_type
+        self.left, self.top, self.right, self.bottom = 0, 0, 10, 10
+        self.children = list(children)
+
+    def iter_children(self):
+        return iter(self.children)
+
+class TestSnapshotDiff(unittest.TestCase):
+    """Unit tests for diff_snapshots"""
+
+    def setUp(self):
+        """Build a calculator-like window with a large unrelated list"""
+        self.result = FakeElement("0", "result", "Static", "Text")
+        self.history = FakeElement("History", "history", "List", "List",
+                                   [FakeElement(f"Entry {i}", "", "ListItem", "ListItem") for i in range(500)])
+        self.keypad = FakeElement("Keypad", "keypad", "Pane", "Pane",
+                                  [FakeElement(str(i), f"num{i}", "Button", "Button") for i in range(10)])
+        self.window = FakeElement("Calculator", "", "Window", "Window", [self.result, self.keypad, self.history])
+        self.before = UISnapshot.capture(self.window)
+
+    def test_identical_trees(self):
+        """Test that unchanged trees produce an empty diff"""
+        diff = diff_snapshots(self.before, UISnapshot.capture(self.window))
+        self.assertFalse(diff)
+        self.assertEqual(diff.to_dict(), {'added': [], 'removed': [], 'changed': []})
+
+    def test_changed_added_removed(self):
+        """Test that changed text, new and removed elements are reported"""
+        self.result.name = "42"
+        self.keypad.children.pop(3)
+        self.window.children.append(FakeElement("Error", "error", "Static", "Text"))
+
+        diff = diff_snapshots(self.before, UISnapshot.capture(self.window)).to_dict()
+
+        self.assertEqual([(c['automation_id'], c['changes']) for c in diff['changed']],
+                         [('result', {'name': ['0', '42']})])
+        self.assertEqual([node['automation_id'] for node in diff['removed']], ['num3'])
+        self.assertEqual([node['automation_id'] for node in diff['added']], ['error'])
+
+    def test_unchanged_subtrees_are_skipped(self):
+        """Test that the comparison does not descend into subtrees with equal hashes"""
+        self.result.name = "42"
+        after = UISnapshot.capture(self.window)
+        with patch.object(UISnapshot, 'content', autospec=True, side_effect=UISnapshot.content) as content:
+            # Hashes are built before counting content reads of the comparison itself
+            self.before.subtree_hash(0)
+            after.subtree_hash(0)
+            content.reset_mock()
+            diff = diff_snapshots(self.before, after)
+        self.assertEqual(len(diff.changed), 1)
+        self.assertLess(content.call_count, 10)
+
+    def test_added_subtree_reported_once(self):
+        """Test that a new subtree is reported by its root only"""
+        self.window.children.append(FakeElement("Dialog", "dlg", "Window", "Window",
+                                                [FakeElement("OK", "ok", "Button", "Button")]))
+        diff = diff_snapshots(self.before, UISnapshot.capture(self.window))
+        self.assertEqual([node.automation_id for node in diff.added], ["dlg"])
+
+    def test_diff_against_saved_snapshot(self):
+        """Test that a memory-mapped snapshot can be compared with a live capture"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "before.bin")
+            SnapshotWriter.save(self.before, path)
+            self.result.name = "7"
+            with open_snapshot(path) as saved:
+                diff = diff_snapshots(saved, UISnapshot.capture(self.window))
+                self.assertEqual([change[2] for change in diff.changed], [{'name': ('0', '7')}])
+
+if __name__ == '__main__':
+    unittest.main()
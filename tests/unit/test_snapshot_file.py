@@ -0,0 +1,149 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.drivers.ui_snapshot import UISnapshot
+from robotframework_robocorp_windows.drivers.snapshot_file import (
+    SnapshotWriter, MappedUISnapshot, open_snapshot, FORMAT_VERSION
+)
+from robotframework_robocorp_windows.utils.exceptions import SnapshotFormatError
+from robotframework_robocorp_windows import snapshot as snapshot_cli
+
+class FakeElement:
+    """In-memory UI element"""
+
+    def __init__(self, name="", automation_id="", class_name="", control_type="Pane", children=()):
+        self.name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.control_type = control_type
+        self.left, self.top, self.right, self.bottom = 1, 2, 3, 4
+        self.children = list(children)
+
+    def iter_children(self):
+        return iter(self.children)
+
+class TestSnapshotFile(unittest.TestCase):
+    """Unit tests for the snapshot file format"""
+
+    def setUp(self):
+        """Build a window with a large grid and a dialog panel"""
+        rows = [FakeElement(f"Row {i}", f"row{i}", "DataItem", "DataItem",
+                            [FakeElement(f"Cell {i}.{j}", "", "Edit", "Edit") for j in range(3)])
+                for i in range(200)]
+        self.window = FakeElement("ERP", "", "Window", "Window", [
+            FakeElement("Grid", "grid", "DataGrid", "DataGrid", rows),
+            FakeElement("Panel", "panel", "Pane", "Pane", [
+                FakeElement("OK", "btnOk", "Button", "Button"),
+                FakeElement("Überprüfen", "btnCheck", "Button", "Button"),
+                FakeElement(None, "btnIcon", "", "Button")
+            ])
+        ])
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "dump.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_streaming_capture_matches_in_memory_snapshot(self):
+        """Test that a streamed file answers queries like the in-memory snapshot"""
+        count = SnapshotWriter.capture(self.window, self.path)
+        in_memory = UISnapshot.capture(self.window)
+        self.assertEqual(count, len(in_memory))
+
+        with open_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), len(in_memory))
+            self.assertEqual(mapped.parents.tolist(), in_memory.parents.tolist())
+            for locator in ("name:OK", "class:Edit", "id:row150 > class:Edit index:2",
+                            "regex:Row 19\\d", "name:Überprüfen", "name:Missing", 'name:""', "regex:.*"):
+                self.assertEqual([(node.index, node.name) for node in mapped.find_all(locator)],
+                                 [(node.index, node.name) for node in in_memory.find_all(locator)], locator)
+            node = mapped.find("name:OK")
+            self.assertEqual((node.class_name, node.automation_id, node.control_type, node.rect),
+                             ("Button", "btnOk", "Button", (1, 2, 3, 4)))
+            self.assertIsNone(mapped.find("id:btnIcon").name)
+
+    def test_save_in_memory_snapshot(self):
+        """Test that an in-memory snapshot can be written and reopened"""
+        SnapshotWriter.save(UISnapshot.capture(self.window), self.path)
+        with open_snapshot(self.path) as mapped:
+            self.assertEqual(mapped.count("class:DataItem"), 200)
+
+    def test_mapped_snapshot_is_read_only(self):
+        """Test that a mapped snapshot cannot be modified"""
+        SnapshotWriter.capture(self.window, self.path)
+        with open_snapshot(self.path) as mapped:
+            self.assertIsInstance(mapped, MappedUISnapshot)
+            with self.assertRaises(TypeError):
+                mapped.add_node(-1, 0)
+
+    def test_rejects_foreign_and_future_files(self):
+        """Test that the magic and version are checked"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 10)
+        with self.assertRaises(SnapshotFormatError):
+            open_snapshot(self.path)
+
+        SnapshotWriter.capture(self.window, self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(8)
+            file.write(struct.pack("<H", FORMAT_VERSION + 1))
+        with self.assertRaises(SnapshotFormatError) as context:
+            open_snapshot(self.path)
+        self.assertIn("version", str(context.exception))
+
+    def test_cli_query(self):
+        """Test the offline query command and its exit codes"""
+        SnapshotWriter.capture(self.window, self.path)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(snapshot_cli.main(["query", self.path, "name:Panel > class:Button"]), 0)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("'OK'", lines[0])
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(snapshot_cli.main(["query", self.path, "name:Missing"]), 1)
+            self.assertEqual(snapshot_cli.main(["query", self.path, "executable:notepad.exe"]), 2)
+
+    def test_cli_query_node_with_missing_attributes(self):
+        """Test that attributes without a value are printed as empty columns"""
+        snapshot = UISnapshot()
+        snapshot.add_node(-1, 0, control_type="Window", name="Main")
+        snapshot.add_node(0, 1, name="OK")
+        SnapshotWriter.save(snapshot, self.path)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(snapshot_cli.main(["query", self.path, "name:OK"]), 0)
+            self.assertEqual(snapshot_cli.main(["info", self.path]), 0)
+        self.assertEqual(output.getvalue().splitlines()[0], "1\t\t'OK'\t\t\t(0, 0, 0, 0)")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import csv
+import os
+import tempfile
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
+from robotframework_robocorp_windows.services.control_service import ControlService
+
+
+class FakeElement:
+    """UI element with the attributes read by the table extraction"""
+
+    def __init__(self, control_type, name='', children=(), item=None):
+        self.control_type = control_type
+        self.name = name
+        self.children = list(children)
+        self.item = item
+
+    def iter_children(self):
+        return iter(self.children)
+
+
+class FakeRowItem:
+    """UIA element behind a row, exposing its runtime id"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def GetRuntimeId(self):
+        return [42, self.index]
+
+
+class FakeVirtualGrid(FakeElement):
+    """Grid that only realizes the rows of the visible page"""
+
+    def __init__(self, row_count, page_size=5, runtime_ids=True, columns=2):
+        super().__init__('DataGridControl', 'Orders', item=self)
+        self.row_count = row_count
+        self.page_size = page_size
+        self.runtime_ids = runtime_ids
+        self.columns = columns
+        self.top = 0
+        self.realized = 0
+        self.scrolls = 0
+        self.header = FakeElement('HeaderControl', children=[
+            FakeElement('HeaderItemControl', f"Column {column}") for column in range(columns)])
+
+    def make_row(self, index):
+        self.realized += 1
+        cells = [FakeElement('TextControl', f"r{index}c{column}") for column in range(self.columns)]
+        item = FakeRowItem(index) if self.runtime_ids else None
+        return FakeElement('DataItemControl', f"Row {index}", cells, item)
+
+    def iter_children(self):
+        last = min(self.top + self.page_size, self.row_count)
+        return iter([self.header] + [self.make_row(index) for index in range(self.top, last)]
+                    + [FakeElement('ScrollBarControl')])
+
+    # ScrollPattern
+    def GetScrollPattern(self):
+        return self
+
+    @property
+    def VerticallyScrollable(self):
+        return self.row_count > self.page_size
+
+    @property
+    def VerticalScrollPercent(self):
+        return 100.0 * self.top / (self.row_count - self.page_size)
+
+    def SetScrollPercent(self, horizontal, vertical):
+        self.top = round((self.row_count - self.page_size) * vertical / 100)
+
+    def Scroll(self, horizontal, vertical):
+        self.scrolls += 1
+        # a page scroll keeps the last visible row on screen
+        self.top = min(self.top + self.page_size - 1, self.row_count - self.page_size)
+
+
+class TestTableExtraction(unittest.TestCase):
+    """Test streaming rows out of virtualized grids"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.driver = RobocorpWindowsDriver()
+        self.control_service = ControlService(self.driver)
+        self.window = Mock()
+
+    def use_grid(self, grid):
+        self.control_service.find_control = Mock(return_value=grid)
+        return grid
+
+    def test_rows_are_read_once_across_scrolled_pages(self):
+        """Test that every row is yielded once even though pages overlap"""
+        grid = self.use_grid(FakeVirtualGrid(row_count=23))
+        grid.top = 10
+
+        rows = list(self.control_service.iter_table_rows(self.window, "id:Orders"))
+
+        self.assertEqual(rows, [[f"r{index}c0", f"r{index}c1"] for index in range(23)])
+        self.control_service.find_control.assert_called_once()
+
+    def test_page_stops_reading_after_limit(self):
+        """Test that a bounded page only scrolls as far as it needs"""
+        grid = self.use_grid(FakeVirtualGrid(row_count=100000))
+
+        rows = self.control_service.extract_table(self.window, "id:Orders", offset=6, limit=3)
+
+        self.assertEqual(rows, [["Column 0", "Column 1"], ["r6c0", "r6c1"], ["r7c0", "r7c1"], ["r8c0", "r8c1"]])
+        self.assertEqual(grid.scrolls, 1)
+        self.assertLess(grid.realized, 20)
+
+    def test_in_memory_result_is_bounded_by_default(self):
+        """Test that returning rows without a limit stops after one default page"""
+        grid = self.use_grid(FakeVirtualGrid(row_count=100000))
+
+        rows = self.control_service.extract_table(self.window, "id:Orders", include_header=False)
+
+        self.assertEqual(len(rows), ControlService.DEFAULT_TABLE_PAGE_SIZE)
+        self.assertEqual(rows[-1], ["r99c0", "r99c1"])
+        self.assertLess(grid.realized, 200)
+
+    def test_csv_export_without_runtime_ids(self):
+        """Test writing a list view without runtime ids straight to a CSV file"""
+        self.use_grid(FakeVirtualGrid(row_count=12, runtime_ids=False, columns=1))
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+        try:
+            count = self.control_service.extract_table(self.window, "id:Orders", path=path)
+            with open(path, newline='', encoding='utf-8') as f:
+                written = list(csv.reader(f))
+        finally:
+            os.remove(path)
+
+        self.assertEqual(count, 12)
+        self.assertEqual(written, [["Column 0"]] + [[f"r{index}c0"] for index in range(12)])
+
+    def test_rows_without_cells_and_without_scrolling(self):
+        """Test a simple list whose items have no cell children and no ScrollPattern"""
+        items = [FakeElement('ListItemControl', name) for name in ("alpha", "beta")]
+        self.use_grid(FakeElement('ListControl', children=items + [FakeElement('ScrollBarControl')]))
+
+        self.assertEqual(self.control_service.extract_table(self.window, "id:List"), [["alpha"], ["beta"]])
+        with self.assertRaises(ValueError):
+            self.control_service.extract_table(self.window, "id:List", offset=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.keywords.async_control_operations import AsyncControlOperationsKeywords
+from robotframework_robocorp_windows.utils.com_apartment import ComApartment
+from robotframework_robocorp_windows.utils.config import Configuration
+from robotframework_robocorp_windows.utils.exceptions import AsyncOperationException
+from robotframework_robocorp_windows.utils.task_registry import AsyncTaskRegistry
+
+
+class TestAsyncTaskRegistry(unittest.TestCase):
+    """Test task ids, retention and backpressure of the async task registry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.registry = AsyncTaskRegistry(max_pending=2, result_ttl=60)
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        """Release blocked tasks and stop the executor"""
+        self.gate.set()
+        self.executor.shutdown(wait=True)
+
+    def test_task_ids_are_monotonic(self):
+        """Test that ids keep increasing after earlier results are collected"""
+        first = self.registry.submit(self.executor, lambda: "first")
+        self.assertEqual(self.registry.result(first, timeout=5), "first")
+        second = self.registry.submit(self.executor, lambda: "second")
+
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(self.registry.result(str(second), timeout=5), "second")
+        self.assertEqual(len(self.registry), 0)
+        with self.assertRaises(ValueError):
+            self.registry.result(first)
+
+    def test_abandoned_results_expire(self):
+        """Test that finished tasks nobody waits for are dropped after the TTL"""
+        with patch('robotframework_robocorp_windows.utils.task_registry.time.monotonic', return_value=100.0):
+            task_id = self.registry.submit(self.executor, lambda: "done")
+            self.registry.get(task_id).future.result(timeout=5)
+            self.assertEqual(self.registry.cleanup(), 0)
+
+        with patch('robotframework_robocorp_windows.utils.task_registry.time.monotonic', return_value=161.0):
+            self.assertEqual(self.registry.cleanup(), 1)
+        self.assertEqual(len(self.registry), 0)
+
+    def test_expiry_only_visits_expired_tasks(self):
+        """Test that cleanup pops expired tasks in finish order and stops at the first live one"""
+        clock = patch('robotframework_robocorp_windows.utils.task_registry.time.monotonic')
+        with clock as monotonic:
+            monotonic.return_value = 100.0
+            collected = self.registry.submit(self.executor, lambda: "collected")
+            self.registry.result(collected, timeout=5)
+            old = self.registry.submit(self.executor, lambda: "old")
+            self.registry.get(old).future.result(timeout=5)
+            monotonic.return_value = 150.0
+            recent = self.registry.submit(self.executor, lambda: "recent")
+            self.registry.get(recent).future.result(timeout=5)
+
+            monotonic.return_value = 170.0
+            self.assertEqual(self.registry.cleanup(), 1)
+            self.assertEqual(len(self.registry._finished), 1)
+            self.assertEqual(self.registry.result(recent, timeout=5), "recent")
+
+    def test_backpressure_when_pending_limit_reached(self):
+        """Test that submitting beyond max_pending waits and then fails"""
+        blocked = [self.registry.submit(self.executor, self.gate.wait) for _ in range(2)]
+
+        with self.assertRaises(AsyncOperationException) as context:
+            self.registry.submit(self.executor, lambda: None, timeout=0.05)
+        self.assertIn("Too many pending async tasks (2/2)", str(context.exception))
+
+        threading.Timer(0.05, self.gate.set).start()
+        task_id = self.registry.submit(self.executor, lambda: "after", timeout=5)
+        self.assertEqual(self.registry.result(task_id, timeout=5), "after")
+        self.assertEqual([self.registry.status(task)['state'] for task in blocked], ['done', 'done'])
+
+    def test_cancel_and_status(self):
+        """Test cancelling queued tasks and reporting the state of each task"""
+        running = self.registry.submit(self.executor, self.gate.wait)
+        queued = self.registry.submit(self.executor, lambda: None)
+
+        self.assertEqual(self.registry.status(queued)['state'], 'pending')
+        self.assertTrue(self.registry.cancel(queued))
+        self.assertFalse(self.registry.cancel(running))
+        with self.assertRaises(ValueError):
+            self.registry.status(queued)
+
+        self.gate.set()
+        self.registry.get(running).future.result(timeout=5)
+        failed = self.registry.submit(self.executor, lambda: 1 / 0)
+        self.registry.get(failed).future.exception(timeout=5)
+
+        status = self.registry.status(failed)
+        self.assertEqual(status['state'], 'failed')
+        self.assertEqual(status['error'], 'division by zero')
+        self.assertEqual(self.registry.pending_count, 0)
+
+
+class TestAsyncControlOperationsKeywords(unittest.TestCase):
+    """Test the async keywords on top of the task registry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.library = Mock()
+        self.library.timeout = 5
+        self.control_service = Mock()
+        config = Configuration({'async_max_workers': 2, 'async_max_pending': 10, 'async_result_ttl': 60})
+        apartment = Mock(spec=ComApartment)
+        self.keywords = AsyncControlOperationsKeywords(self.library, self.control_service, apartment, config)
+
+    def tearDown(self):
+        """Stop the executor"""
+        self.keywords.executor.shutdown(wait=True)
+
+    def test_pool_size_comes_from_configuration(self):
+        """Test that async_max_workers sizes the worker pool"""
+        self.assertEqual(self.keywords.executor._max_workers, 2)
+        self.assertEqual(self.keywords.tasks.max_pending, 10)
+
+    def test_click_status_and_wait(self):
+        """Test that a submitted click reports its status and result"""
+        task_id = self.keywords.async_click_control("name=OK")
+
+        self.assertEqual(self.keywords.wait_for_async_task(task_id), "Successfully clicked control name=OK")
+        self.control_service.click_control.assert_called_once_with(self.control_service.find_control.return_value)
+        with self.assertRaises(ValueError):
+            self.keywords.get_async_task_status(task_id)
+
+    def test_failed_task_is_reported(self):
+        """Test that task failures surface as AsyncOperationException"""
+        self.control_service.find_control.side_effect = RuntimeError("boom")
+        task_id = self.keywords.async_click_control("name=Missing")
+        self.keywords.tasks.get(task_id).future.exception(timeout=5)
+
+        self.assertEqual(self.keywords.get_async_task_status(task_id)['state'], 'failed')
+        with self.assertRaises(AsyncOperationException) as context:
+            self.keywords.wait_for_async_task(task_id)
+        self.assertIn("boom", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.drivers.tree_walker import TreeWalker
+from robotframework_robocorp_windows.drivers import robocorp_driver
+from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
+from robotframework_robocorp_windows.utils.polling import Poller
+
+class FakeElement:
+    """In-memory UI element that counts attribute reads and child enumerations"""
+
+    def __init__(self, name="", automation_id="", class_name="", children=()):
+        self._name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.children = list(children)
+        self.name_reads = 0
+        self.enumerations = 0
+
+    @property
+    def name(self):
+        self.name_reads += 1
+        return self._name
+
+    def iter_children(self):
+        self.enumerations += 1
+        return iter(self.children)
+
+class TestTreeWalker(unittest.TestCase):
+    """Unit tests for TreeWalker"""
+
+    def setUp(self):
+        """Build a small dialog tree"""
+        self.ok = FakeElement("OK", "btnOk", "Button")
+        self.cancel = FakeElement("Cancel", "btnCancel", "Button")
+        self.file_name = FakeElement("", "FileName", "Edit")
+        self.toolbar_ok = FakeElement("OK", "tbOk", "Button")
+        self.toolbar = FakeElement("Toolbar", "toolbar", "Pane", [self.toolbar_ok])
+        self.panel = FakeElement("Panel", "panel", "Pane", [self.file_name, self.ok, self.cancel])
+        self.window = FakeElement("Dialog", "", "Window", [self.toolbar, self.panel])
+        self.walker = TreeWalker()
+
+    def test_walk_is_preorder(self):
+        """Test that walk visits the subtree depth first without the root"""
+        elements = [node.element for node in self.walker.walk(self.window)]
+        self.assertEqual(elements, [self.toolbar, self.toolbar_ok, self.panel, self.file_name, self.ok, self.cancel])
+
+    def test_find_many_single_walk(self):
+        """Test that several locators are resolved while each element is read once"""
+        found = dict((locator.raw, element) for locator, element in
+                     self.walker.find_many(self.window, ["name:Cancel", "id:FileName", "class:Edit"]))
+
+        self.assertEqual(found, {"name:Cancel": self.cancel, "id:FileName": self.file_name, "class:Edit": self.file_name})
+        for element in (self.toolbar, self.toolbar_ok, self.panel, self.file_name, self.ok, self.cancel):
+            self.assertLessEqual(element.name_reads, 1)
+        self.assertEqual(self.window.enumerations, 1)
+        self.assertEqual(self.panel.enumerations, 1)
+
+    def test_find_many_stops_when_all_found(self):
+        """Test that the walk stops as soon as every locator is resolved"""
+        list(self.walker.find_many(self.window, ["name:Toolbar"]))
+        self.assertEqual(self.panel.enumerations, 0)
+
+    def test_chained_locator_matches_ancestors(self):
+        """Test that a chain only matches inside the given ancestor"""
+        found = dict((locator.raw, element) for locator, element in
+                     self.walker.find_many(self.window, ["name:Panel > name:OK", "id:toolbar > class:Button"]))
+        self.assertIs(found["name:Panel > name:OK"], self.ok)
+        self.assertIs(found["id:toolbar > class:Button"], self.toolbar_ok)
+
+    def test_multiple_criteria_and_index(self):
+        """Test that all criteria of a step must match and index picks the Nth match"""
+        found = dict((locator.raw, element) for locator, element in
+                     self.walker.find_many(self.window, ["name:OK class:Button index:2", "class:Button id:btnCancel"]))
+        self.assertIs(found["name:OK class:Button index:2"], self.ok)
+        self.assertIs(found["class:Button id:btnCancel"], self.cancel)
+
+    def test_max_depth(self):
+        """Test that elements below max_depth are not visited"""
+        walker = TreeWalker(max_depth=1)
+        self.assertEqual(dict(walker.find_many(self.window, ["name:Cancel"])), {})
+
+    def test_find_all_max_results(self):
+        """Test that find_all yields lazily and stops at max_results"""
+        self.assertEqual(list(self.walker.find_all(self.window, "class:Button")),
+                         [self.toolbar_ok, self.ok, self.cancel])
+        self.assertEqual(list(self.walker.find_all(self.window, "class:Button", max_results=1)), [self.toolbar_ok])
+        self.assertEqual(self.panel.enumerations, 1)
+
+    def test_is_walkable(self):
+        """Test which locators can be evaluated during a walk"""
+        self.assertTrue(self.walker.is_walkable("OK"))
+        self.assertTrue(self.walker.is_walkable("name:Panel > class:Button index:2"))
+        self.assertFalse(self.walker.is_walkable("xpath://Button"))
+        self.assertFalse(self.walker.is_walkable("index:1 > name:OK"))
+        self.assertFalse(self.walker.is_walkable("invalid:OK"))
+
+    def test_robocorp_only_syntax_is_not_walkable(self):
+        """Test that unknown keys and and/or operators are left to robocorp-windows"""
+        self.assertFalse(self.walker.is_walkable("name:OK type:Button"))
+        self.assertFalse(self.walker.is_walkable("name:OK and class:Button"))
+        self.assertFalse(self.walker.is_walkable("Panel > name:OK or name:Cancel"))
+        self.assertTrue(self.walker.is_walkable('name:"Save and Close" class:Button'))
+        self.assertEqual(list(self.walker.find_all(self.window, "name:OK class:Button")), [self.toolbar_ok, self.ok])
+
+class TestDriverIterControls(unittest.TestCase):
+    """Unit tests for RobocorpWindowsDriver.iter_controls over a fake tree"""
+
+    def setUp(self):
+        """Build a list view with many items"""
+        self.items = [FakeElement(f"Item {i}", f"item{i}", "ListItem") for i in range(1000)]
+        self.list_view = FakeElement("List", "list", "List", self.items)
+        self.window = FakeElement("Main", "", "Window", [self.list_view])
+        self.driver = RobocorpWindowsDriver(poller=Poller(initial_interval=0.001, max_interval=0.01))
+
+    def test_streams_all_matches_in_one_walk(self):
+        """Test that every distinct match is returned from a single traversal"""
+        controls = list(self.driver.iter_controls(self.window, "class:ListItem", timeout=1))
+        self.assertEqual(controls, self.items)
+        self.assertEqual(self.list_view.enumerations, 1)
+
+    def test_consumer_can_stop_early(self):
+        """Test that the generator only reads as far as the consumer iterates"""
+        controls = self.driver.iter_controls(self.window, "class:ListItem", timeout=1)
+        self.assertEqual([next(controls) for _ in range(3)], self.items[:3])
+        self.assertEqual(sum(item.name_reads for item in self.items), 0)
+        self.assertEqual(self.items[10].enumerations, 0)
+
+    def test_max_results(self):
+        """Test that max_results bounds the number of returned controls"""
+        self.assertEqual(list(self.driver.iter_controls(self.window, "class:ListItem", timeout=1, max_results=5)),
+                         self.items[:5])
+        self.assertEqual(list(self.driver.iter_controls(self.window, "class:ListItem", timeout=1, max_results=0)), [])
+
+    def test_xpath_locators(self):
+        """Test that xpath locators are evaluated by the built-in XPath engine"""
+        self.assertIs(self.driver.find_control(self.window, "xpath://*[@ClassName='ListItem'][3]", timeout=1), self.items[2])
+        self.assertEqual(list(self.driver.iter_controls(self.window, "xpath://*[starts-with(@Name, 'Item 99')]",
+                                                        timeout=1, max_results=2)), [self.items[99], self.items[990]])
+
+    def test_robocorp_only_syntax_falls_back_to_find_many(self):
+        """Test that locators with robocorp-only syntax are passed to find_many unchanged"""
+        window = type('FakeWindow', (robocorp_driver.WindowElement,), {})()
+        window.iter_children = self.window.iter_children
+        window.find_many = Mock(return_value=self.items[:2])
+
+        controls = list(self.driver.iter_controls(window, "name:Item 1 type:ListItem", timeout=1))
+
+        self.assertEqual(controls, self.items[:2])
+        window.find_many.assert_called_once()
+        self.assertEqual(window.find_many.call_args[0][0], "name:Item 1 type:ListItem")
+
+    def test_robocorp_find_is_retried_by_the_poller(self):
+        """Test that each robocorp-windows lookup is a single attempt and the poller owns the retries"""
+        control = Mock()
+        window = type('FakeWindow', (robocorp_driver.WindowElement,), {})()
+        window.find = Mock(side_effect=[robocorp_driver.ElementNotFound(), robocorp_driver.ElementNotFound(), control])
+
+        self.assertIs(self.driver.find_control(window, "name:OK type:Button", timeout=5), control)
+
+        self.assertEqual(window.find.call_count, 3)
+        for call in window.find.call_args_list:
+            self.assertEqual(call[1]["timeout"], RobocorpWindowsDriver.PROBE_TIMEOUT)
+
+    def test_no_match_returns_after_timeout(self):
+        """Test that a locator without matches yields nothing once the timeout expires"""
+        self.assertEqual(list(self.driver.iter_controls(self.window, "name:Missing", timeout=0.05)), [])
+
+if __name__ == '__main__':
+    unittest.main()
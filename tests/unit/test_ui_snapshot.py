@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.drivers.tree_walker import TreeWalker
+from robotframework_robocorp_windows.drivers.ui_snapshot import UISnapshot
+
+class FakeElement:
+    """In-memory UI element that counts attribute reads"""
+
+    def __init__(self, name="", automation_id="", class_name="", control_type="Pane", rect=(0, 0, 0, 0), children=()):
+        self._name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.control_type = control_type
+        self.left, self.top, self.right, self.bottom = rect
+        self.children = list(children)
+        self.name_reads = 0
+
+    @property
+    def name(self):
+        self.name_reads += 1
+        return self._name
+
+    def iter_children(self):
+        return iter(self.children)
+
+class TestUISnapshot(unittest.TestCase):
+    """Unit tests for UISnapshot"""
+
+    def setUp(self):
+        """Capture a small dialog tree"""
+        self.items = [FakeElement(f"Item {i}", f"item{i}", "ListItem", "ListItem") for i in range(50)]
+        self.list_view = FakeElement("List", "list", "SysListView32", "List", children=self.items)
+        self.ok = FakeElement("OK", "btnOk", "Button", "Button", rect=(10, 20, 90, 40))
+        self.panel = FakeElement("Panel", "panel", "Pane", children=[self.ok, FakeElement("Cancel", "btnCancel", "Button", "Button")])
+        self.window = FakeElement("Dialog", "", "Window", "Window", children=[self.list_view, self.panel])
+        self.snapshot = UISnapshot.capture(self.window)
+
+    def test_capture_columns(self):
+        """Test that the tree is stored as parallel arrays in pre-order"""
+        self.assertEqual(len(self.snapshot), 55)
+        self.assertEqual(self.snapshot.parents[:3].tolist(), [-1, 0, 1])
+        self.assertEqual(self.snapshot.depths[:3].tolist(), [0, 1, 2])
+        node = self.snapshot.find("name:OK")
+        self.assertEqual((node.name, node.class_name, node.automation_id, node.control_type),
+                         ("OK", "Button", "btnOk", "Button"))
+        self.assertEqual(node.rect, (10, 20, 90, 40))
+        self.assertEqual(node.parent.name, "Panel")
+
+    def test_strings_are_interned(self):
+        """Test that repeated strings are stored once"""
+        self.assertEqual(self.snapshot.strings.count("ListItem"), 1)
+        self.assertEqual(len(set(self.snapshot.class_names[2:52])), 1)
+
+    def test_queries_do_not_touch_live_tree(self):
+        """Test that lookups run against the snapshot only"""
+        reads = self.ok.name_reads
+        for _ in range(10):
+            self.assertIsNotNone(self.snapshot.find("name:OK"))
+        self.assertEqual(self.ok.name_reads, reads)
+
+    def test_index_lookup(self):
+        """Test class/id/name lookups, chains and index criteria"""
+        self.assertEqual(self.snapshot.count("class:ListItem"), 50)
+        self.assertEqual(self.snapshot.find("id:item7").name, "Item 7")
+        self.assertEqual(self.snapshot.find("class:ListItem index:3").name, "Item 2")
+        self.assertEqual(self.snapshot.find("name:Panel > class:Button").name, "OK")
+        self.assertIsNone(self.snapshot.find("name:List > name:OK"))
+        self.assertIsNone(self.snapshot.find("name:Missing"))
+        # The root itself is never matched, like a live search
+        self.assertIsNone(self.snapshot.find("name:Dialog"))
+
+    def test_regex_and_max_results(self):
+        """Test regex criteria and result limits"""
+        nodes = list(self.snapshot.find_all("regex:Item 1\\d$", max_results=3))
+        self.assertEqual([node.name for node in nodes], ["Item 10", "Item 11", "Item 12"])
+
+    def test_missing_attributes_match_live_tree(self):
+        """Test that attributes without a value are never matched, as on the live tree"""
+        unnamed = FakeElement(None, "unnamed", "Edit", "Edit")
+        empty = FakeElement("", "empty", "Edit", "Edit")
+        window = FakeElement("Dialog", "", "Window", "Window", children=[unnamed, empty])
+        snapshot = UISnapshot.capture(window)
+
+        for locator in ("regex:.*", 'name:""', "class:Edit"):
+            self.assertEqual([node.automation_id for node in snapshot.find_all(locator)],
+                             [element.automation_id for element in TreeWalker().find_all(window, locator)], locator)
+        self.assertIsNone(snapshot.find("id:unnamed").name)
+        self.assertEqual(snapshot.count("xpath://Edit[@Name='']"), 2)
+
+    def test_unsupported_locator(self):
+        """Test that locators needing the live tree are rejected"""
+        with self.assertRaises(ValueError):
+            self.snapshot.find("executable:notepad.exe")
+
+    def test_max_depth(self):
+        """Test that the capture depth is limited"""
+        snapshot = UISnapshot.capture(self.window, max_depth=1)
+        self.assertEqual(len(snapshot), 3)
+        self.assertIsNone(snapshot.find("name:OK"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -119,11 +119,27 @@ class TestWindowManagementKeywords(unittest.TestCase):
         
         # Verify the result
         self.assertEqual(result, "app_123")
-        self.window_management.window_service.launch_application.assert_called_once_with("test.exe", 5)
+        self.window_management.window_service.launch_application.assert_called_once_with("test.exe", 5, wait_for_idle=False)
         self.window_management.window_service.get_window_title.assert_called_once_with(mock_window)
         self.mock_library.cache.register.assert_called()
         self.mock_library._log.assert_called()
     
+    def test_launch_applications(self):
+        """Test Launch Applications registers every application and returns ids in order"""
+        first_window, second_window = Mock(), Mock()
+        self.window_management.window_service.launch_applications = Mock(
+            return_value=[("a.exe", first_window), ("b.exe", None), ("c.exe", second_window)])
+        self.window_management.window_service.get_window_title = Mock(return_value="App")
+        self.mock_library.cache.register = Mock(side_effect=["1", "2", "3"])
+        
+        result = self.window_management.launch_applications("a.exe", "b.exe", "c.exe")
+        
+        self.assertEqual(result, ["1", "2", "3"])
+        self.window_management.window_service.launch_applications.assert_called_once_with(
+            ("a.exe", "b.exe", "c.exe"), 5, wait_for_idle=False)
+        self.assertEqual(self.mock_library.cache.register.call_args_list[1][0][0], {"executable": "b.exe", "window": None})
+        self.assertIs(self.mock_library.current_window, second_window)
+    
     def test_connect_to_application(self):
         """Test connect_to_application keyword"""
         # Mock the window and service
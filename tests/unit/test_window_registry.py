@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import Mock
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.services.window_registry import WindowRegistry
+from robotframework_robocorp_windows.utils.exceptions import WindowNotFoundError
+from robotframework_robocorp_windows.utils.polling import Poller
+
+
+class FakeWindow:
+    """Top-level window with the attributes read by the registry"""
+
+    def __init__(self, handle, pid, executable, name, class_name):
+        self.handle = handle
+        self.pid = pid
+        self.executable = executable
+        self.name = name
+        self.class_name = class_name
+        self.open = True
+
+
+class FakeDesktopDriver:
+    """Driver enumerating a mutable list of fake windows"""
+
+    def __init__(self, windows):
+        self.windows = windows
+        self.enumerations = 0
+
+    def list_windows(self):
+        self.enumerations += 1
+        return [window for window in self.windows if window.open]
+
+    def get_window_info(self, window):
+        return {"handle": window.handle, "pid": window.pid, "executable": window.executable,
+                "title": window.name, "class_name": window.class_name}
+
+    def window_exists(self, window):
+        return window.open
+
+    def get_window_title(self, window):
+        return window.name
+
+
+class TestWindowRegistry(unittest.TestCase):
+    """Test indexing and incremental refresh of top-level windows"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.notepad = FakeWindow(0x10, 100, "C:\\Windows\\notepad.exe", "Untitled - Notepad", "Notepad")
+        self.calc = FakeWindow(0x20, 200, "C:\\Windows\\calc.exe", "Calculator", "ApplicationFrameWindow")
+        self.second_notepad = FakeWindow(0x30, 300, "C:\\Windows\\notepad.exe", "notes.txt - Notepad", "Notepad")
+        self.driver = FakeDesktopDriver([self.notepad, self.calc, self.second_notepad])
+        self.registry = WindowRegistry(self.driver, Poller(initial_interval=0.001))
+
+    def test_lookup_intersects_indexes_in_enumeration_order(self):
+        """Test lookups by executable name, full path, pid and combined criteria"""
+        self.registry.refresh()
+
+        self.assertEqual([entry.window for entry in self.registry.lookup(executable="NOTEPAD.EXE")],
+                         [self.notepad, self.second_notepad])
+        self.assertEqual([entry.window for entry in self.registry.lookup(executable="c:\\windows\\calc.exe")],
+                         [self.calc])
+        self.assertEqual([entry.window for entry in self.registry.lookup(pid="300")], [self.second_notepad])
+        self.assertEqual([entry.window for entry in self.registry.lookup(class_name="Notepad", title="notes.txt - Notepad")],
+                         [self.second_notepad])
+        self.assertEqual(self.registry.lookup(class_name="Notepad", pid=200), [])
+
+    def test_refresh_is_incremental(self):
+        """Test that refresh only reindexes windows that were added, changed or removed"""
+        self.assertEqual(self.registry.refresh(), {"added": 3, "changed": 0, "removed": 0})
+
+        self.notepad.name = "draft.txt - Notepad"
+        self.calc.open = False
+        self.driver.windows.append(FakeWindow(0x40, 400, "C:\\Tools\\app.exe", "App", "AppWindow"))
+        self.assertEqual(self.registry.refresh(), {"added": 1, "changed": 1, "removed": 1})
+
+        self.assertEqual(self.registry.lookup(title="Untitled - Notepad"), [])
+        self.assertEqual([entry.window for entry in self.registry.lookup(title="draft.txt - Notepad")], [self.notepad])
+        self.assertEqual(self.registry.lookup(executable="calc.exe"), [])
+        self.assertEqual(len(self.registry), 3)
+
+    def test_find_window_uses_index_until_window_changes(self):
+        """Test that known windows resolve without enumeration and stale entries trigger a refresh"""
+        self.assertIs(self.registry.find_window(title="Calculator", timeout=0), self.calc)
+        self.assertIs(self.registry.find_window(executable="notepad.exe", timeout=0), self.notepad)
+        self.assertEqual(self.driver.enumerations, 1)
+
+        # a closed window is skipped in favour of the next live indexed window
+        self.notepad.open = False
+        self.assertIs(self.registry.find_window(executable="notepad.exe", timeout=0), self.second_notepad)
+        self.assertEqual(self.driver.enumerations, 1)
+
+        self.calc.name = "Calculator - Scientific"
+        with self.assertRaises(WindowNotFoundError) as context:
+            self.registry.find_window(title="Calculator", timeout=0)
+        self.assertIn("title='Calculator'", str(context.exception))
+        self.assertEqual(self.driver.enumerations, 2)
+
+    def test_is_open_enumerates_desktop(self):
+        """Test that closing checks do not trust the existing indexes"""
+        self.registry.refresh()
+        self.calc.open = False
+
+        self.assertFalse(self.registry.is_open(title="Calculator"))
+        self.assertTrue(self.registry.is_open(class_name="Notepad"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, call
 import sys
 
 # Mock the entire robocorp module at the sys.modules level
@@ -51,7 +51,7 @@ sys.modules['robocorp.windows'] = mock_robocorp
 # Now import our library components
 from robotframework_robocorp_windows.services.window_service import WindowService
 from robotframework_robocorp_windows.drivers.robocorp_driver import RobocorpWindowsDriver
-from robotframework_robocorp_windows.utils.exceptions import WindowNotFoundError
+from robotframework_robocorp_windows.utils.exceptions import WindowNotFoundError, ApplicationLaunchError
 
 class TestWindowService(unittest.TestCase):
     """Unit tests for WindowService"""
@@ -62,77 +62,156 @@ class TestWindowService(unittest.TestCase):
         self.mock_driver = Mock(spec=RobocorpWindowsDriver)
         self.window_service = WindowService(self.mock_driver)
     
+    def _launched_process(self, pid=4321, exit_codes=(None,)):
+        """Make the mocked driver return a process whose poll() yields the given exit codes"""
+        process = Mock()
+        process.pid = pid
+        process.poll.side_effect = list(exit_codes) + [exit_codes[-1]] * 100
+        self.mock_driver.launch_application.return_value = process
+        self.mock_driver.get_executable_name.side_effect = RobocorpWindowsDriver.get_executable_name
+        return process
+    
     def test_launch_application_success(self):
-        """Test launch_application with successful window find"""
-        # Mock driver methods
-        self.mock_driver.launch_application.return_value = "notepad.exe"
-        self.mock_driver.find_window_by_executable.return_value = Mock()
-        self.mock_driver.get_window_title.return_value = "Notepad"
+        """Test launch_application returns as soon as a window of the launched process appears"""
+        self._launched_process(pid=4321)
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 4321, "Notepad", "Notepad"))
         
         # Call the method
-        executable_name, window = self.window_service.launch_application("notepad.exe")
+        executable_name, window = self.window_service.launch_application("C:\\Windows\\notepad.exe")
         
         # Verify
         self.assertEqual(executable_name, "notepad.exe")
-        self.assertIsNotNone(window)
-        self.mock_driver.launch_application.assert_called_once_with("notepad.exe")
-        self.mock_driver.find_window_by_executable.assert_called_once()
+        self.assertIs(window, windows[2])
+        self.mock_driver.launch_application.assert_called_once_with("C:\\Windows\\notepad.exe")
+        self.mock_driver.list_windows.assert_called_once()
     
     def test_launch_application_window_not_found(self):
         """Test launch_application when window is not found"""
-        # Mock driver methods
-        self.mock_driver.launch_application.return_value = "notepad.exe"
-        self.mock_driver.find_window_by_executable.side_effect = WindowNotFoundError("Window not found")
+        self._launched_process(pid=4321)
+        self._set_desktop((1, 100, "Other", "OtherClass"))
         
         # Call the method
-        executable_name, window = self.window_service.launch_application("notepad.exe")
+        executable_name, window = self.window_service.launch_application("notepad.exe", timeout=0.05)
         
         # Verify
         self.assertEqual(executable_name, "notepad.exe")
         self.assertIsNone(window)
         self.mock_driver.launch_application.assert_called_once_with("notepad.exe")
     
+    def test_launch_application_fails_fast_when_process_exits(self):
+        """Test that a process exiting with an error code fails without waiting for the timeout"""
+        self._launched_process(pid=4321, exit_codes=(None, 3))
+        self._set_desktop((1, 100, "Other", "OtherClass"))
+        
+        with self.assertRaises(ApplicationLaunchError) as context:
+            self.window_service.launch_application("notepad.exe", timeout=30)
+        self.assertIn("exited with code 3", str(context.exception))
+    
+    def test_launch_application_follows_launcher_by_executable(self):
+        """Test that a launcher exiting cleanly hands over to a window of the same executable"""
+        self._launched_process(pid=4321, exit_codes=(0,))
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 5555, "Notepad", "Notepad"))
+        
+        executable_name, window = self.window_service.launch_application("C:\\Apps\\app.exe", timeout=0)
+        
+        self.assertIs(window, windows[1])
+    
+    def test_launch_application_waits_for_idle(self):
+        """Test that wait_for_idle holds readiness until the process is idle"""
+        process = self._launched_process(pid=4321)
+        windows = self._set_desktop((2, 4321, "Notepad", "Notepad"))
+        self.mock_driver.is_input_idle.side_effect = [False, False, True]
+        
+        executable_name, window = self.window_service.launch_application("notepad.exe", timeout=5, wait_for_idle=True)
+        
+        self.assertIs(window, windows[2])
+        self.assertEqual(self.mock_driver.is_input_idle.call_count, 3)
+        self.mock_driver.is_input_idle.assert_called_with(process)
+    
+    def test_launch_applications_waits_concurrently(self):
+        """Test that all processes are started before waiting and share one enumeration per round"""
+        first, second, third = Mock(pid=11), Mock(pid=22), Mock(pid=33)
+        for process in (first, second, third):
+            process.poll.return_value = None
+        self.mock_driver.launch_application.side_effect = [first, second, third]
+        self.mock_driver.get_executable_name.side_effect = RobocorpWindowsDriver.get_executable_name
+        windows = self._set_desktop((1, 22, "Second", "App"), (2, 11, "First", "App"))
+        
+        launches = self.window_service.launch_applications(["a.exe", "b.exe", "c.exe"], timeout=0.05)
+        
+        self.assertEqual(launches, [("a.exe", windows[2]), ("b.exe", windows[1]), ("c.exe", None)])
+        self.assertEqual(self.mock_driver.launch_application.call_count, 3)
+        # the ready windows are found after the first enumeration, only the missing one keeps polling
+        self.assertEqual(first.poll.call_count, 2)
+        self.assertGreater(self.mock_driver.list_windows.call_count, 1)
+        self.assertEqual(third.poll.call_count, 2 * self.mock_driver.list_windows.call_count)
+    
+    def test_launch_applications_terminates_started_processes_on_failure(self):
+        """Test that a failing launch terminates the processes that were already started"""
+        first, second = Mock(pid=11), Mock(pid=22)
+        first.poll.return_value = None
+        second.poll.return_value = 5
+        self.mock_driver.get_executable_name.side_effect = RobocorpWindowsDriver.get_executable_name
+        self._set_desktop((1, 100, "Other", "OtherClass"))
+        
+        self.mock_driver.launch_application.side_effect = [first, second]
+        with self.assertRaises(ApplicationLaunchError):
+            self.window_service.launch_applications(["a.exe", "b.exe"], timeout=30)
+        self.assertEqual(self.mock_driver.terminate_application.call_args_list, [call(first), call(second)])
+        
+        self.mock_driver.terminate_application.reset_mock()
+        self.mock_driver.launch_application.side_effect = [first, ApplicationLaunchError("missing.exe")]
+        with self.assertRaises(ApplicationLaunchError):
+            self.window_service.launch_applications(["a.exe", "missing.exe"], timeout=30)
+        self.mock_driver.terminate_application.assert_called_once_with(first)
+    
+    def _set_desktop(self, *windows):
+        """Make the mocked driver enumerate the given (handle, pid, title, class_name) windows"""
+        elements = {}
+        for handle, pid, title, class_name in windows:
+            element = Mock()
+            element.info = {"handle": handle, "pid": pid, "executable": "C:\\Apps\\app.exe",
+                            "title": title, "class_name": class_name}
+            elements[handle] = element
+        self.mock_driver.list_windows.return_value = list(elements.values())
+        self.mock_driver.get_window_info.side_effect = lambda window: window.info
+        self.mock_driver.get_window_title.side_effect = lambda window: window.info["title"]
+        self.mock_driver.window_exists.return_value = True
+        return elements
+    
     def test_connect_to_application_with_title(self):
         """Test connect_to_application with title"""
-        # Mock driver methods
-        mock_window = Mock()
-        self.mock_driver.find_window_by_locator.return_value = mock_window
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 200, "TestApp", "TestClass"))
         
         # Call the method
         locator, window = self.window_service.connect_to_application(title="TestApp")
         
         # Verify
         self.assertEqual(locator, "name:TestApp")
-        self.assertEqual(window, mock_window)
-        self.mock_driver.find_window_by_locator.assert_called_once_with("name:TestApp", 10)
+        self.assertIs(window, windows[2])
+        self.mock_driver.list_windows.assert_called_once()
     
     def test_connect_to_application_with_class_name(self):
         """Test connect_to_application with class name"""
-        # Mock driver methods
-        mock_window = Mock()
-        self.mock_driver.find_window_by_locator.return_value = mock_window
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 200, "TestApp", "TestClass"))
         
         # Call the method
         locator, window = self.window_service.connect_to_application(class_name="TestClass")
         
         # Verify
         self.assertEqual(locator, "class:TestClass")
-        self.assertEqual(window, mock_window)
-        self.mock_driver.find_window_by_locator.assert_called_once_with("class:TestClass", 10)
+        self.assertIs(window, windows[2])
     
     def test_connect_to_application_with_process(self):
         """Test connect_to_application with process"""
-        # Mock driver methods
-        mock_window = Mock()
-        self.mock_driver.find_window_by_locator.return_value = mock_window
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 1234, "TestApp", "TestClass"))
         
         # Call the method
-        locator, window = self.window_service.connect_to_application(process=1234)
+        locator, window = self.window_service.connect_to_application(process="1234")
         
         # Verify
         self.assertEqual(locator, "pid:1234")
-        self.assertEqual(window, mock_window)
-        self.mock_driver.find_window_by_locator.assert_called_once_with("pid:1234", 10)
+        self.assertIs(window, windows[2])
     
     def test_connect_to_application_without_locator(self):
         """Test connect_to_application without any locator"""
@@ -140,42 +219,53 @@ class TestWindowService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.window_service.connect_to_application()
     
+    def test_connect_to_application_window_not_found(self):
+        """Test connect_to_application when no window matches"""
+        self._set_desktop((1, 100, "Other", "OtherClass"))
+        
+        with self.assertRaises(WindowNotFoundError) as context:
+            self.window_service.connect_to_application(title="TestApp", timeout=0)
+        self.assertIn("title='TestApp'", str(context.exception))
+    
     def test_set_current_window_with_title(self):
         """Test set_current_window with title"""
-        # Mock driver methods
-        mock_window = Mock()
-        self.mock_driver.find_window_by_locator.return_value = mock_window
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 200, "TestApp", "TestClass"))
         
         # Call the method
         window = self.window_service.set_current_window(title="TestApp")
         
         # Verify
-        self.assertEqual(window, mock_window)
-        self.mock_driver.find_window_by_locator.assert_called_once_with("name:TestApp", 10)
+        self.assertIs(window, windows[2])
     
     def test_set_current_window_without_locator(self):
         """Test set_current_window without any locator"""
-        # Mock driver methods
-        mock_window = Mock()
-        self.mock_driver.find_window_by_locator.return_value = mock_window
+        windows = self._set_desktop((1, 100, "Other", "OtherClass"), (2, 200, "TestApp", "TestClass"))
         
         # Call the method
         window = self.window_service.set_current_window()
         
-        # Verify
-        self.assertEqual(window, mock_window)
-        self.mock_driver.find_window_by_locator.assert_called_once_with("regex:.*", 10)
+        # Verify the first top-level window is used
+        self.assertIs(window, windows[1])
+    
+    def test_switching_windows_reuses_registry(self):
+        """Test that switching between known windows does not enumerate the desktop again"""
+        windows = self._set_desktop((1, 100, "Editor", "EditorClass"), (2, 200, "Viewer", "ViewerClass"))
+        
+        for _ in range(3):
+            self.assertIs(self.window_service.set_current_window(title="Editor"), windows[1])
+            self.assertIs(self.window_service.set_current_window(title="Viewer"), windows[2])
+        
+        self.mock_driver.list_windows.assert_called_once()
     
     def test_window_should_be_open_with_locator(self):
         """Test window_should_be_open with locator"""
-        # Mock driver methods
-        self.mock_driver.get_window_by_locator.return_value = Mock()
+        self._set_desktop((1, 100, "TestApp", "TestClass"))
         
         # Call the method (should not raise)
         self.window_service.window_should_be_open(title="TestApp", timeout=1)
         
         # Verify
-        self.mock_driver.get_window_by_locator.assert_called()
+        self.mock_driver.list_windows.assert_called()
     
     def test_window_should_be_open_with_current_window(self):
         """Test window_should_be_open with current window"""
@@ -191,14 +281,15 @@ class TestWindowService(unittest.TestCase):
     
     def test_window_should_be_closed_with_locator(self):
         """Test window_should_be_closed with locator"""
-        # Mock driver methods
-        self.mock_driver.get_window_by_locator.return_value = None
+        self._set_desktop((1, 100, "TestApp", "TestClass"))
+        self.window_service.window_should_be_open(title="TestApp", timeout=1)
+        self._set_desktop((2, 200, "Other", "OtherClass"))
         
-        # Call the method (should not raise)
+        # Call the method (should not raise even though the registry still knew the window)
         self.window_service.window_should_be_closed(title="TestApp", timeout=1)
         
         # Verify
-        self.mock_driver.get_window_by_locator.assert_called()
+        self.assertEqual(self.mock_driver.list_windows.call_count, 2)
     
     def test_window_should_be_closed_with_current_window(self):
         """Test window_should_be_closed with current window"""
@@ -212,5 +303,39 @@ class TestWindowService(unittest.TestCase):
         # Verify
         self.mock_driver.window_exists.assert_called_once_with(mock_window)
 
+class TestDriverInputIdle(unittest.TestCase):
+    """Unit tests for RobocorpWindowsDriver.is_input_idle"""
+    
+    def setUp(self):
+        """Set up a driver with fake Win32 APIs"""
+        self.driver = RobocorpWindowsDriver()
+        self.windll = Mock()
+        self.windll.kernel32.OpenProcess.return_value = 77
+        self.process = Mock(pid=4321, spec=["pid"])
+    
+    def test_opens_and_closes_a_handle_from_the_pid(self):
+        """Test that the check opens its own process handle and always closes it"""
+        self.windll.user32.WaitForInputIdle.return_value = RobocorpWindowsDriver.WAIT_TIMEOUT
+        with patch('ctypes.windll', self.windll, create=True):
+            self.assertFalse(self.driver.is_input_idle(self.process))
+            self.windll.user32.WaitForInputIdle.return_value = 0
+            self.assertTrue(self.driver.is_input_idle(self.process))
+        
+        self.windll.kernel32.OpenProcess.assert_called_with(
+            RobocorpWindowsDriver.SYNCHRONIZE | RobocorpWindowsDriver.PROCESS_QUERY_LIMITED_INFORMATION, False, 4321)
+        self.windll.user32.WaitForInputIdle.assert_called_with(77, 0)
+        self.assertEqual(self.windll.kernel32.CloseHandle.call_count, 2)
+    
+    def test_fallback_when_process_cannot_be_opened(self):
+        """Test that a process that cannot be opened, or a platform without Win32, counts as idle"""
+        self.windll.kernel32.OpenProcess.return_value = 0
+        with patch('ctypes.windll', self.windll, create=True):
+            self.assertTrue(self.driver.is_input_idle(self.process))
+        self.windll.user32.WaitForInputIdle.assert_not_called()
+        self.windll.kernel32.CloseHandle.assert_not_called()
+        
+        with patch('ctypes.windll', None, create=True):
+            self.assertTrue(self.driver.is_input_idle(self.process))
+
 if __name__ == '__main__':
     unittest.main()
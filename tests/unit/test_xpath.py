@@ -0,0 +1,143 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+
+# Mock the robocorp module at the sys.modules level so the package can be imported
+class MockRobocorpModule:
+    """Minimal mock robocorp module"""
+    class ElementNotFound(Exception):
+        """Mock ElementNotFound"""
+        pass
+
+    class WindowElement:
+        """Mock WindowElement"""
+        pass
+
+    desktop = Mock()
+    find_window = Mock()
+    find_windows = Mock()
+
+mock_robocorp = MockRobocorpModule()
+mock_robocorp.windows = mock_robocorp
+sys.modules.setdefault('robocorp', mock_robocorp)
+sys.modules.setdefault('robocorp.windows', mock_robocorp)
+
+from robotframework_robocorp_windows.utils.xpath import compile_xpath, XPathSyntaxError
+from robotframework_robocorp_windows.utils.locator_utils import locator_utils
+from robotframework_robocorp_windows.drivers.tree_walker import TreeWalker
+from robotframework_robocorp_windows.drivers.ui_snapshot import UISnapshot, SnapshotXPathTree
+
+class FakeElement:
+    """In-memory UI element"""
+
+    def __init__(self, name="", automation_id="", class_name="", control_type="PaneControl", width=10, children=()):
+        self.name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.control_type = control_type
+        self.left, self.top, self.right, self.bottom = 0, 0, width, 10
+        self.children = list(children)
+
+    def iter_children(self):
+        return iter(self.children)
+
+def build_window():
+    """Build a WPF-like window"""
+    rows = [FakeElement(f"Row {i}", f"row{i}", "DataGridRow", "DataItemControl",
+                        children=[FakeElement(f"Cell {i}", "", "TextBlock", "TextControl")]) for i in range(20)]
+    return FakeElement("Main", "main", "Window", "WindowControl", children=[
+        FakeElement("Toolbar", "toolbar", "ToolBar", "ToolBarControl", children=[
+            FakeElement("Save", "save", "Button", "ButtonControl"),
+            FakeElement("Save As", "saveAs", "Button", "ButtonControl", width=50),
+            FakeElement("Print", "print", "Button", "ButtonControl"),
+        ]),
+        FakeElement("Grid", "grid", "DataGrid", "DataGridControl", children=rows),
+        FakeElement("Status", "status", "StatusBar", "StatusBarControl", children=[
+            FakeElement("Ready", "", "TextBlock", "TextControl")
+        ]),
+    ])
+
+class TestXPath(unittest.TestCase):
+    """XPath evaluation against both the live tree adapter and snapshots"""
+
+    EXPECTATIONS = {
+        "//Button": ["Save", "Save As", "Print"],
+        "//Button[@Name='Print']": ["Print"],
+        "//Button[2]": ["Save As"],
+        "//Button[last()]": ["Print"],
+        "//Button[position() < 3]": ["Save", "Save As"],
+        "//Button[contains(@Name, 'Save')]": ["Save", "Save As"],
+        "//*[starts-with(@AutomationId, 'row1')][@ClassName='DataGridRow']": ["Row 1"] + [f"Row {i}" for i in range(10, 20)],
+        "/ToolBar/Button[@Name='Save' or @Name='Print']": ["Save", "Print"],
+        "//Button[@width > 20]": ["Save As"],
+        "//Button[not(@Name='Save')]": ["Save As", "Print"],
+        "//DataGrid/DataItem[3]/Text": ["Cell 2"],
+        "//Text[@Name='Cell 5']/..": ["Row 5"],
+        "//Text[@Name='Cell 5']/ancestor::DataGrid": ["Grid"],
+        "//Button[@Name='Save']/following-sibling::Button[1]": ["Save As"],
+        "//Button[@Name='Print']/preceding-sibling::*[1]": ["Save As"],
+        "//StatusBar//Text | //Button[1]": ["Save", "Ready"],
+        "//descendant::Text[@Name='Ready']": ["Ready"],
+        "//Window": [],
+    }
+
+    def setUp(self):
+        self.window = build_window()
+        self.walker = TreeWalker()
+        self.snapshot = UISnapshot.capture(self.window)
+
+    def test_live_tree(self):
+        """Test the supported XPath subset against live elements"""
+        for expression, names in self.EXPECTATIONS.items():
+            with self.subTest(expression=expression):
+                elements = self.walker.select_xpath(self.window, f"xpath:{expression}")
+                self.assertEqual([element.name for element in elements], names)
+
+    def test_snapshot(self):
+        """Test that snapshots give the same results as the live tree"""
+        for expression, names in self.EXPECTATIONS.items():
+            with self.subTest(expression=expression):
+                nodes = list(self.snapshot.find_all(f"xpath:{expression}"))
+                self.assertEqual([node.name for node in nodes], names)
+
+    def test_predicates_pushed_down_to_indexes(self):
+        """Test that an indexed equality on a // step does not enumerate descendants"""
+        with patch.object(UISnapshot, 'children', autospec=True, side_effect=UISnapshot.children) as children:
+            nodes = list(self.snapshot.find_all("xpath://DataItem[@AutomationId='row7']"))
+        self.assertEqual([node.name for node in nodes], ["Row 7"])
+        children.assert_not_called()
+        self.assertEqual(compile_xpath("//Button[@Name='OK']").paths[0][0].index_lookup, ('name', 'OK'))
+        # Positional predicates depend on siblings and are evaluated per parent
+        self.assertIsNone(compile_xpath("//Button[@Name='OK'][1]").paths[0][0].index_lookup)
+
+    def test_live_tree_lookup_reads_only_the_indexed_attribute(self):
+        """Test that the live tree answers indexed equalities from one walk reading a single attribute"""
+        reads = []
+        with patch.object(FakeElement, 'control_type', create=True,
+                          new_callable=lambda: property(lambda element: reads.append(element.name) or "DataItemControl")):
+            elements = self.walker.select_xpath(self.window, "xpath://DataItem[@AutomationId='row7']")
+        self.assertEqual([element.name for element in elements], ["Row 7"])
+        self.assertEqual(reads, ["Row 7"])
+
+    def test_lookup_of_unknown_value(self):
+        """Test that a value missing from the string table matches nothing"""
+        self.assertEqual(list(SnapshotXPathTree(self.snapshot).lookup('name', 'Nope')), [])
+        self.assertIsNone(self.snapshot.find("xpath://*[@Name='Nope']"))
+
+    def test_compiled_expressions_are_cached(self):
+        """Test that expressions are compiled once"""
+        self.assertIs(compile_xpath("//Button[2]"), compile_xpath("//Button[2]"))
+        self.assertIs(locator_utils.compile("xpath://Button[2]").xpath, compile_xpath("//Button[2]"))
+
+    def test_syntax_errors(self):
+        """Test that unsupported syntax is reported by locator validation"""
+        for expression in ("//Button[", "//Button/@Name", "//foo::Button", "//Button[@Foo='x']", "//Button[lower(@Name)]"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(XPathSyntaxError):
+                    compile_xpath(expression)
+                is_valid, message = locator_utils.validate_locator(f"xpath:{expression}")
+                self.assertFalse(is_valid)
+                self.assertIn("Invalid XPath expression", message)
+
+if __name__ == '__main__':
+    unittest.main()